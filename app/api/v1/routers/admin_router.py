@@ -0,0 +1,84 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.config import (
+    WEB_CONCURRENCY,
+    DB_MAX_CONNECTIONS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    PROFILER_ENABLED,
+    PROFILER_SAMPLE_RATE,
+    PROFILER_PATHS,
+    PROFILER_MAX_FILES,
+)
+from app.db.pool_metrics import POOL_METRICS
+from app.models.user import User as UserModel
+from app.schemas.admin_schemas import PoolMetricsResponse, ProfileListResponse, ResponseCacheStatus
+from app.services import request_profiler
+from app.services.auth_service import get_current_admin_user
+from app.services.response_cache import response_cache
+
+router = APIRouter()
+
+@router.get(
+    "/pool",
+    response_model=PoolMetricsResponse,
+    summary="Métricas do pool de conexões do banco (Requer usuário administrador).",
+    description="Retorna checkouts, tempo de espera e uso de overflow dos pools do worker que atendeu a requisição."
+)
+async def get_pool_metrics(current_user: UserModel = Depends(get_current_admin_user)):
+    return PoolMetricsResponse(
+        pid=os.getpid(),
+        configuracao={
+            "web_concurrency": WEB_CONCURRENCY,
+            "db_max_connections": DB_MAX_CONNECTIONS,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        },
+        pools=[metricas.snapshot() for metricas in POOL_METRICS.values()]
+    )
+
+
+@router.get(
+    "/cache",
+    response_model=ResponseCacheStatus,
+    summary="Contadores do cache de respostas dos endpoints de dados (Requer usuário administrador)."
+)
+async def get_response_cache_stats(current_user: UserModel = Depends(get_current_admin_user)):
+    return ResponseCacheStatus(pid=os.getpid(), **response_cache.stats())
+
+
+@router.get(
+    "/profiles",
+    response_model=ProfileListResponse,
+    summary="Perfis de requisições gravados pelo profiler (Requer usuário administrador).",
+    description="Lista os arquivos speedscope de PROFILER_DIR. Para perfilar uma requisição específica, envie-a como administrador com o cabeçalho `X-Profile: 1`."
+)
+async def list_request_profiles(current_user: UserModel = Depends(get_current_admin_user)):
+    return ProfileListResponse(
+        habilitado=PROFILER_ENABLED,
+        disponivel=request_profiler.available(),
+        taxa_amostragem=PROFILER_SAMPLE_RATE,
+        caminhos=PROFILER_PATHS,
+        max_arquivos=PROFILER_MAX_FILES,
+        perfis=request_profiler.list_profiles()
+    )
+
+
+@router.get(
+    "/profiles/{nome}",
+    response_class=FileResponse,
+    summary="Baixa um perfil no formato speedscope (Requer usuário administrador)."
+)
+async def get_request_profile(nome: str, current_user: UserModel = Depends(get_current_admin_user)):
+    caminho = request_profiler.profile_path(nome)
+    if caminho is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Perfil '{nome}' não encontrado.")
+    return FileResponse(caminho, media_type="application/json", filename=nome)
@@ -0,0 +1,82 @@
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Path
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.analise_schemas import AnaliseResponse, GrupoAnalise
+from app.services.auth_service import get_current_user
+from app.services.embrapa_scraper import CATEGORIA_TIPOS
+from app.models.user import User as UserModel
+from app.db.session import get_async_db
+from app.crud import crud_analise
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get(
+    "/{categoria}/",
+    response_model=AnaliseResponse,
+    summary="Agrupamentos e top-N calculados no banco (Requer Autenticação)",
+    description="Agrupa a categoria pelas colunas de `agrupar_por` (ex: `pais,ano`) e aplica `agregacao` sobre `medida`, "
+                "com filtro por tipo e intervalo de anos, ordenação pelo valor e top-N via `limite`. "
+                "Ex: 10 maiores destinos de espumantes em US$ de 2010 a 2023: "
+                "`/api/v1/analise/exportacao/?tipo=espumantes&agrupar_por=pais&medida=valor_usd&ano_inicio=2010&ano_fim=2023&limite=10`."
+)
+async def get_analise(
+    categoria: str = Path(..., description="producao, comercializacao, processamento, importacao ou exportacao."),
+    agrupar_por: str = Query("ano", description="Colunas separadas por vírgula. Produção/Comercialização: ano, produto, sub_produto; Processamento: ano, tipo, cultivar; Importação/Exportação: ano, tipo, pais."),
+    agregacao: str = Query("soma", pattern="^(soma|media|minimo|maximo)$", description="soma, media, minimo ou maximo."),
+    medida: Optional[str] = Query(None, description="Coluna agregada (padrão: a primeira da categoria). Ex: quantidade_kg, valor_usd, quantidade_litros."),
+    tipo: Optional[str] = Query(None, description="Filtra um subtipo, no mesmo formato das rotas (ex: 'espumantes')."),
+    ano_inicio: Optional[int] = Query(None, ge=1970, le=2023, description="Primeiro ano (1970-2023)."),
+    ano_fim: Optional[int] = Query(None, ge=1970, le=2023, description="Último ano (1970-2023)."),
+    ordem: str = Query("desc", pattern="^(asc|desc)$", description="desc (maiores primeiro) ou asc."),
+    limite: Optional[int] = Query(None, ge=1, le=1000, description="Devolve só os N primeiros grupos (top-N)."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    if categoria not in CATEGORIA_TIPOS:
+        raise HTTPException(status_code=404, detail=f"Categoria '{categoria}' inexistente. Opções: {', '.join(CATEGORIA_TIPOS)}.")
+    tipo_key = tipo.replace("-", "_") if tipo else None
+    if tipo_key is not None and tipo_key not in CATEGORIA_TIPOS[categoria]:
+        raise HTTPException(status_code=422, detail=f"Tipo '{tipo}' inválido para '{categoria}'.")
+    if ano_inicio is not None and ano_fim is not None and ano_inicio > ano_fim:
+        raise HTTPException(status_code=422, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    dimensoes = [d.strip() for d in agrupar_por.split(",") if d.strip()]
+    invalidas = [d for d in dimensoes if d not in crud_analise.DIMENSOES[categoria]]
+    if not dimensoes or invalidas or len(set(dimensoes)) != len(dimensoes):
+        raise HTTPException(
+            status_code=422,
+            detail=f"agrupar_por inválido: '{agrupar_por}'. Opções para '{categoria}': {', '.join(crud_analise.DIMENSOES[categoria])}."
+        )
+    medidas_validas = crud_analise.medidas(categoria)
+    medida = medida or medidas_validas[0]
+    if medida not in medidas_validas:
+        raise HTTPException(status_code=422, detail=f"Medida '{medida}' inválida para '{categoria}'. Opções: {', '.join(medidas_validas)}.")
+
+    logger.debug("ROUTER (Análise DB): Usuário '%s' agrupando %s/%s por %s (%s de %s)", current_user.username, categoria, tipo_key or 'todos', ', '.join(dimensoes), agregacao, medida)
+
+    rows = await crud_analise.get_grouped(
+        db, categoria, dimensoes, agregacao, medida,
+        tipo=tipo_key, ano_inicio=ano_inicio, ano_fim=ano_fim, crescente=ordem == "asc", limite=limite
+    )
+    logger.debug("ROUTER (Análise DB): Banco retornou %s grupos.", len(rows))
+
+    return AnaliseResponse(
+        categoria=categoria,
+        tipo=tipo_key,
+        ano_inicio=ano_inicio,
+        ano_fim=ano_fim,
+        agrupar_por=dimensoes,
+        agregacao=agregacao,
+        medida=medida,
+        grupos=[
+            GrupoAnalise(
+                chaves={nome: row._mapping[nome] for nome in dimensoes},
+                valor=round(row.valor, 2) if row.valor is not None else None,
+                linhas=row.linhas
+            )
+            for row in rows
+        ]
+    )
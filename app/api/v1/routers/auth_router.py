@@ -1,13 +1,16 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Form
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.services import auth_service
 from app.schemas import token_schemas
 from app.schemas import user_schemas
 from app.crud import crud_user
-from app.db.session import get_db
+from app.db.session import get_async_db
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -18,13 +21,13 @@ router = APIRouter()
     description="Use este endpoint para obter um token JWT fornecendo nome de usuário e senha como form data."
 )
 async def login_for_access_token(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
-    print(f"AUTH_ROUTER: Tentativa de login para o usuário: {form_data.username}")
+    logger.debug("AUTH_ROUTER: Tentativa de login para o usuário: %s", form_data.username)
     user = await auth_service.authenticate_user(db=db, username=form_data.username, password_provided=form_data.password)
     if not user:
-        print(f"AUTH_ROUTER: Falha na autenticação para o usuário: {form_data.username}")
+        logger.warning("AUTH_ROUTER: Falha na autenticação para o usuário: %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nome de usuário ou senha incorretos",
@@ -32,7 +35,7 @@ async def login_for_access_token(
         )
     access_token_payload = {"sub": user.username}
     access_token = auth_service.create_access_token(data=access_token_payload)
-    print(f"AUTH_ROUTER: Token gerado com sucesso para o usuário: {form_data.username}")
+    logger.debug("AUTH_ROUTER: Token gerado com sucesso para o usuário: %s", form_data.username)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -44,16 +47,16 @@ async def login_for_access_token(
     description="Cria uma nova conta de usuário com nome de usuário, nome completo e senha, enviados como form data."
 )
 async def register_new_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     username: str = Form(..., min_length=3, max_length=50, description="Nome de usuário único para login."),
     password: str = Form(..., min_length=6, description="Senha do usuário."),
     full_name: Optional[str] = Form(None, max_length=100, description="Nome completo do usuário (opcional).")
 ):
-    print(f"AUTH_ROUTER: Tentativa de registro para o usuário: {username}")
+    logger.debug("AUTH_ROUTER: Tentativa de registro para o usuário: %s", username)
     
-    db_user_by_username = crud_user.get_user_by_username(db, username=username)
+    db_user_by_username = await crud_user.get_user_by_username(db, username=username)
     if db_user_by_username:
-        print(f"AUTH_ROUTER: Username '{username}' já registrado.")
+        logger.warning("AUTH_ROUTER: Username '%s' já registrado.", username)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username já registrado. Por favor, escolha outro."
@@ -65,7 +68,7 @@ async def register_new_user(
         full_name=full_name
     )
     
-    created_user = crud_user.create_user(db=db, user_create_schema=user_in_schema)
-    print(f"AUTH_ROUTER: Usuário '{created_user.username}' registrado com sucesso com ID: {created_user.id}")
+    created_user = await crud_user.create_user(db=db, user_create_schema=user_in_schema)
+    logger.debug("AUTH_ROUTER: Usuário '%s' registrado com sucesso com ID: %s", created_user.username, created_user.id)
     
     return created_user
\ No newline at end of file
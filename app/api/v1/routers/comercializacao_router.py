@@ -1,16 +1,39 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.comercializacao_schemas import ComercializacaoResponse, ComercializacaoItemData
+from app.schemas.comercializacao_schemas import ComercializacaoResponse, ComercializacaoItemData, ComercializacaoSerieResponse
 from app.services.auth_service import get_current_user
 from app.models.user import User as UserModel
-from app.models.comercializacao_model import Comercializacao as ComercializacaoModel
-from app.db.session import get_db
-from app.crud import crud_comercializacao
+from app.models.resumo_model import ResumoDados
+from app.db.session import get_async_db
+from app.services.response_cache import response_cache
+from app.services import http_cache, dataset_engine
+from app.utils import fast_json
+from app.crud import crud_comercializacao, crud_resumo, crud_versao
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Campos de ComercializacaoItemData, na ordem do schema: os itens são montados direto das linhas, sem validar um a um.
+CAMPOS_ITEM = tuple(ComercializacaoItemData.model_fields)
+
+def _build_comercializacao_response(ano: int, db_items: Sequence[Mapping[str, Any]], resumo: Optional[ResumoDados]) -> Dict[str, Any]:
+    dados_api: List[Dict[str, Any]] = [{campo: item[campo] for campo in CAMPOS_ITEM} for item in db_items]
+    if resumo is not None:
+        total_litros: float = resumo.total_litros or 0.0
+    else:
+        # Fatia vazia ou gravada antes da tabela de resumos existir.
+        total_litros = float(sum(item["quantidade_litros"] for item in dados_api if item["quantidade_litros"] is not None))
+    return {
+        "ano_referencia": ano,
+        "dados": dados_api,
+        "total_geral_litros": round(total_litros, 2)
+    }
+
 @router.get(
     "/",
     response_model=ComercializacaoResponse,
@@ -19,35 +42,85 @@ router = APIRouter()
     tags=["Comercialização"]
 )
 async def get_comercializacao_por_ano(
+    request: Request,
+    response: Response,
     ano: int = Query(
         ...,
         ge=1970,
         le=2023,
         description="Ano para consulta dos dados de comercialização (entre 1970 e 2023)."
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    print(f"ROUTER (Comercialização DB): Usuário '{current_user.username}' solicitando dados para o ano: {ano}")
-    
-    db_items: List[ComercializacaoModel] = crud_comercializacao.get_comercializacao_by_year(db=db, year=ano)
-    print(f"ROUTER (Comercialização DB): CRUD retornou {len(db_items)} itens do banco de dados.")
-
-    if not db_items:
-        print(f"ROUTER (Comercialização DB): Nenhum dado encontrado no banco para o ano {ano}.")
-        return ComercializacaoResponse(
-            ano_referencia=ano,
-            dados=[],
-            total_geral_litros=0.0
-        )
-
-    dados_api: List[ComercializacaoItemData] = [ComercializacaoItemData.model_validate(item) for item in db_items]
+    logger.debug("ROUTER (Comercialização DB): Usuário '%s' solicitando dados para o ano: %s", current_user.username, ano)
+
+    versao, nao_modificado = await http_cache.check_conditional(request, response, db, "comercializacao", None, ano)
+    if nao_modificado is not None:
+        logger.debug("ROUTER (Comercialização DB): Cliente já possui a versão %s; respondendo 304.", versao)
+        return nao_modificado
+
+    chave_cache = ("comercializacao", None, ano, versao)
+    resposta_em_cache = response_cache.get(chave_cache)
+    if resposta_em_cache is not None:
+        logger.debug("ROUTER (Comercialização DB): Resposta servida do cache para ano %s.", ano)
+        return fast_json.fast_response(resposta_em_cache, response)
     
-    total_litros: float = sum(item.quantidade_litros for item in dados_api if item.quantidade_litros is not None)
-    print(f"ROUTER (Comercialização DB): Total de litros calculado: {total_litros}")
-
-    return ComercializacaoResponse(
-        ano_referencia=ano,
-        dados=dados_api,
-        total_geral_litros=round(total_litros, 2)
-    )
\ No newline at end of file
+    fatia = dataset_engine.get_slice("comercializacao", None, ano, versao) if dataset_engine.enabled() else None
+    if fatia is not None:
+        db_items, resumo = fatia
+        logger.debug("ROUTER (Comercialização DB): Fatia servida do motor em memória (%s itens).", len(db_items))
+    else:
+        db_items = await crud_comercializacao.get_comercializacao_by_year(db=db, year=ano)
+        logger.debug("ROUTER (Comercialização DB): CRUD retornou %s itens do banco de dados.", len(db_items))
+
+        resumo = await crud_resumo.get_resumo(db, "comercializacao", None, ano) if db_items else None
+    resposta = _build_comercializacao_response(ano, db_items, resumo)
+    logger.debug("ROUTER (Comercialização DB): Total de litros: %s", resposta['total_geral_litros'])
+
+    corpo = fast_json.dumps(resposta)
+    response_cache.set(chave_cache, corpo)
+    return fast_json.fast_response(corpo, response)
+
+@router.get(
+    "/serie/",
+    response_model=ComercializacaoSerieResponse,
+    summary="Série histórica de comercialização, agrupada por ano (Requer Autenticação)",
+    description="Retorna todos os anos de `ano_inicio` a `ano_fim` numa única consulta, com os itens e o total em litros de cada ano.",
+    tags=["Comercialização"]
+)
+async def get_comercializacao_serie(
+    ano_inicio: int = Query(..., ge=1970, le=2023, description="Primeiro ano da série (1970-2023)."),
+    ano_fim: int = Query(..., ge=1970, le=2023, description="Último ano da série (1970-2023)."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    if ano_inicio > ano_fim:
+        raise HTTPException(status_code=422, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    logger.debug("ROUTER (Comercialização DB): Usuário '%s' solicitando série de %s a %s", current_user.username, ano_inicio, ano_fim)
+
+    fatias = None
+    if dataset_engine.enabled():
+        versoes = await crud_versao.get_versions_by_year_range(db, "comercializacao", None, ano_inicio, ano_fim)
+        fatias = dataset_engine.get_slices("comercializacao", None, versoes, ano_inicio, ano_fim)
+    if fatias is not None:
+        itens_por_ano = {ano: linhas for ano, (linhas, _) in fatias.items()}
+        resumos = {ano: resumo for ano, (_, resumo) in fatias.items()}
+        logger.debug("ROUTER (Comercialização DB): Série servida do motor em memória.")
+    else:
+        db_items = await crud_comercializacao.get_comercializacao_by_year_range(db=db, ano_inicio=ano_inicio, ano_fim=ano_fim)
+        resumos = await crud_resumo.get_resumos_by_year_range(db, "comercializacao", None, ano_inicio, ano_fim)
+        logger.debug("ROUTER (Comercialização DB): CRUD retornou %s itens para a série.", len(db_items))
+
+        itens_por_ano: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+        for item in db_items:
+            itens_por_ano[item["ano"]].append(item)
+
+    anos = [_build_comercializacao_response(ano, itens_por_ano.get(ano, []), resumos.get(ano)) for ano in range(ano_inicio, ano_fim + 1)]
+    return fast_json.fast_response({
+        "ano_inicio": ano_inicio,
+        "ano_fim": ano_fim,
+        "anos": anos,
+        "total_geral_litros": round(sum(r["total_geral_litros"] or 0.0 for r in anos), 2)
+    })
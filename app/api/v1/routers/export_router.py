@@ -0,0 +1,81 @@
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Path
+from fastapi.responses import FileResponse, StreamingResponse
+from typing import Optional
+from app.services.auth_service import get_current_user
+from app.services.embrapa_scraper import CATEGORIA_TIPOS
+from app.services import bulk_export, columnar_export
+from app.models.user import User as UserModel
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+def _validar_categoria_tipo(categoria: str, tipo: Optional[str]) -> Optional[str]:
+    if categoria not in CATEGORIA_TIPOS:
+        raise HTTPException(status_code=404, detail=f"Categoria '{categoria}' inexistente. Opções: {', '.join(CATEGORIA_TIPOS)}.")
+    tipo_key = tipo.replace("-", "_") if tipo else None
+    if tipo_key is not None and tipo_key not in CATEGORIA_TIPOS[categoria]:
+        raise HTTPException(status_code=422, detail=f"Tipo '{tipo}' inválido para '{categoria}'.")
+    return tipo_key
+
+@router.get(
+    "/{categoria}/",
+    summary="Exporta a tabela inteira de uma categoria em NDJSON ou CSV, em streaming (Requer Autenticação)",
+    description="Envia as linhas conforme são lidas do banco (cursor no servidor), sem montar a resposta em memória. "
+                "Filtros opcionais por `tipo` e intervalo de anos; `gzip=true` compacta o fluxo (Content-Encoding: gzip).",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}}
+)
+async def export_categoria(
+    categoria: str = Path(..., description="producao, comercializacao, processamento, importacao ou exportacao."),
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson (um objeto JSON por linha) ou csv."),
+    tipo: Optional[str] = Query(None, description="Filtra um subtipo (ex: 'vinhos-mesa'); omitido exporta todos."),
+    ano_inicio: Optional[int] = Query(None, ge=1970, description="Primeiro ano (opcional)."),
+    ano_fim: Optional[int] = Query(None, ge=1970, description="Último ano (opcional)."),
+    gzip: bool = Query(False, description="Compacta o fluxo com gzip."),
+    current_user: UserModel = Depends(get_current_user)
+):
+    tipo_key = _validar_categoria_tipo(categoria, tipo)
+
+    logger.debug("ROUTER (Exportação em lote): Usuário '%s' exportando %s/%s em %s%s", current_user.username, categoria, tipo_key or 'todos', formato, ' (gzip)' if gzip else '')
+
+    nome_arquivo = f"{categoria}{f'_{tipo_key}' if tipo_key else ''}.{formato}"
+    headers = {"Content-Disposition": f'attachment; filename="{nome_arquivo}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        bulk_export.stream_export(categoria, tipo_key, ano_inicio, ano_fim, formato=formato, compactar=gzip),
+        media_type=bulk_export.FORMATOS[formato],
+        headers=headers
+    )
+
+@router.get(
+    "/{categoria}/colunar/",
+    summary="Exporta uma categoria em formato colunar (Arrow IPC ou Parquet) (Requer Autenticação)",
+    description="Gera o arquivo a partir do banco em blocos e o mantém em cache em disco até a próxima carga da categoria. "
+                "Leitura direta com `pyarrow.ipc.open_file`, `pandas.read_parquet` ou `polars.read_ipc`.",
+    response_class=FileResponse,
+    responses={200: {"content": {"application/vnd.apache.arrow.file": {}, "application/vnd.apache.parquet": {}}}}
+)
+async def export_categoria_colunar(
+    categoria: str = Path(..., description="producao, comercializacao, processamento, importacao ou exportacao."),
+    formato: str = Query("parquet", pattern="^(arrow|parquet)$", description="arrow (Arrow IPC) ou parquet."),
+    tipo: Optional[str] = Query(None, description="Filtra um subtipo (ex: 'vinhos-mesa'); omitido exporta todos."),
+    ano_inicio: Optional[int] = Query(None, ge=1970, description="Primeiro ano (opcional)."),
+    ano_fim: Optional[int] = Query(None, ge=1970, description="Último ano (opcional)."),
+    current_user: UserModel = Depends(get_current_user)
+):
+    tipo_key = _validar_categoria_tipo(categoria, tipo)
+    if not columnar_export.disponivel():
+        raise HTTPException(status_code=501, detail="Exportação colunar indisponível: instale o pacote 'pyarrow' no servidor.")
+
+    logger.debug("ROUTER (Exportação colunar): Usuário '%s' exportando %s/%s em %s", current_user.username, categoria, tipo_key or 'todos', formato)
+
+    caminho = await columnar_export.get_columnar_export(categoria, tipo_key, ano_inicio, ano_fim, formato)
+    extensao, media_type = columnar_export.FORMATOS_COLUNARES[formato]
+    return FileResponse(
+        caminho,
+        media_type=media_type,
+        filename=f"{categoria}{f'_{tipo_key}' if tipo_key else ''}.{extensao}"
+    )
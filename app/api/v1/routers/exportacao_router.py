@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.schemas.exportacao_schemas import ExportacaoResponse, ExportacaoItemData
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Path, Request, Response
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.exportacao_schemas import ExportacaoResponse, ExportacaoItemData, ExportacaoSerieResponse, ExportacaoPaginaResponse, CAMPOS_EXPORTACAO
 from app.services.auth_service import get_current_user
 from app.models.user import User as UserModel
-from app.models.exportacao_model import Exportacao as ExportacaoModel
-from app.db.session import get_db
-from app.crud import crud_exportacao
+from app.models.resumo_model import ResumoDados
+from app.db.session import get_async_db
+from app.services.response_cache import response_cache
+from app.services import http_cache, dataset_engine, country_page
+from app.utils import fast_json
+from app.crud import crud_exportacao, crud_resumo, crud_versao
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Campos de ExportacaoItemData, na ordem do schema: os itens são montados direto das linhas, sem validar um a um.
+CAMPOS_ITEM = tuple(ExportacaoItemData.model_fields)
+
 TIPO_EXPORTACAO_ENDPOINT_MAP = {
     "vinhos-mesa": "vinhos_mesa",
     "espumantes": "espumantes",
@@ -17,8 +27,32 @@ TIPO_EXPORTACAO_ENDPOINT_MAP = {
     "suco-uva": "suco_uva",
 }
 
+def _build_exportacao_response(
+    ano: int,
+    tipo_exportacao_key: str,
+    db_items: Sequence[Mapping[str, Any]],
+    resumo: Optional[ResumoDados]
+) -> Dict[str, Any]:
+    dados_api: List[Dict[str, Any]] = [{campo: item[campo] for campo in CAMPOS_ITEM} for item in db_items]
+    if resumo is not None:
+        total_kg: float = resumo.total_kg or 0.0
+        total_usd: float = resumo.total_usd or 0.0
+    else:
+        # Fatia vazia ou gravada antes da tabela de resumos existir.
+        total_kg = float(sum(item["quantidade_kg"] for item in dados_api if item["quantidade_kg"] is not None))
+        total_usd = float(sum(item["valor_usd"] for item in dados_api if item["valor_usd"] is not None))
+    return {
+        "ano_referencia": ano,
+        "tipo_exportacao": tipo_exportacao_key,
+        "dados": dados_api,
+        "total_geral_kg": round(total_kg, 2),
+        "total_geral_usd": round(total_usd, 2)
+    }
+
 async def _get_exportacao_data_for_endpoint(
-    db: Session, 
+    request: Request,
+    response: Response,
+    db: AsyncSession, 
     ano: int, 
     tipo_exportacao_path: str, 
     current_user_username: str
@@ -27,49 +61,134 @@ async def _get_exportacao_data_for_endpoint(
     if not tipo_exportacao_key:
         raise HTTPException(status_code=500, detail="Configuração interna inválida para tipo de exportação.")
 
-    print(f"ROUTER (Exportação DB): Usuário '{current_user_username}' solicitando tipo '{tipo_exportacao_key}', ano: {ano}")
+    logger.debug("ROUTER (Exportação DB): Usuário '%s' solicitando tipo '%s', ano: %s", current_user_username, tipo_exportacao_key, ano)
+
+    versao, nao_modificado = await http_cache.check_conditional(request, response, db, "exportacao", tipo_exportacao_key, ano)
+    if nao_modificado is not None:
+        logger.debug("ROUTER (Exportação DB): Cliente já possui a versão %s; respondendo 304.", versao)
+        return nao_modificado
+
+    chave_cache = ("exportacao", tipo_exportacao_key, ano, versao)
+    resposta_em_cache = response_cache.get(chave_cache)
+    if resposta_em_cache is not None:
+        logger.debug("ROUTER (Exportação DB): Resposta servida do cache para %s ano %s.", tipo_exportacao_key, ano)
+        return fast_json.fast_response(resposta_em_cache, response)
     
-    db_items: List[ExportacaoModel] = crud_exportacao.get_exportacao_by_year_and_type(
-        db=db, year=ano, tipo_exportacao=tipo_exportacao_key
-    )
-    print(f"ROUTER (Exportação DB): CRUD retornou {len(db_items)} itens do banco para '{tipo_exportacao_key}'.")
-
-    if not db_items:
-        print(f"ROUTER (Exportação DB): Nenhum dado encontrado no banco para ano {ano}, tipo '{tipo_exportacao_key}'.")
-        return ExportacaoResponse(
-            ano_referencia=ano,
-            tipo_exportacao=tipo_exportacao_key,
-            dados=[],
-            total_geral_kg=0.0,
-            total_geral_usd=0.0
+    fatia = dataset_engine.get_slice("exportacao", tipo_exportacao_key, ano, versao) if dataset_engine.enabled() else None
+    if fatia is not None:
+        db_items, resumo = fatia
+        logger.debug("ROUTER (Exportação DB): Fatia servida do motor em memória (%s itens).", len(db_items))
+    else:
+        db_items = await crud_exportacao.get_exportacao_by_year_and_type(
+            db=db, year=ano, tipo_exportacao=tipo_exportacao_key
         )
+        logger.debug("ROUTER (Exportação DB): CRUD retornou %s itens do banco para '%s'.", len(db_items), tipo_exportacao_key)
 
-    dados_api: List[ExportacaoItemData] = [ExportacaoItemData.model_validate(item) for item in db_items]
-        
-    total_kg: float = sum(item.quantidade_kg for item in dados_api if item.quantidade_kg is not None)
-    total_usd: float = sum(item.valor_usd for item in dados_api if item.valor_usd is not None)
-    print(f"ROUTER (Exportação DB): Totais para '{tipo_exportacao_key}': KG={total_kg}, USD={total_usd}")
-
-    return ExportacaoResponse(
-        ano_referencia=ano,
-        tipo_exportacao=tipo_exportacao_key,
-        dados=dados_api,
-        total_geral_kg=round(total_kg, 2),
-        total_geral_usd=round(total_usd, 2)
-    )
+        resumo = await crud_resumo.get_resumo(db, "exportacao", tipo_exportacao_key, ano) if db_items else None
+    resposta = _build_exportacao_response(ano, tipo_exportacao_key, db_items, resumo)
+    logger.debug("ROUTER (Exportação DB): Totais para '%s': KG=%s, USD=%s", tipo_exportacao_key, resposta['total_geral_kg'], resposta['total_geral_usd'])
+
+    corpo = fast_json.dumps(resposta)
+    response_cache.set(chave_cache, corpo)
+    return fast_json.fast_response(corpo, response)
 
 @router.get("/vinhos-mesa/", response_model=ExportacaoResponse, summary="Exportação de Vinhos de Mesa (do DB, Requer Autenticação)", tags=["Exportação"])
-async def get_exportacao_vinhos_mesa(ano: int = Query(..., ge=1970, le=2023), db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
-    return await _get_exportacao_data_for_endpoint(db, ano, "vinhos-mesa", current_user.username)
+async def get_exportacao_vinhos_mesa(request: Request, response: Response, ano: int = Query(..., ge=1970, le=2023), db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user)):
+    return await _get_exportacao_data_for_endpoint(request, response, db, ano, "vinhos-mesa", current_user.username)
 
 @router.get("/espumantes/", response_model=ExportacaoResponse, summary="Exportação de Espumantes (do DB, Requer Autenticação)", tags=["Exportação"])
-async def get_exportacao_espumantes(ano: int = Query(..., ge=1970, le=2023), db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
-    return await _get_exportacao_data_for_endpoint(db, ano, "espumantes", current_user.username)
+async def get_exportacao_espumantes(request: Request, response: Response, ano: int = Query(..., ge=1970, le=2023), db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user)):
+    return await _get_exportacao_data_for_endpoint(request, response, db, ano, "espumantes", current_user.username)
 
 @router.get("/uvas-frescas/", response_model=ExportacaoResponse, summary="Exportação de Uvas Frescas (do DB, Requer Autenticação)", tags=["Exportação"])
-async def get_exportacao_uvas_frescas(ano: int = Query(..., ge=1970, le=2023), db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
-    return await _get_exportacao_data_for_endpoint(db, ano, "uvas-frescas", current_user.username)
+async def get_exportacao_uvas_frescas(request: Request, response: Response, ano: int = Query(..., ge=1970, le=2023), db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user)):
+    return await _get_exportacao_data_for_endpoint(request, response, db, ano, "uvas-frescas", current_user.username)
 
 @router.get("/suco-uva/", response_model=ExportacaoResponse, summary="Exportação de Suco de Uva (do DB, Requer Autenticação)", tags=["Exportação"])
-async def get_exportacao_suco_uva(ano: int = Query(..., ge=1970, le=2023), db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)):
-    return await _get_exportacao_data_for_endpoint(db, ano, "suco-uva", current_user.username)
\ No newline at end of file
+async def get_exportacao_suco_uva(request: Request, response: Response, ano: int = Query(..., ge=1970, le=2023), db: AsyncSession = Depends(get_async_db), current_user: UserModel = Depends(get_current_user)):
+    return await _get_exportacao_data_for_endpoint(request, response, db, ano, "suco-uva", current_user.username)
+
+@router.get(
+    "/{tipo_exportacao_path}/serie/",
+    response_model=ExportacaoSerieResponse,
+    summary="Série histórica de exportação de um tipo, agrupada por ano (do DB, Requer Autenticação)",
+    description="Retorna todos os anos de `ano_inicio` a `ano_fim` numa única consulta, com os itens e totais de cada ano.",
+    tags=["Exportação"]
+)
+async def get_exportacao_serie(
+    tipo_exportacao_path: str = Path(..., description="Tipo no mesmo formato das rotas por ano: vinhos-mesa, espumantes, uvas-frescas, suco-uva."),
+    ano_inicio: int = Query(..., ge=1970, le=2023, description="Primeiro ano da série (1970-2023)"),
+    ano_fim: int = Query(..., ge=1970, le=2023, description="Último ano da série (1970-2023)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    tipo_exportacao_key = TIPO_EXPORTACAO_ENDPOINT_MAP.get(tipo_exportacao_path)
+    if not tipo_exportacao_key:
+        raise HTTPException(status_code=404, detail=f"Tipo '{tipo_exportacao_path}' inexistente. Opções: {', '.join(TIPO_EXPORTACAO_ENDPOINT_MAP)}.")
+    if ano_inicio > ano_fim:
+        raise HTTPException(status_code=422, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    logger.debug("ROUTER (Exportação DB): Usuário '%s' solicitando série '%s' de %s a %s", current_user.username, tipo_exportacao_key, ano_inicio, ano_fim)
+
+    fatias = None
+    if dataset_engine.enabled():
+        versoes = await crud_versao.get_versions_by_year_range(db, "exportacao", tipo_exportacao_key, ano_inicio, ano_fim)
+        fatias = dataset_engine.get_slices("exportacao", tipo_exportacao_key, versoes, ano_inicio, ano_fim)
+    if fatias is not None:
+        itens_por_ano = {ano: linhas for ano, (linhas, _) in fatias.items()}
+        resumos = {ano: resumo for ano, (_, resumo) in fatias.items()}
+        logger.debug("ROUTER (Exportação DB): Série servida do motor em memória.")
+    else:
+        db_items = await crud_exportacao.get_exportacao_by_year_range_and_type(
+            db=db, ano_inicio=ano_inicio, ano_fim=ano_fim, tipo_exportacao=tipo_exportacao_key
+        )
+        resumos = await crud_resumo.get_resumos_by_year_range(db, "exportacao", tipo_exportacao_key, ano_inicio, ano_fim)
+        logger.debug("ROUTER (Exportação DB): CRUD retornou %s itens para a série '%s'.", len(db_items), tipo_exportacao_key)
+
+        itens_por_ano: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+        for item in db_items:
+            itens_por_ano[item["ano"]].append(item)
+
+    anos = [
+        _build_exportacao_response(ano, tipo_exportacao_key, itens_por_ano.get(ano, []), resumos.get(ano))
+        for ano in range(ano_inicio, ano_fim + 1)
+    ]
+    return fast_json.fast_response({
+        "tipo_exportacao": tipo_exportacao_key,
+        "ano_inicio": ano_inicio,
+        "ano_fim": ano_fim,
+        "anos": anos,
+        "total_geral_kg": round(sum(r["total_geral_kg"] or 0.0 for r in anos), 2),
+        "total_geral_usd": round(sum(r["total_geral_usd"] or 0.0 for r in anos), 2)
+    })
+
+@router.get(
+    "/{tipo_exportacao_path}/pagina/",
+    response_model=ExportacaoPaginaResponse,
+    summary="Exportação paginada, filtrada e com seleção de campos (do DB, Requer Autenticação)",
+    description="Itens de um tipo/ano ordenados por país, em páginas de `limite` itens (paginação por cursor). "
+                "Filtra por `pais` (lista separada por vírgula) e valores mínimos; `fields` restringe as colunas lidas do banco e serializadas.",
+    tags=["Exportação"]
+)
+async def get_exportacao_pagina(
+    request: Request,
+    response: Response,
+    tipo_exportacao_path: str = Path(..., description="Tipo no mesmo formato das rotas por ano: vinhos-mesa, espumantes, uvas-frescas, suco-uva."),
+    ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
+    pais: Optional[str] = Query(None, description="Países separados por vírgula (nome exato, ex: 'Chile,Argentina')."),
+    min_kg: Optional[float] = Query(None, ge=0, description="Só itens com quantidade_kg maior ou igual a este valor."),
+    min_usd: Optional[float] = Query(None, ge=0, description="Só itens com valor_usd maior ou igual a este valor."),
+    fields: Optional[str] = Query(None, description=f"Campos separados por vírgula. Opções: {', '.join(CAMPOS_EXPORTACAO)} (padrão: todos; `pais` sempre vem)."),
+    cursor: Optional[str] = Query(None, description="Valor de `proximo_cursor` da página anterior."),
+    limite: int = Query(50, ge=1, le=500, description="Itens por página (1-500)."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    tipo_exportacao_key = TIPO_EXPORTACAO_ENDPOINT_MAP.get(tipo_exportacao_path)
+    if not tipo_exportacao_key:
+        raise HTTPException(status_code=404, detail=f"Tipo '{tipo_exportacao_path}' inexistente. Opções: {', '.join(TIPO_EXPORTACAO_ENDPOINT_MAP)}.")
+    logger.debug("ROUTER (Exportação DB): Usuário '%s' solicitando página de '%s', ano: %s, campos: %s", current_user.username, tipo_exportacao_key, ano, fields or "todos")
+    return await country_page.country_page_response(
+        request, response, db, "exportacao", tipo_exportacao_key, CAMPOS_EXPORTACAO, crud_exportacao.get_exportacao_page,
+        ano=ano, pais=pais, min_kg=min_kg, min_usd=min_usd, fields=fields, cursor=cursor, limite=limite
+    )
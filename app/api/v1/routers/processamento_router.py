@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.schemas.processamento_schemas import ProcessamentoResponse, ProcessamentoItemData
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Path, Request, Response
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.processamento_schemas import ProcessamentoResponse, ProcessamentoItemData, ProcessamentoSerieResponse
 from app.services.auth_service import get_current_user
 from app.models.user import User as UserModel
-from app.models.processamento_model import Processamento as ProcessamentoModel
-from app.db.session import get_db
-from app.crud import crud_processamento
+from app.models.resumo_model import ResumoDados
+from app.db.session import get_async_db
+from app.services.response_cache import response_cache
+from app.services import http_cache, dataset_engine
+from app.utils import fast_json
+from app.crud import crud_processamento, crud_resumo, crud_versao
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Campos de ProcessamentoItemData, na ordem do schema: os itens são montados direto das linhas, sem validar um a um.
+CAMPOS_ITEM = tuple(ProcessamentoItemData.model_fields)
+
 TIPO_PROCESSAMENTO_ENDPOINT_MAP = {
     "viniferas": "viniferas",
     "americanas-hibridas": "americanas_hibridas",
@@ -17,8 +27,29 @@ TIPO_PROCESSAMENTO_ENDPOINT_MAP = {
     "sem-classificacao": "sem_classificacao",
 }
 
+def _build_processamento_response(
+    ano: int,
+    tipo_processamento_key: str,
+    db_items: Sequence[Mapping[str, Any]],
+    resumo: Optional[ResumoDados]
+) -> Dict[str, Any]:
+    dados_api: List[Dict[str, Any]] = [{campo: item[campo] for campo in CAMPOS_ITEM} for item in db_items]
+    if resumo is not None:
+        total_kg: float = resumo.total_kg or 0.0
+    else:
+        # Fatia vazia ou gravada antes da tabela de resumos existir.
+        total_kg = float(sum(item["quantidade_kg"] for item in dados_api if item["quantidade_kg"] is not None))
+    return {
+        "ano_referencia": ano,
+        "tipo_processamento": tipo_processamento_key,
+        "dados": dados_api,
+        "total_geral_kg": round(total_kg, 2)
+    }
+
 async def _get_processamento_data_for_endpoint(
-    db: Session, 
+    request: Request,
+    response: Response,
+    db: AsyncSession, 
     ano: int, 
     tipo_processamento_path: str, 
     current_user_username: str
@@ -27,62 +58,126 @@ async def _get_processamento_data_for_endpoint(
     if not tipo_processamento_key:
         raise HTTPException(status_code=500, detail="Configuração interna inválida para tipo de processamento.")
 
-    print(f"ROUTER (Processamento DB): Usuário '{current_user_username}' solicitando tipo '{tipo_processamento_key}', ano: {ano}")
+    logger.debug("ROUTER (Processamento DB): Usuário '%s' solicitando tipo '%s', ano: %s", current_user_username, tipo_processamento_key, ano)
+
+    versao, nao_modificado = await http_cache.check_conditional(request, response, db, "processamento", tipo_processamento_key, ano)
+    if nao_modificado is not None:
+        logger.debug("ROUTER (Processamento DB): Cliente já possui a versão %s; respondendo 304.", versao)
+        return nao_modificado
+
+    chave_cache = ("processamento", tipo_processamento_key, ano, versao)
+    resposta_em_cache = response_cache.get(chave_cache)
+    if resposta_em_cache is not None:
+        logger.debug("ROUTER (Processamento DB): Resposta servida do cache para %s ano %s.", tipo_processamento_key, ano)
+        return fast_json.fast_response(resposta_em_cache, response)
     
-    db_items: List[ProcessamentoModel] = crud_processamento.get_processamento_by_year_and_type(
-        db=db, year=ano, tipo_processamento=tipo_processamento_key
-    )
-    print(f"ROUTER (Processamento DB): CRUD retornou {len(db_items)} itens do banco para '{tipo_processamento_key}'.")
-
-    if not db_items:
-        print(f"ROUTER (Processamento DB): Nenhum dado encontrado no banco para ano {ano}, tipo '{tipo_processamento_key}'.")
-        return ProcessamentoResponse(
-            ano_referencia=ano,
-            tipo_processamento=tipo_processamento_key,
-            dados=[],
-            total_geral_kg=0.0
+    fatia = dataset_engine.get_slice("processamento", tipo_processamento_key, ano, versao) if dataset_engine.enabled() else None
+    if fatia is not None:
+        db_items, resumo = fatia
+        logger.debug("ROUTER (Processamento DB): Fatia servida do motor em memória (%s itens).", len(db_items))
+    else:
+        db_items = await crud_processamento.get_processamento_by_year_and_type(
+            db=db, year=ano, tipo_processamento=tipo_processamento_key
         )
+        logger.debug("ROUTER (Processamento DB): CRUD retornou %s itens do banco para '%s'.", len(db_items), tipo_processamento_key)
 
-    dados_api: List[ProcessamentoItemData] = [ProcessamentoItemData.model_validate(item) for item in db_items]
-    
-    total_kg: float = sum(item.quantidade_kg for item in dados_api if item.quantidade_kg is not None)
-    print(f"ROUTER (Processamento DB): Total KG para '{tipo_processamento_key}': {total_kg}")
+        resumo = await crud_resumo.get_resumo(db, "processamento", tipo_processamento_key, ano) if db_items else None
+    resposta = _build_processamento_response(ano, tipo_processamento_key, db_items, resumo)
+    logger.debug("ROUTER (Processamento DB): Totais para '%s': KG=%s", tipo_processamento_key, resposta['total_geral_kg'])
 
-    return ProcessamentoResponse(
-        ano_referencia=ano,
-        tipo_processamento=tipo_processamento_key,
-        dados=dados_api,
-        total_geral_kg=round(total_kg, 2)
-    )
+    corpo = fast_json.dumps(resposta)
+    response_cache.set(chave_cache, corpo)
+    return fast_json.fast_response(corpo, response)
 
 @router.get("/viniferas/", response_model=ProcessamentoResponse, summary="Processamento de Viníferas (do DB, Requer Autenticação)", tags=["Processamento"])
 async def get_processamento_viniferas(
+    request: Request,
+    response: Response,
     ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    return await _get_processamento_data_for_endpoint(db, ano, "viniferas", current_user.username)
+    return await _get_processamento_data_for_endpoint(request, response, db, ano, "viniferas", current_user.username)
 
 @router.get("/americanas-hibridas/", response_model=ProcessamentoResponse, summary="Processamento de Americanas/Híbridas (do DB, Requer Autenticação)", tags=["Processamento"])
 async def get_processamento_americanas_hibridas(
+    request: Request,
+    response: Response,
     ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    return await _get_processamento_data_for_endpoint(db, ano, "americanas-hibridas", current_user.username)
+    return await _get_processamento_data_for_endpoint(request, response, db, ano, "americanas-hibridas", current_user.username)
 
 @router.get("/uvas-mesa/", response_model=ProcessamentoResponse, summary="Processamento de Uvas de Mesa (do DB, Requer Autenticação)", tags=["Processamento"])
 async def get_processamento_uvas_mesa(
+    request: Request,
+    response: Response,
     ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    return await _get_processamento_data_for_endpoint(db, ano, "uvas-mesa", current_user.username)
+    return await _get_processamento_data_for_endpoint(request, response, db, ano, "uvas-mesa", current_user.username)
 
 @router.get("/sem-classificacao/", response_model=ProcessamentoResponse, summary="Processamento de Uvas Sem Classificação (do DB, Requer Autenticação)", tags=["Processamento"])
 async def get_processamento_sem_classificacao(
+    request: Request,
+    response: Response,
     ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    return await _get_processamento_data_for_endpoint(request, response, db, ano, "sem-classificacao", current_user.username)
+
+@router.get(
+    "/{tipo_processamento_path}/serie/",
+    response_model=ProcessamentoSerieResponse,
+    summary="Série histórica de processamento de um tipo, agrupada por ano (do DB, Requer Autenticação)",
+    description="Retorna todos os anos de `ano_inicio` a `ano_fim` numa única consulta, com os itens e totais de cada ano.",
+    tags=["Processamento"]
+)
+async def get_processamento_serie(
+    tipo_processamento_path: str = Path(..., description="Tipo no mesmo formato das rotas por ano: viniferas, americanas-hibridas, uvas-mesa, sem-classificacao."),
+    ano_inicio: int = Query(..., ge=1970, le=2023, description="Primeiro ano da série (1970-2023)"),
+    ano_fim: int = Query(..., ge=1970, le=2023, description="Último ano da série (1970-2023)"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    return await _get_processamento_data_for_endpoint(db, ano, "sem-classificacao", current_user.username)
\ No newline at end of file
+    tipo_processamento_key = TIPO_PROCESSAMENTO_ENDPOINT_MAP.get(tipo_processamento_path)
+    if not tipo_processamento_key:
+        raise HTTPException(status_code=404, detail=f"Tipo '{tipo_processamento_path}' inexistente. Opções: {', '.join(TIPO_PROCESSAMENTO_ENDPOINT_MAP)}.")
+    if ano_inicio > ano_fim:
+        raise HTTPException(status_code=422, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    logger.debug("ROUTER (Processamento DB): Usuário '%s' solicitando série '%s' de %s a %s", current_user.username, tipo_processamento_key, ano_inicio, ano_fim)
+
+    fatias = None
+    if dataset_engine.enabled():
+        versoes = await crud_versao.get_versions_by_year_range(db, "processamento", tipo_processamento_key, ano_inicio, ano_fim)
+        fatias = dataset_engine.get_slices("processamento", tipo_processamento_key, versoes, ano_inicio, ano_fim)
+    if fatias is not None:
+        itens_por_ano = {ano: linhas for ano, (linhas, _) in fatias.items()}
+        resumos = {ano: resumo for ano, (_, resumo) in fatias.items()}
+        logger.debug("ROUTER (Processamento DB): Série servida do motor em memória.")
+    else:
+        db_items = await crud_processamento.get_processamento_by_year_range_and_type(
+            db=db, ano_inicio=ano_inicio, ano_fim=ano_fim, tipo_processamento=tipo_processamento_key
+        )
+        resumos = await crud_resumo.get_resumos_by_year_range(db, "processamento", tipo_processamento_key, ano_inicio, ano_fim)
+        logger.debug("ROUTER (Processamento DB): CRUD retornou %s itens para a série '%s'.", len(db_items), tipo_processamento_key)
+
+        itens_por_ano: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+        for item in db_items:
+            itens_por_ano[item["ano"]].append(item)
+
+    anos = [
+        _build_processamento_response(ano, tipo_processamento_key, itens_por_ano.get(ano, []), resumos.get(ano))
+        for ano in range(ano_inicio, ano_fim + 1)
+    ]
+    return fast_json.fast_response({
+        "tipo_processamento": tipo_processamento_key,
+        "ano_inicio": ano_inicio,
+        "ano_fim": ano_fim,
+        "anos": anos,
+        "total_geral_kg": round(sum(r["total_geral_kg"] or 0.0 for r in anos), 2)
+    })
@@ -1,15 +1,38 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.schemas.producao_schemas import ProducaoResponse, ProducaoItemData
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Request, Response
+from collections import defaultdict
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.producao_schemas import ProducaoResponse, ProducaoItemData, ProducaoSerieResponse
 from app.services.auth_service import get_current_user 
 from app.models.user import User as UserModel 
-from app.models.producao_model import Producao as ProducaoModel
-from app.db.session import get_db
-from app.crud import crud_producao
+from app.models.resumo_model import ResumoDados
+from app.db.session import get_async_db
+from app.services.response_cache import response_cache
+from app.services import http_cache, dataset_engine
+from app.utils import fast_json
+from app.crud import crud_producao, crud_resumo, crud_versao
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Campos de ProducaoItemData, na ordem do schema: os itens são montados direto das linhas, sem validar um a um.
+CAMPOS_ITEM = tuple(ProducaoItemData.model_fields)
+
+def _build_producao_response(ano: int, db_items: Sequence[Mapping[str, Any]], resumo: Optional[ResumoDados]) -> Dict[str, Any]:
+    dados_api: List[Dict[str, Any]] = [{campo: item[campo] for campo in CAMPOS_ITEM} for item in db_items]
+    if resumo is not None:
+        total_litros: float = resumo.total_litros or 0.0
+    else:
+        # Fatia vazia ou gravada antes da tabela de resumos existir.
+        total_litros = float(sum(item["quantidade_litros"] for item in dados_api if item["quantidade_litros"] is not None))
+    return {
+        "ano_referencia": ano,
+        "dados": dados_api,
+        "total_geral_litros": round(total_litros, 2)
+    }
+
 @router.get(
     "/",
     response_model=ProducaoResponse,
@@ -18,42 +41,86 @@ router = APIRouter()
     tags=["Produção"]
 )
 async def get_producao_por_ano(
+    request: Request,
+    response: Response,
     ano: int = Query(
         ...,
         ge=1970,
         le=2023, 
         description="Ano para consulta dos dados de produção (entre 1970 e 2023)."
     ),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+
+    logger.debug("ROUTER (Produção DB): Usuário '%s' solicitando dados para o ano: %s", current_user.username, ano)
+
+    versao, nao_modificado = await http_cache.check_conditional(request, response, db, "producao", None, ano)
+    if nao_modificado is not None:
+        logger.debug("ROUTER (Produção DB): Cliente já possui a versão %s; respondendo 304.", versao)
+        return nao_modificado
+
+    chave_cache = ("producao", None, ano, versao)
+    resposta_em_cache = response_cache.get(chave_cache)
+    if resposta_em_cache is not None:
+        logger.debug("ROUTER (Produção DB): Resposta servida do cache para ano %s.", ano)
+        return fast_json.fast_response(resposta_em_cache, response)
+
+    fatia = dataset_engine.get_slice("producao", None, ano, versao) if dataset_engine.enabled() else None
+    if fatia is not None:
+        db_producao_items, resumo = fatia
+        logger.debug("ROUTER (Produção DB): Fatia servida do motor em memória (%s itens).", len(db_producao_items))
+    else:
+        db_producao_items = await crud_producao.get_producao_by_year(db=db, year=ano)
+        logger.debug("ROUTER (Produção DB): CRUD retornou %s itens do banco de dados para o ano %s.", len(db_producao_items), ano)
+
+        resumo = await crud_resumo.get_resumo(db, "producao", None, ano) if db_producao_items else None
+    resposta = _build_producao_response(ano, db_producao_items, resumo)
+    logger.debug("ROUTER (Produção DB): Total de litros: %s", resposta['total_geral_litros'])
+
+    corpo = fast_json.dumps(resposta)
+    response_cache.set(chave_cache, corpo)
+    return fast_json.fast_response(corpo, response)
+
+@router.get(
+    "/serie/",
+    response_model=ProducaoSerieResponse,
+    summary="Série histórica de produção, agrupada por ano (Requer Autenticação)",
+    description="Retorna todos os anos de `ano_inicio` a `ano_fim` numa única consulta, com os itens e o total em litros de cada ano.",
+    tags=["Produção"]
+)
+async def get_producao_serie(
+    ano_inicio: int = Query(..., ge=1970, le=2023, description="Primeiro ano da série (1970-2023)."),
+    ano_fim: int = Query(..., ge=1970, le=2023, description="Último ano da série (1970-2023)."),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
+    if ano_inicio > ano_fim:
+        raise HTTPException(status_code=422, detail="ano_inicio deve ser menor ou igual a ano_fim.")
+
+    logger.debug("ROUTER (Produção DB): Usuário '%s' solicitando série de %s a %s", current_user.username, ano_inicio, ano_fim)
+
+    fatias = None
+    if dataset_engine.enabled():
+        versoes = await crud_versao.get_versions_by_year_range(db, "producao", None, ano_inicio, ano_fim)
+        fatias = dataset_engine.get_slices("producao", None, versoes, ano_inicio, ano_fim)
+    if fatias is not None:
+        itens_por_ano = {ano: linhas for ano, (linhas, _) in fatias.items()}
+        resumos = {ano: resumo for ano, (_, resumo) in fatias.items()}
+        logger.debug("ROUTER (Produção DB): Série servida do motor em memória.")
+    else:
+        db_items = await crud_producao.get_producao_by_year_range(db=db, ano_inicio=ano_inicio, ano_fim=ano_fim)
+        resumos = await crud_resumo.get_resumos_by_year_range(db, "producao", None, ano_inicio, ano_fim)
+        logger.debug("ROUTER (Produção DB): CRUD retornou %s itens para a série.", len(db_items))
+
+        itens_por_ano: Dict[int, List[Mapping[str, Any]]] = defaultdict(list)
+        for item in db_items:
+            itens_por_ano[item["ano"]].append(item)
 
-    print(f"ROUTER (Produção DB): Usuário '{current_user.username}' solicitando dados para o ano: {ano}")
-
-    db_producao_items: List[ProducaoModel] = crud_producao.get_producao_by_year(db=db, year=ano)
-    print(f"ROUTER (Produção DB): CRUD retornou {len(db_producao_items)} itens do banco de dados para o ano {ano}.")
-
-    if not db_producao_items:
-        print(f"ROUTER (Produção DB): Nenhum dado encontrado no banco para o ano {ano}.")
-        return ProducaoResponse(
-            ano_referencia=ano,
-            dados=[],
-            total_geral_litros=0.0
-        )
-
-    dados_api: List[ProducaoItemData] = []
-    for db_item in db_producao_items:
-        dados_api.append(ProducaoItemData.model_validate(db_item)) 
-
-    total_litros: float = 0.0
-    for item_data in dados_api:
-        if item_data.quantidade_litros is not None:
-            total_litros += item_data.quantidade_litros
-    
-    print(f"ROUTER (Produção DB): Total de litros calculado: {total_litros}")
-
-    return ProducaoResponse(
-        ano_referencia=ano,
-        dados=dados_api,
-        total_geral_litros=round(total_litros, 2)
-    )
\ No newline at end of file
+    anos = [_build_producao_response(ano, itens_por_ano.get(ano, []), resumos.get(ano)) for ano in range(ano_inicio, ano_fim + 1)]
+    return fast_json.fast_response({
+        "ano_inicio": ano_inicio,
+        "ano_fim": ano_fim,
+        "anos": anos,
+        "total_geral_litros": round(sum(r["total_geral_litros"] or 0.0 for r in anos), 2)
+    })
@@ -0,0 +1,61 @@
+import logging
+from fastapi import APIRouter, Query, HTTPException, Depends, Path, Request, Response
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.resumo_schemas import ResumoResponse
+from app.services.auth_service import get_current_user
+from app.services.embrapa_scraper import CATEGORIA_TIPOS
+from app.services import http_cache
+from app.models.user import User as UserModel
+from app.db.session import get_async_db
+from app.crud import crud_resumo
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get(
+    "/{categoria}/",
+    response_model=ResumoResponse,
+    summary="Totais pré-calculados de uma categoria/tipo/ano (Requer Autenticação)",
+    description="Retorna apenas os totais, a contagem de linhas e de valores não informados, sem carregar os itens. "
+                "Para Processamento, Importação e Exportação informe `tipo` (ex: `vinhos-mesa`)."
+)
+async def get_resumo(
+    request: Request,
+    response: Response,
+    categoria: str = Path(..., description="producao, comercializacao, processamento, importacao ou exportacao."),
+    ano: int = Query(..., ge=1970, le=2023, description="Ano (1970-2023)"),
+    tipo: Optional[str] = Query(None, description="Subtipo da categoria, no mesmo formato das rotas (ex: 'uvas-frescas')."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    if categoria not in CATEGORIA_TIPOS:
+        raise HTTPException(status_code=404, detail=f"Categoria '{categoria}' inexistente. Opções: {', '.join(CATEGORIA_TIPOS)}.")
+    tipo_key = tipo.replace("-", "_") if tipo else None
+    if tipo_key not in CATEGORIA_TIPOS[categoria]:
+        tipos_validos = [t.replace("_", "-") for t in CATEGORIA_TIPOS[categoria] if t]
+        detalhe = f"Tipos válidos: {', '.join(tipos_validos)}." if tipos_validos else "Esta categoria não tem tipo."
+        problema = f"Tipo '{tipo}' inválido" if tipo else "Informe o tipo"
+        raise HTTPException(status_code=422, detail=f"{problema} para '{categoria}'. {detalhe}")
+
+    logger.debug("ROUTER (Resumo DB): Usuário '%s' solicitando resumo de %s/%s, ano: %s", current_user.username, categoria, tipo_key or '-', ano)
+
+    versao, nao_modificado = await http_cache.check_conditional(request, response, db, categoria, tipo_key, ano)
+    if nao_modificado is not None:
+        return nao_modificado
+
+    resumo = await crud_resumo.get_resumo(db, categoria, tipo_key, ano)
+    if resumo is None:
+        raise HTTPException(status_code=404, detail=f"Resumo de {categoria}/{tipo_key or '-'} para {ano} não encontrado.")
+
+    return ResumoResponse(
+        categoria=categoria,
+        tipo=tipo_key,
+        ano_referencia=ano,
+        linhas=resumo.linhas,
+        linhas_sem_valor=resumo.linhas_sem_valor,
+        total_geral_litros=resumo.total_litros,
+        total_geral_kg=resumo.total_kg,
+        total_geral_usd=resumo.total_usd
+    )
@@ -1,3 +1,4 @@
+import logging
 from decouple import config
 from typing import List
 import os
@@ -9,8 +10,8 @@ import os
 env_path = Path(__file__).resolve().parents[2] / ".env"
 load_dotenv(dotenv_path=env_path)
 
-print("DEBUG - ENV FILE LOADED")
-print("DEBUG - RAW ENV DATABASE_URL:", os.getenv("DATABASE_URL"))
+logger = logging.getLogger(__name__)
+logger.debug("CONFIG: Arquivo .env carregado de %s (DATABASE_URL definida: %s).", env_path, os.getenv("DATABASE_URL") is not None)
 
 
 
@@ -30,14 +31,122 @@ SECRET_KEY: str = config("SECRET_KEY", default="admGuilhermeJeronimo2611")
 
 ALGORITHM: str = config("ALGORITHM", default="HS256")
 
+# Validade dos tokens emitidos em /auth/token (0 = sem expiração, como antes).
+ACCESS_TOKEN_EXPIRE_MINUTES: int = config("ACCESS_TOKEN_EXPIRE_MINUTES", default=0, cast=int)
+
+# get_current_user guarda tokens já verificados e os usuários consultados; desabilitar um usuário
+# passa a valer em até AUTH_USER_CACHE_TTL_SECONDS.
+AUTH_TOKEN_CACHE_SIZE: int = config("AUTH_TOKEN_CACHE_SIZE", default=4096, cast=int)
+
+AUTH_USER_CACHE_TTL_SECONDS: float = config("AUTH_USER_CACHE_TTL_SECONDS", default=30.0, cast=float)
+
 EMBRAPA_BASE_URL: str = config("EMBRAPA_BASE_URL", default="http://vitibrasil.cnpuv.embrapa.br")
 
 EMBRAPA_INDEX_PHP_URL: str = f"{EMBRAPA_BASE_URL}/index.php"
 
 EMBRAPA_REQUEST_TIMEOUT: int = config("EMBRAPA_REQUEST_TIMEOUT", default=15, cast=int)
 
+EMBRAPA_CONNECT_TIMEOUT: float = config("EMBRAPA_CONNECT_TIMEOUT", default=5.0, cast=float)
+
+EMBRAPA_MAX_CONNECTIONS: int = config("EMBRAPA_MAX_CONNECTIONS", default=8, cast=int)
+
+EMBRAPA_MAX_KEEPALIVE_CONNECTIONS: int = config("EMBRAPA_MAX_KEEPALIVE_CONNECTIONS", default=8, cast=int)
+
+EMBRAPA_KEEPALIVE_EXPIRY: float = config("EMBRAPA_KEEPALIVE_EXPIRY", default=30.0, cast=float)
+
+EMBRAPA_MAX_CONCURRENCY_PER_HOST: int = config("EMBRAPA_MAX_CONCURRENCY_PER_HOST", default=4, cast=int)
+
+EMBRAPA_CACHE_ENABLED: bool = config("EMBRAPA_CACHE_ENABLED", default=False, cast=bool)
+
+EMBRAPA_CACHE_DIR: str = config("EMBRAPA_CACHE_DIR", default="./embrapa_cache")
+
+EMBRAPA_REPLAY_MODE: bool = config("EMBRAPA_REPLAY_MODE", default=False, cast=bool)
+
+EMBRAPA_PARSER_BACKEND: str = config("EMBRAPA_PARSER_BACKEND", default="lxml")
+
 DATABASE_URL: str = config("DATABASE_URL", default="sqlite:///./sql_app.db")
 
-print(f"Carregando configurações para: {PROJECT_NAME}")
+ASYNC_DATABASE_URL: str = config("ASYNC_DATABASE_URL", default="")
+
+# --- Pool de conexões ---
+# O limite de conexões do PostgreSQL (Render) é dividido entre os workers do gunicorn: por padrão cada
+# worker fica com DB_MAX_CONNECTIONS // WEB_CONCURRENCY, metade fixa no pool e o resto como overflow.
+WEB_CONCURRENCY: int = config("WEB_CONCURRENCY", default=2, cast=int)
+
+DB_MAX_CONNECTIONS: int = config("DB_MAX_CONNECTIONS", default=20, cast=int)
+
+_DB_CONNECTIONS_PER_WORKER: int = max(1, DB_MAX_CONNECTIONS // max(1, WEB_CONCURRENCY))
+
+DB_POOL_SIZE: int = config("DB_POOL_SIZE", default=max(1, _DB_CONNECTIONS_PER_WORKER // 2), cast=int)
+
+DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", default=max(0, _DB_CONNECTIONS_PER_WORKER - max(1, _DB_CONNECTIONS_PER_WORKER // 2)), cast=int)
+
+DB_POOL_TIMEOUT: float = config("DB_POOL_TIMEOUT", default=10.0, cast=float)
+
+DB_POOL_RECYCLE: int = config("DB_POOL_RECYCLE", default=1800, cast=int)
+
+DB_POOL_PRE_PING: bool = config("DB_POOL_PRE_PING", default=True, cast=bool)
+
+ADMIN_USERNAMES_STR: str = config("ADMIN_USERNAMES", default="")
+
+ADMIN_USERNAMES: List[str] = [nome.strip() for nome in ADMIN_USERNAMES_STR.split(',') if nome.strip()]
+
+# Cache das respostas de /producao, /comercializacao, /processamento, /importacao e /exportacao (0 itens desliga).
+RESPONSE_CACHE_MAX_ITEMS: int = config("RESPONSE_CACHE_MAX_ITEMS", default=512, cast=int)
+
+RESPONSE_CACHE_TTL_SECONDS: float = config("RESPONSE_CACHE_TTL_SECONDS", default=3600.0, cast=float)
+
+# max-age do Cache-Control dos endpoints de dados; depois disso o cliente revalida com If-None-Match.
+HTTP_CACHE_MAX_AGE: int = config("HTTP_CACHE_MAX_AGE", default=300, cast=int)
+
+# Linhas lidas do cursor e enviadas por bloco no endpoint de exportação.
+EXPORT_CHUNK_ROWS: int = config("EXPORT_CHUNK_ROWS", default=5000, cast=int)
+
+# Arquivos Arrow/Parquet gerados pelo endpoint colunar (valem até a próxima carga da categoria).
+EXPORT_CACHE_DIR: str = config("EXPORT_CACHE_DIR", default="./export_cache")
+
+# Motor em memória (numpy) para as leituras dos routers; o snapshot é recarregado quando a versão do dataset muda.
+DATASET_ENGINE_ENABLED: bool = config("DATASET_ENGINE_ENABLED", default=False, cast=bool)
+
+DATASET_ENGINE_CHECK_SECONDS: float = config("DATASET_ENGINE_CHECK_SECONDS", default=30.0, cast=float)
+
+# Nível dos loggers da aplicação (DEBUG, INFO, WARNING, ERROR).
+LOG_LEVEL: str = config("LOG_LEVEL", default="INFO").upper()
+
+# "texto" (uma linha legível por evento) ou "json" (um objeto JSON por linha, para agregadores de log).
+LOG_FORMAT: str = config("LOG_FORMAT", default="texto")
+
+# Fração das mensagens DEBUG mantidas (linhas por requisição); WARNING e acima nunca são amostradas.
+LOG_DEBUG_SAMPLE_RATE: float = config("LOG_DEBUG_SAMPLE_RATE", default=1.0, cast=float)
+
+# Endpoint /metrics no formato Prometheus (requer prometheus_client, opcional).
+METRICS_ENABLED: bool = config("METRICS_ENABLED", default=True, cast=bool)
+
+# Diretório compartilhado pelos workers do gunicorn para agregar as métricas (modo multiprocesso); vazio = só o processo atual.
+PROMETHEUS_MULTIPROC_DIR: str = config("PROMETHEUS_MULTIPROC_DIR", default="")
+
+# Profiler por amostragem (pyinstrument, opcional) nas requisições; com PROFILER_ENABLED=False só perfila quem
+# for administrador e enviar o cabeçalho "X-Profile: 1".
+PROFILER_ENABLED: bool = config("PROFILER_ENABLED", default=False, cast=bool)
+
+# Fração das requisições perfiladas quando PROFILER_ENABLED=True.
+PROFILER_SAMPLE_RATE: float = config("PROFILER_SAMPLE_RATE", default=0.01, cast=float)
+
+# Prefixos de path perfilados (separados por vírgula); vazio = todos.
+PROFILER_PATHS_STR: str = config("PROFILER_PATHS", default="")
+
+PROFILER_PATHS: List[str] = [prefixo.strip() for prefixo in PROFILER_PATHS_STR.split(',') if prefixo.strip()]
+
+# Intervalo de amostragem do pyinstrument, em segundos.
+PROFILER_INTERVAL_SECONDS: float = config("PROFILER_INTERVAL_SECONDS", default=0.001, cast=float)
+
+# Perfis no formato speedscope (https://www.speedscope.app); só os PROFILER_MAX_FILES mais recentes são mantidos.
+PROFILER_DIR: str = config("PROFILER_DIR", default="./profiles")
+
+PROFILER_MAX_FILES: int = config("PROFILER_MAX_FILES", default=200, cast=int)
+
+DB_BULK_COPY: bool = config("DB_BULK_COPY", default=False, cast=bool)
+
+logger.info("CONFIG: Carregando configurações para: %s", PROJECT_NAME)
 if SECRET_KEY == "admGuilhermeJeronimo2611":
-    print("AVISO: SECRET_KEY está usando o valor padrão. Para produção, defina uma SECRET_KEY segura no seu arquivo .env.")
+    logger.warning("AVISO: SECRET_KEY está usando o valor padrão. Para produção, defina uma SECRET_KEY segura no seu arquivo .env.")
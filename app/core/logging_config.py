@@ -0,0 +1,83 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import LOG_DEBUG_SAMPLE_RATE, LOG_FORMAT, LOG_LEVEL
+
+APP_LOGGER = "app"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha: ts, level, logger, message (+ exc com o traceback, se houver)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        evento = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        if record.exc_info:
+            evento["exc"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Deixa passar só uma fração `taxa` dos registros DEBUG; os demais níveis passam sempre."""
+
+    def __init__(self, taxa: float):
+        super().__init__()
+        self.taxa = taxa
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.taxa >= 1.0 or random.random() < self.taxa
+
+
+def setup_logging(nivel: str = LOG_LEVEL, formato: str = LOG_FORMAT, taxa_debug: float = LOG_DEBUG_SAMPLE_RATE) -> None:
+    """
+    Configura o logger `app` (e todos os `app.*` criados com logging.getLogger(__name__)).
+
+    Quem loga só enfileira o registro (QueueHandler); formatação e escrita no stdout ficam numa thread
+    (QueueListener), fora do event loop. Chamadas repetidas reconfiguram sem duplicar handlers.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(JsonFormatter() if formato.lower() == "json" else logging.Formatter(TEXT_FORMAT))
+
+    fila: queue.SimpleQueue = queue.SimpleQueue()
+    handler = QueueHandler(fila)
+    handler.addFilter(DebugSamplingFilter(taxa_debug))
+
+    logger = logging.getLogger(APP_LOGGER)
+    logger.handlers.clear()
+    logger.addHandler(handler)
+    logger.setLevel(nivel)
+    logger.propagate = False
+
+    _listener = QueueListener(fila, saida, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,167 @@
+import os
+import time
+from typing import Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import METRICS_ENABLED, PROMETHEUS_MULTIPROC_DIR
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # O prometheus_client decide entre valores em memória e arquivos mmap no import: a variável precisa vir antes.
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", PROMETHEUS_MULTIPROC_DIR)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+try:
+    import prometheus_client
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    from prometheus_client import multiprocess
+except ImportError:  # prometheus_client é opcional; sem ele as funções abaixo não fazem nada
+    prometheus_client = None
+
+SEM_ROTA = "sem_rota"
+
+# Faixas pensadas para leituras servidas do cache/banco (ms) e para páginas da Embrapa (segundos).
+_FAIXAS_HTTP = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_FAIXAS_SQL = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+_FAIXAS_SCRAPER = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def enabled() -> bool:
+    return METRICS_ENABLED and prometheus_client is not None
+
+
+def multiprocess_mode() -> bool:
+    return enabled() and bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+if enabled():
+    HTTP_REQUEST_DURATION = Histogram(
+        "http_request_duration_seconds", "Duração das requisições HTTP por router, rota, método e status.",
+        ["router", "route", "method", "status"], buckets=_FAIXAS_HTTP
+    )
+    HTTP_REQUESTS_IN_PROGRESS = Gauge(
+        "http_requests_in_progress", "Requisições HTTP em andamento.",
+        ["method"], multiprocess_mode="livesum"
+    )
+    DB_QUERY_DURATION = Histogram(
+        "db_query_duration_seconds", "Duração das consultas SQL por engine e operação (o _count é o total de consultas).",
+        ["engine", "operation"], buckets=_FAIXAS_SQL
+    )
+    DB_QUERY_ERRORS = Counter("db_query_errors_total", "Consultas SQL que falharam.", ["engine", "operation"])
+    CACHE_LOOKUPS = Counter(
+        "cache_lookups_total", "Consultas aos caches em memória; taxa de acerto = hit / (hit + miss).",
+        ["cache", "result"]
+    )
+    SCRAPER_FETCH_DURATION = Histogram(
+        "embrapa_fetch_duration_seconds", "Tempo para obter uma página da Embrapa (rede ou cache em disco).",
+        ["categoria", "result"], buckets=_FAIXAS_SCRAPER
+    )
+    SCRAPER_PARSE_DURATION = Histogram(
+        "embrapa_parse_duration_seconds", "Tempo para interpretar a tabela de uma página da Embrapa.",
+        ["categoria"], buckets=_FAIXAS_SCRAPER
+    )
+
+
+def _operacao(statement: str) -> str:
+    palavra = statement.lstrip().split(None, 1)[:1]
+    return palavra[0].upper() if palavra else "OUTRA"
+
+
+def _router_e_rota(scope) -> Tuple[str, str]:
+    rota = scope.get("route")
+    endpoint = getattr(rota, "endpoint", None)
+    if rota is None or endpoint is None:
+        return SEM_ROTA, SEM_ROTA
+    # app.api.v1.routers.importacao_router -> importacao; rotas declaradas em app.main -> main
+    modulo = endpoint.__module__.rsplit(".", 1)[-1]
+    return modulo.removesuffix("_router"), getattr(rota, "path", SEM_ROTA)
+
+
+def instrument_engine_queries(engine: Engine, nome: str) -> None:
+    """Cronometra cada execução de cursor da engine (contagem e duração por operação: SELECT, INSERT...)."""
+    if not enabled():
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_inicio_consulta", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["metrics_inicio_consulta"].pop()
+        DB_QUERY_DURATION.labels(nome, _operacao(statement)).observe(time.perf_counter() - inicio)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(contexto_erro):
+        inicios = contexto_erro.connection.info.get("metrics_inicio_consulta") if contexto_erro.connection is not None else None
+        if inicios:
+            inicios.pop()
+        DB_QUERY_ERRORS.labels(nome, _operacao(contexto_erro.statement or "")).inc()
+
+
+def record_cache_lookup(cache: Optional[str], hit: bool) -> None:
+    if cache is not None and enabled():
+        CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_scraper_fetch(categoria: str, segundos: float, ok: bool) -> None:
+    if enabled():
+        SCRAPER_FETCH_DURATION.labels(categoria, "ok" if ok else "erro").observe(segundos)
+
+
+def observe_scraper_parse(categoria: str, segundos: float) -> None:
+    if enabled():
+        SCRAPER_PARSE_DURATION.labels(categoria).observe(segundos)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI (sem BaseHTTPMiddleware, para não bufferizar as respostas em streaming) que mede a duração
+    de cada requisição HTTP. O router sai do módulo do endpoint e a rota é o template do path
+    (`/{tipo_importacao_key}/`), não a URL, para manter a cardinalidade baixa; requisições que não casaram
+    com nenhuma rota ficam em `sem_rota`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        status = [500]
+
+        async def _send(mensagem):
+            if mensagem["type"] == "http.response.start":
+                status[0] = mensagem["status"]
+            await send(mensagem)
+
+        em_andamento = HTTP_REQUESTS_IN_PROGRESS.labels(metodo)
+        em_andamento.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            em_andamento.dec()
+            router, rota = _router_e_rota(scope)
+            HTTP_REQUEST_DURATION.labels(router, rota, metodo, str(status[0])).observe(time.perf_counter() - inicio)
+
+
+def metrics_response() -> Response:
+    if multiprocess_mode():
+        # Um registry por coleta, somando os arquivos de todos os workers do diretório compartilhado.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Chamado pelo gunicorn quando um worker sai: descarta os gauges `live*` daquele processo."""
+    if multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,114 @@
+import io
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import DB_BULK_COPY
+
+logger = logging.getLogger(__name__)
+
+_use_copy: bool = DB_BULK_COPY
+
+def configure_copy(habilitado: bool) -> None:
+    """Liga/desliga o COPY do PostgreSQL para cargas completas (fatias sem linhas anteriores)."""
+    global _use_copy
+    _use_copy = habilitado
+
+
+def _dedupe(table, rows: List[Dict[str, Any]], chave: Sequence[str]) -> List[Dict[str, Any]]:
+    # ON CONFLICT não aceita a mesma chave duas vezes no mesmo comando; a última ocorrência vence.
+    unicos: Dict[tuple, Dict[str, Any]] = {}
+    repetidas: List[tuple] = []
+    for row in rows:
+        valor_chave = tuple(row[c] for c in chave)
+        if valor_chave in unicos:
+            repetidas.append(valor_chave)
+        unicos[valor_chave] = row
+    if repetidas:
+        logger.warning(
+            "BULK_WRITE: %s linha(s) com chave repetida em %s descartada(s) (vale a última ocorrência): %s%s",
+            len(repetidas), table.name, ", ".join(map(repr, repetidas[:10])), "..." if len(repetidas) > 10 else ""
+        )
+    return list(unicos.values())
+
+
+def _copy_value(valor: Any) -> str:
+    # Formato texto do COPY: \N é NULL e uma string vazia continua vazia, como no caminho do INSERT.
+    if valor is None:
+        return "\\N"
+    return str(valor).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copy_rows(db: Session, table, rows: List[Dict[str, Any]]) -> None:
+    colunas = list(rows[0].keys())
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[c]) for c in colunas))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT text)", buffer)
+    finally:
+        cursor.close()
+
+
+def replace_slice(
+    db: Session,
+    model,
+    filtros: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    chave: Sequence[str],
+    constraint: str,
+    full_load: Optional[bool] = None
+) -> int:
+    """
+    Substitui a fatia `filtros` (ex: ano + tipo) da tabela de `model` pelas `rows`, sem ORM.
+
+    PostgreSQL/SQLite: INSERT ... ON CONFLICT DO UPDATE em executemany contra a unique constraint
+    `constraint` (colunas `chave`) e DELETE só das linhas que saíram da fatia. Quando a chave tem
+    coluna anulável (NULL nunca conflita) ou o banco não tem ON CONFLICT, cai para DELETE + INSERT
+    em executemany. Com COPY habilitado e fatia vazia no PostgreSQL, as linhas vão via COPY.
+    Não faz commit: isso fica com quem chama.
+    """
+    table = model.__table__
+    dialeto = db.get_bind().dialect.name
+    rows = _dedupe(table, rows, chave)
+    condicoes = [table.c[coluna] == valor for coluna, valor in filtros.items()]
+    chave_anulavel = any(table.c[coluna].nullable for coluna in chave)
+
+    if dialeto == "postgresql" and _use_copy and rows:
+        if full_load is None:
+            full_load = db.execute(table.select().where(*condicoes).limit(1)).first() is None
+        if full_load:
+            _copy_rows(db, table, rows)
+            return len(rows)
+
+    if chave_anulavel or dialeto not in ("postgresql", "sqlite"):
+        db.execute(delete(table).where(*condicoes))
+        if rows:
+            db.execute(insert(table), rows)
+        return len(rows)
+
+    colunas_chave_livres = [c for c in chave if c not in filtros]
+    if rows:
+        chaves_novas = [tuple(row[c] for c in colunas_chave_livres) for row in rows]
+        if len(colunas_chave_livres) == 1:
+            stale = table.c[colunas_chave_livres[0]].notin_([k[0] for k in chaves_novas])
+        else:
+            stale = tuple_(*(table.c[c] for c in colunas_chave_livres)).notin_(chaves_novas)
+        db.execute(delete(table).where(*condicoes, stale))
+
+        stmt = (postgresql.insert(table) if dialeto == "postgresql" else sqlite.insert(table))
+        atualizar = {c: stmt.excluded[c] for c in rows[0].keys() if c not in chave}
+        if dialeto == "postgresql":
+            stmt = stmt.on_conflict_do_update(constraint=constraint, set_=atualizar)
+        else:
+            stmt = stmt.on_conflict_do_update(index_elements=list(chave), set_=atualizar)
+        db.execute(stmt, rows)
+    else:
+        db.execute(delete(table).where(*condicoes))
+    return len(rows)
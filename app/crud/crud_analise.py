@@ -0,0 +1,77 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.crud.crud_resumo import FONTES
+
+# Colunas pelas quais cada categoria pode ser agrupada: nome na API -> coluna da tabela.
+DIMENSOES: Dict[str, Dict[str, str]] = {
+    "producao": {"ano": "ano", "produto": "produto", "sub_produto": "sub_produto"},
+    "comercializacao": {"ano": "ano", "produto": "produto", "sub_produto": "sub_produto"},
+    "processamento": {"ano": "ano", "tipo": "tipo_processamento", "cultivar": "cultivar"},
+    "importacao": {"ano": "ano", "tipo": "tipo_importacao", "pais": "pais"},
+    "exportacao": {"ano": "ano", "tipo": "tipo_exportacao", "pais": "pais"},
+}
+
+AGREGACOES = {
+    "soma": func.sum,
+    "media": func.avg,
+    "minimo": func.min,
+    "maximo": func.max,
+}
+
+def medidas(categoria: str) -> List[str]:
+    return list(FONTES[categoria].medidas.values())
+
+def build_group_query(
+    categoria: str,
+    agrupar_por: Sequence[str],
+    agregacao: str,
+    medida: str,
+    tipo: Optional[str] = None,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    crescente: bool = False,
+    limite: Optional[int] = None
+):
+    """
+    SELECT <dimensões>, <agregação>(medida), COUNT(*) ... GROUP BY <dimensões> ORDER BY valor LIMIT n.
+
+    Filtro, agrupamento, ordenação e top-N ficam todos no banco; grupos sem valor informado vão para o fim.
+    """
+    fonte = FONTES[categoria]
+    table = fonte.model.__table__
+    colunas_grupo = [table.c[DIMENSOES[categoria][nome]].label(nome) for nome in agrupar_por]
+    valor = AGREGACOES[agregacao](table.c[medida]).label("valor")
+
+    stmt = select(*colunas_grupo, valor, func.count().label("linhas")).group_by(*colunas_grupo)
+    if tipo and fonte.coluna_tipo:
+        stmt = stmt.where(table.c[fonte.coluna_tipo] == tipo)
+    if ano_inicio is not None:
+        stmt = stmt.where(table.c.ano >= ano_inicio)
+    if ano_fim is not None:
+        stmt = stmt.where(table.c.ano <= ano_fim)
+
+    ordem = valor.asc() if crescente else valor.desc()
+    stmt = stmt.order_by(ordem.nulls_last(), *colunas_grupo)
+    if limite:
+        stmt = stmt.limit(limite)
+    return stmt
+
+async def get_grouped(
+    db: AsyncSession,
+    categoria: str,
+    agrupar_por: Sequence[str],
+    agregacao: str,
+    medida: str,
+    tipo: Optional[str] = None,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    crescente: bool = False,
+    limite: Optional[int] = None
+) -> List[Tuple]:
+
+    result = await db.execute(build_group_query(
+        categoria, agrupar_por, agregacao, medida,
+        tipo=tipo, ano_inicio=ano_inicio, ano_fim=ano_fim, crescente=crescente, limite=limite
+    ))
+    return result.all()
@@ -1,35 +1,55 @@
+import logging
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.comercializacao_model import Comercializacao as ComercializacaoModel
 from app.schemas.comercializacao_schemas import ComercializacaoItemData
+from app.crud import bulk_write, slice_events
+
+logger = logging.getLogger(__name__)
+
+# Colunas lidas pelas rotas de consulta (os campos de ComercializacaoItemData), sem materializar objetos ORM.
+COLUNAS_LEITURA = tuple(ComercializacaoModel.__table__.c[campo] for campo in ComercializacaoItemData.model_fields)
 
 def create_or_replace_comercializacao_for_year(
     db: Session, 
     year: int, 
-    comercializacao_data_list: List[ComercializacaoItemData]
-) -> List[ComercializacaoModel]:
-    db.query(ComercializacaoModel).filter(ComercializacaoModel.ano == year).delete(synchronize_session=False)
-    print(f"CRUD_COMERCIALIZACAO: Registros antigos para o ano {year} deletados.")
-    
-    db_comercializacao_list: List[ComercializacaoModel] = []
-    for item_data in comercializacao_data_list:
-        if item_data.ano == year:
-            db_item = ComercializacaoModel(
-                ano=item_data.ano,
-                produto=item_data.produto,
-                sub_produto=item_data.sub_produto,
-                quantidade_litros=item_data.quantidade_litros
-            )
-            db_comercializacao_list.append(db_item)
-            
-    if db_comercializacao_list:
-        db.add_all(db_comercializacao_list)
-    db.commit()
-    print(f"CRUD_COMERCIALIZACAO: {len(db_comercializacao_list)} novos registros para o ano {year} inseridos.")
-    return db_comercializacao_list
-
-
-def get_comercializacao_by_year(db: Session, year: int) -> List[ComercializacaoModel]:
-
-    print(f"CRUD_COMERCIALIZACAO: Buscando dados para o ano {year} no DB.")
-    return db.query(ComercializacaoModel).filter(ComercializacaoModel.ano == year).all()
\ No newline at end of file
+    comercializacao_data_list: List[ComercializacaoItemData],
+    commit: bool = True
+) -> int:
+    rows = [
+        {
+            "ano": item_data.ano,
+            "produto": item_data.produto,
+            "sub_produto": item_data.sub_produto,
+            "quantidade_litros": item_data.quantidade_litros
+        }
+        for item_data in comercializacao_data_list
+        if item_data.ano == year
+    ]
+
+    num_written = bulk_write.replace_slice(
+        db, ComercializacaoModel, filtros={"ano": year}, rows=rows,
+        chave=("ano", "produto", "sub_produto"), constraint="_com_ano_prod_subprod_uc"
+    )
+    slice_events.slice_written(db, "comercializacao", None, year)
+    if commit:
+        db.commit()
+    logger.info("CRUD_COMERCIALIZACAO: %s registros para o ano %s inseridos/atualizados.", num_written, year)
+    return num_written
+
+
+async def get_comercializacao_by_year(db: AsyncSession, year: int) -> List[RowMapping]:
+
+    logger.debug("CRUD_COMERCIALIZACAO: Buscando dados para o ano %s no DB.", year)
+    result = await db.execute(select(*COLUNAS_LEITURA).where(ComercializacaoModel.ano == year))
+    return list(result.mappings().all())
+
+async def get_comercializacao_by_year_range(db: AsyncSession, ano_inicio: int, ano_fim: int) -> List[RowMapping]:
+
+    logger.debug("CRUD_COMERCIALIZACAO: Buscando dados de comercialização de %s a %s no banco de dados.", ano_inicio, ano_fim)
+    result = await db.execute(
+        select(*COLUNAS_LEITURA).where(ComercializacaoModel.ano.between(ano_inicio, ano_fim)).order_by(ComercializacaoModel.ano, ComercializacaoModel.id)
+    )
+    return list(result.mappings().all())
@@ -1,46 +1,104 @@
+import logging
+from sqlalchemy import Row, RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional 
+from typing import List, Optional, Sequence
 from app.models.exportacao_model import Exportacao as ExportacaoModel
 from app.schemas.exportacao_schemas import ExportacaoItemData
+from app.crud import bulk_write, slice_events
+
+logger = logging.getLogger(__name__)
+
+# Colunas lidas pelas rotas de consulta (os campos de ExportacaoItemData), sem materializar objetos ORM.
+COLUNAS_LEITURA = tuple(ExportacaoModel.__table__.c[campo] for campo in ExportacaoItemData.model_fields)
 
 def create_or_replace_exportacao_for_year_and_type(
     db: Session, 
     year: int, 
     tipo_exportacao: str,
-    exportacao_data_list: List[ExportacaoItemData]
-) -> List[ExportacaoModel]:
-    db.query(ExportacaoModel).filter(
+    exportacao_data_list: List[ExportacaoItemData],
+    commit: bool = True
+) -> int:
+    rows = [
+        {
+            "ano": item_data.ano,
+            "tipo_exportacao": item_data.tipo_exportacao,
+            "pais": item_data.pais,
+            "quantidade_kg": item_data.quantidade_kg,
+            "valor_usd": item_data.valor_usd
+        }
+        for item_data in exportacao_data_list
+        if item_data.ano == year and item_data.tipo_exportacao == tipo_exportacao
+    ]
+
+    num_written = bulk_write.replace_slice(
+        db, ExportacaoModel, filtros={"ano": year, "tipo_exportacao": tipo_exportacao}, rows=rows,
+        chave=("ano", "tipo_exportacao", "pais"), constraint="_exp_ano_tipo_pais_uc"
+    )
+    slice_events.slice_written(db, "exportacao", tipo_exportacao, year)
+    if commit:
+        db.commit()
+    logger.info("CRUD_EXPORTACAO: %s registros para o ano %s e tipo '%s' inseridos/atualizados.", num_written, year, tipo_exportacao)
+    return num_written
+
+async def get_exportacao_by_year_and_type(
+    db: AsyncSession, 
+    year: int, 
+    tipo_exportacao: str
+) -> List[RowMapping]:
+
+    logger.debug("CRUD_EXPORTACAO: Buscando dados para o ano %s e tipo '%s' no DB.", year, tipo_exportacao)
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
         ExportacaoModel.ano == year,
         ExportacaoModel.tipo_exportacao == tipo_exportacao
-    ).delete(synchronize_session=False)
-    print(f"CRUD_EXPORTACAO: Registros antigos para o ano {year} e tipo '{tipo_exportacao}' deletados.")
-    
-    db_exportacao_list: List[ExportacaoModel] = []
-    for item_data in exportacao_data_list:
-        if item_data.ano == year and item_data.tipo_exportacao == tipo_exportacao:
-            db_item = ExportacaoModel(
-                ano=item_data.ano,
-                tipo_exportacao=item_data.tipo_exportacao,
-                pais=item_data.pais,
-                quantidade_kg=item_data.quantidade_kg,
-                valor_usd=item_data.valor_usd
-            )
-            db_exportacao_list.append(db_item)
-            
-    if db_exportacao_list:
-        db.add_all(db_exportacao_list)
-    db.commit()
-    print(f"CRUD_EXPORTACAO: {len(db_exportacao_list)} novos registros para o ano {year} e tipo '{tipo_exportacao}' inseridos.")
-    return db_exportacao_list
-
-def get_exportacao_by_year_and_type(
-    db: Session, 
-    year: int, 
+    ))
+    return list(result.mappings().all())
+
+async def get_exportacao_by_year_range_and_type(
+    db: AsyncSession,
+    ano_inicio: int,
+    ano_fim: int,
     tipo_exportacao: str
-) -> List[ExportacaoModel]:
+) -> List[RowMapping]:
+
+    logger.debug("CRUD_EXPORTACAO: Buscando dados de %s a %s e tipo '%s' no DB.", ano_inicio, ano_fim, tipo_exportacao)
+    # Atendida pelo índice (tipo_exportacao, ano).
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
+        ExportacaoModel.tipo_exportacao == tipo_exportacao,
+        ExportacaoModel.ano.between(ano_inicio, ano_fim)
+    ).order_by(ExportacaoModel.ano, ExportacaoModel.id))
+    return list(result.mappings().all())
+
+async def get_exportacao_page(
+    db: AsyncSession,
+    year: int,
+    tipo_exportacao: str,
+    campos: Sequence[str],
+    paises: Optional[Sequence[str]] = None,
+    min_kg: Optional[float] = None,
+    min_usd: Optional[float] = None,
+    apos_pais: Optional[str] = None,
+    limite: int = 50
+) -> List[Row]:
+    """
+    Página da fatia (ano, tipo) ordenada por país, com keyset em `pais` (único dentro da fatia).
 
-    print(f"CRUD_EXPORTACAO: Buscando dados para o ano {year} e tipo '{tipo_exportacao}' no DB.")
-    return db.query(ExportacaoModel).filter(
+    Seleciona só as colunas de `campos` (mais `pais`, usado como cursor) e busca `limite + 1` linhas
+    para saber se há próxima página.
+    """
+    logger.debug("CRUD_EXPORTACAO: Buscando página (após %r, %s linhas) de %s/'%s' no DB.", apos_pais, limite, year, tipo_exportacao)
+    colunas = [ExportacaoModel.__table__.c[campo] for campo in campos if campo != "pais"]
+    stmt = select(ExportacaoModel.pais, *colunas).where(
         ExportacaoModel.ano == year,
         ExportacaoModel.tipo_exportacao == tipo_exportacao
-    ).all()
\ No newline at end of file
+    )
+    if paises:
+        stmt = stmt.where(ExportacaoModel.pais.in_(paises))
+    if min_kg is not None:
+        stmt = stmt.where(ExportacaoModel.quantidade_kg >= min_kg)
+    if min_usd is not None:
+        stmt = stmt.where(ExportacaoModel.valor_usd >= min_usd)
+    if apos_pais is not None:
+        stmt = stmt.where(ExportacaoModel.pais > apos_pais)
+    result = await db.execute(stmt.order_by(ExportacaoModel.pais).limit(limite + 1))
+    return list(result.all())
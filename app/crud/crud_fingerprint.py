@@ -0,0 +1,34 @@
+import logging
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.fingerprint_model import PaginaFingerprint, TIPO_GERAL
+
+logger = logging.getLogger(__name__)
+
+def get_fingerprint(db: Session, categoria: str, tipo: Optional[str], ano: int) -> Optional[str]:
+
+    registro = db.query(PaginaFingerprint).filter(
+        PaginaFingerprint.categoria == categoria,
+        PaginaFingerprint.tipo == (tipo or TIPO_GERAL),
+        PaginaFingerprint.ano == ano
+    ).first()
+    return registro.hash_conteudo if registro else None
+
+def save_fingerprint(db: Session, categoria: str, tipo: Optional[str], ano: int, hash_conteudo: str, commit: bool = True) -> PaginaFingerprint:
+
+    registro = db.query(PaginaFingerprint).filter(
+        PaginaFingerprint.categoria == categoria,
+        PaginaFingerprint.tipo == (tipo or TIPO_GERAL),
+        PaginaFingerprint.ano == ano
+    ).first()
+    if registro is None:
+        registro = PaginaFingerprint(categoria=categoria, tipo=tipo or TIPO_GERAL, ano=ano, hash_conteudo=hash_conteudo)
+        db.add(registro)
+    else:
+        registro.hash_conteudo = hash_conteudo
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    logger.debug("CRUD_FINGERPRINT: Fingerprint de %s/%s %s registrado (%s).", categoria, tipo or TIPO_GERAL, ano, hash_conteudo[:12])
+    return registro
@@ -1,46 +1,104 @@
+import logging
+from sqlalchemy import Row, RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from app.models.importacao_model import Importacao as ImportacaoModel
 from app.schemas.importacao_schemas import ImportacaoItemData
+from app.crud import bulk_write, slice_events
+
+logger = logging.getLogger(__name__)
+
+# Colunas lidas pelas rotas de consulta (os campos de ImportacaoItemData), sem materializar objetos ORM.
+COLUNAS_LEITURA = tuple(ImportacaoModel.__table__.c[campo] for campo in ImportacaoItemData.model_fields)
 
 def create_or_replace_importacao_for_year_and_type(
     db: Session, 
     year: int, 
     tipo_importacao: str,
-    importacao_data_list: List[ImportacaoItemData]
-) -> List[ImportacaoModel]:
-    db.query(ImportacaoModel).filter(
+    importacao_data_list: List[ImportacaoItemData],
+    commit: bool = True
+) -> int:
+    rows = [
+        {
+            "ano": item_data.ano,
+            "tipo_importacao": item_data.tipo_importacao,
+            "pais": item_data.pais,
+            "quantidade_kg": item_data.quantidade_kg,
+            "valor_usd": item_data.valor_usd
+        }
+        for item_data in importacao_data_list
+        if item_data.ano == year and item_data.tipo_importacao == tipo_importacao
+    ]
+
+    num_written = bulk_write.replace_slice(
+        db, ImportacaoModel, filtros={"ano": year, "tipo_importacao": tipo_importacao}, rows=rows,
+        chave=("ano", "tipo_importacao", "pais"), constraint="_imp_ano_tipo_pais_uc"
+    )
+    slice_events.slice_written(db, "importacao", tipo_importacao, year)
+    if commit:
+        db.commit()
+    logger.info("CRUD_IMPORTACAO: %s registros para o ano %s e tipo '%s' inseridos/atualizados.", num_written, year, tipo_importacao)
+    return num_written
+
+async def get_importacao_by_year_and_type(
+    db: AsyncSession, 
+    year: int, 
+    tipo_importacao: str
+) -> List[RowMapping]:
+
+    logger.debug("CRUD_IMPORTACAO: Buscando dados para o ano %s e tipo '%s' no DB.", year, tipo_importacao)
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
         ImportacaoModel.ano == year,
         ImportacaoModel.tipo_importacao == tipo_importacao
-    ).delete(synchronize_session=False)
-    print(f"CRUD_IMPORTACAO: Registros antigos para o ano {year} e tipo '{tipo_importacao}' deletados.")
-    
-    db_importacao_list: List[ImportacaoModel] = []
-    for item_data in importacao_data_list:
-        if item_data.ano == year and item_data.tipo_importacao == tipo_importacao:
-            db_item = ImportacaoModel(
-                ano=item_data.ano,
-                tipo_importacao=item_data.tipo_importacao,
-                pais=item_data.pais,
-                quantidade_kg=item_data.quantidade_kg,
-                valor_usd=item_data.valor_usd
-            )
-            db_importacao_list.append(db_item)
-            
-    if db_importacao_list:
-        db.add_all(db_importacao_list)
-    db.commit()
-    print(f"CRUD_IMPORTACAO: {len(db_importacao_list)} novos registros para o ano {year} e tipo '{tipo_importacao}' inseridos.")
-    return db_importacao_list
-
-def get_importacao_by_year_and_type(
-    db: Session, 
-    year: int, 
+    ))
+    return list(result.mappings().all())
+
+async def get_importacao_by_year_range_and_type(
+    db: AsyncSession,
+    ano_inicio: int,
+    ano_fim: int,
     tipo_importacao: str
-) -> List[ImportacaoModel]:
+) -> List[RowMapping]:
+
+    logger.debug("CRUD_IMPORTACAO: Buscando dados de %s a %s e tipo '%s' no DB.", ano_inicio, ano_fim, tipo_importacao)
+    # Atendida pelo índice (tipo_importacao, ano).
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
+        ImportacaoModel.tipo_importacao == tipo_importacao,
+        ImportacaoModel.ano.between(ano_inicio, ano_fim)
+    ).order_by(ImportacaoModel.ano, ImportacaoModel.id))
+    return list(result.mappings().all())
+
+async def get_importacao_page(
+    db: AsyncSession,
+    year: int,
+    tipo_importacao: str,
+    campos: Sequence[str],
+    paises: Optional[Sequence[str]] = None,
+    min_kg: Optional[float] = None,
+    min_usd: Optional[float] = None,
+    apos_pais: Optional[str] = None,
+    limite: int = 50
+) -> List[Row]:
+    """
+    Página da fatia (ano, tipo) ordenada por país, com keyset em `pais` (único dentro da fatia).
 
-    print(f"CRUD_IMPORTACAO: Buscando dados para o ano {year} e tipo '{tipo_importacao}' no DB.")
-    return db.query(ImportacaoModel).filter(
+    Seleciona só as colunas de `campos` (mais `pais`, usado como cursor) e busca `limite + 1` linhas
+    para saber se há próxima página.
+    """
+    logger.debug("CRUD_IMPORTACAO: Buscando página (após %r, %s linhas) de %s/'%s' no DB.", apos_pais, limite, year, tipo_importacao)
+    colunas = [ImportacaoModel.__table__.c[campo] for campo in campos if campo != "pais"]
+    stmt = select(ImportacaoModel.pais, *colunas).where(
         ImportacaoModel.ano == year,
         ImportacaoModel.tipo_importacao == tipo_importacao
-    ).all()
\ No newline at end of file
+    )
+    if paises:
+        stmt = stmt.where(ImportacaoModel.pais.in_(paises))
+    if min_kg is not None:
+        stmt = stmt.where(ImportacaoModel.quantidade_kg >= min_kg)
+    if min_usd is not None:
+        stmt = stmt.where(ImportacaoModel.valor_usd >= min_usd)
+    if apos_pais is not None:
+        stmt = stmt.where(ImportacaoModel.pais > apos_pais)
+    result = await db.execute(stmt.order_by(ImportacaoModel.pais).limit(limite + 1))
+    return list(result.all())
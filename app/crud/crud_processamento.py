@@ -1,45 +1,69 @@
+import logging
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.processamento_model import Processamento as ProcessamentoModel
 from app.schemas.processamento_schemas import ProcessamentoItemData 
+from app.crud import bulk_write, slice_events
+
+logger = logging.getLogger(__name__)
+
+# Colunas lidas pelas rotas de consulta (os campos de ProcessamentoItemData), sem materializar objetos ORM.
+COLUNAS_LEITURA = tuple(ProcessamentoModel.__table__.c[campo] for campo in ProcessamentoItemData.model_fields)
 
 def create_or_replace_processamento_for_year_and_type(
     db: Session, 
     year: int, 
     tipo_processamento: str,
-    processamento_data_list: List[ProcessamentoItemData]
-) -> List[ProcessamentoModel]:
-    db.query(ProcessamentoModel).filter(
-        ProcessamentoModel.ano == year,
-        ProcessamentoModel.tipo_processamento == tipo_processamento
-    ).delete(synchronize_session=False)
-    print(f"CRUD_PROCESSAMENTO: Registros antigos para o ano {year} e tipo '{tipo_processamento}' deletados.")
-    
-    db_processamento_list: List[ProcessamentoModel] = []
-    for item_data in processamento_data_list:
-        if item_data.ano == year and item_data.tipo_processamento == tipo_processamento:
-            db_item = ProcessamentoModel(
-                ano=item_data.ano,
-                tipo_processamento=item_data.tipo_processamento,
-                cultivar=item_data.cultivar,
-                quantidade_kg=item_data.quantidade_kg
-            )
-            db_processamento_list.append(db_item)
-    
-    if db_processamento_list:
-        db.add_all(db_processamento_list)
-    db.commit()
-    print(f"CRUD_PROCESSAMENTO: {len(db_processamento_list)} novos registros para o ano {year} e tipo '{tipo_processamento}' inseridos.")
-    return db_processamento_list
-
-def get_processamento_by_year_and_type(
-    db: Session, 
+    processamento_data_list: List[ProcessamentoItemData],
+    commit: bool = True
+) -> int:
+    rows = [
+        {
+            "ano": item_data.ano,
+            "tipo_processamento": item_data.tipo_processamento,
+            "cultivar": item_data.cultivar,
+            "quantidade_kg": item_data.quantidade_kg
+        }
+        for item_data in processamento_data_list
+        if item_data.ano == year and item_data.tipo_processamento == tipo_processamento
+    ]
+
+    num_written = bulk_write.replace_slice(
+        db, ProcessamentoModel, filtros={"ano": year, "tipo_processamento": tipo_processamento}, rows=rows,
+        chave=("ano", "tipo_processamento", "cultivar"), constraint="_ano_tipo_cultivar_uc"
+    )
+    slice_events.slice_written(db, "processamento", tipo_processamento, year)
+    if commit:
+        db.commit()
+    logger.info("CRUD_PROCESSAMENTO: %s registros para o ano %s e tipo '%s' inseridos/atualizados.", num_written, year, tipo_processamento)
+    return num_written
+
+async def get_processamento_by_year_and_type(
+    db: AsyncSession, 
     year: int, 
     tipo_processamento: str
-) -> List[ProcessamentoModel]:
+) -> List[RowMapping]:
 
-    print(f"CRUD_PROCESSAMENTO: Buscando dados para o ano {year} e tipo '{tipo_processamento}' no DB.")
-    return db.query(ProcessamentoModel).filter(
+    logger.debug("CRUD_PROCESSAMENTO: Buscando dados para o ano %s e tipo '%s' no DB.", year, tipo_processamento)
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
         ProcessamentoModel.ano == year,
         ProcessamentoModel.tipo_processamento == tipo_processamento
-    ).all()
\ No newline at end of file
+    ))
+    return list(result.mappings().all())
+
+async def get_processamento_by_year_range_and_type(
+    db: AsyncSession,
+    ano_inicio: int,
+    ano_fim: int,
+    tipo_processamento: str
+) -> List[RowMapping]:
+
+    logger.debug("CRUD_PROCESSAMENTO: Buscando dados de %s a %s e tipo '%s' no DB.", ano_inicio, ano_fim, tipo_processamento)
+    # Atendida pelo índice (tipo_processamento, ano).
+    result = await db.execute(select(*COLUNAS_LEITURA).where(
+        ProcessamentoModel.tipo_processamento == tipo_processamento,
+        ProcessamentoModel.ano.between(ano_inicio, ano_fim)
+    ).order_by(ProcessamentoModel.ano, ProcessamentoModel.id))
+    return list(result.mappings().all())
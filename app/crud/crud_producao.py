@@ -1,45 +1,61 @@
+import logging
+from sqlalchemy import RowMapping, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.producao_model import Producao as ProducaoModel
 from app.schemas.producao_schemas import ProducaoItemData
+from app.crud import bulk_write, slice_events
+
+logger = logging.getLogger(__name__)
+
+# Colunas lidas pelas rotas de consulta (os campos de ProducaoItemData), sem materializar objetos ORM.
+COLUNAS_LEITURA = tuple(ProducaoModel.__table__.c[campo] for campo in ProducaoItemData.model_fields)
 
 def create_or_replace_producao_for_year(
     db: Session,
     year: int,
-    producao_data_list: List[ProducaoItemData]
-) -> List[ProducaoModel]:
-
-    num_deleted = db.query(ProducaoModel).filter(ProducaoModel.ano == year).delete(synchronize_session=False)
-    if num_deleted > 0:
-        print(f"CRUD_PRODUCAO: {num_deleted} registros antigos para o ano {year} deletados.")
-    else:
-        print(f"CRUD_PRODUCAO: Nenhum registro antigo encontrado para o ano {year} para deletar.")
+    producao_data_list: List[ProducaoItemData],
+    commit: bool = True
+) -> int:
 
-    db_producao_list: List[ProducaoModel] = []
+    rows = []
     for item_data in producao_data_list:
 
         if item_data.ano == year:
-            db_item = ProducaoModel(
-                ano=item_data.ano,
-                produto=item_data.produto,
-                sub_produto=item_data.sub_produto,
-                quantidade_litros=item_data.quantidade_litros
-            )
-            db_producao_list.append(db_item)
+            rows.append({
+                "ano": item_data.ano,
+                "produto": item_data.produto,
+                "sub_produto": item_data.sub_produto,
+                "quantidade_litros": item_data.quantidade_litros
+            })
         else:
-            print(f"CRUD_PRODUCAO WARNING: Item com ano {item_data.ano} ignorado ao processar para o ano {year}.")
-    
-    if db_producao_list:
-        db.add_all(db_producao_list)
+            logger.warning("CRUD_PRODUCAO: Item com ano %s ignorado ao processar para o ano %s.", item_data.ano, year)
+
+    num_written = bulk_write.replace_slice(
+        db, ProducaoModel, filtros={"ano": year}, rows=rows,
+        chave=("ano", "produto", "sub_produto"), constraint="_ano_produto_subproduto_uc"
+    )
+
+    slice_events.slice_written(db, "producao", None, year)
+    if commit:
+        db.commit()
+    logger.info("CRUD_PRODUCAO: %s registros para o ano %s inseridos/atualizados.", num_written, year)
+
+    return num_written
 
-    db.commit()
-    print(f"CRUD_PRODUCAO: {len(db_producao_list)} novos registros para o ano {year} inseridos/atualizados.")
+async def get_producao_by_year(db: AsyncSession, year: int) -> List[RowMapping]:
 
-    return db_producao_list
+    logger.debug("CRUD_PRODUCAO: Buscando dados de produção para o ano %s no banco de dados.", year)
+    result = await db.execute(select(*COLUNAS_LEITURA).where(ProducaoModel.ano == year))
+    results = list(result.mappings().all())
+    logger.debug("CRUD_PRODUCAO: Encontrados %s registros para o ano %s.", len(results), year)
+    return results
 
-def get_producao_by_year(db: Session, year: int) -> List[ProducaoModel]:
+async def get_producao_by_year_range(db: AsyncSession, ano_inicio: int, ano_fim: int) -> List[RowMapping]:
 
-    print(f"CRUD_PRODUCAO: Buscando dados de produção para o ano {year} no banco de dados.")
-    results = db.query(ProducaoModel).filter(ProducaoModel.ano == year).all()
-    print(f"CRUD_PRODUCAO: Encontrados {len(results)} registros para o ano {year}.")
-    return results
\ No newline at end of file
+    logger.debug("CRUD_PRODUCAO: Buscando dados de produção de %s a %s no banco de dados.", ano_inicio, ano_fim)
+    result = await db.execute(
+        select(*COLUNAS_LEITURA).where(ProducaoModel.ano.between(ano_inicio, ano_fim)).order_by(ProducaoModel.ano, ProducaoModel.id)
+    )
+    return list(result.mappings().all())
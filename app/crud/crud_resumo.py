@@ -0,0 +1,92 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, Optional
+from app.models.fingerprint_model import TIPO_GERAL
+from app.models.resumo_model import ResumoDados
+from app.models.producao_model import Producao
+from app.models.comercializacao_model import Comercializacao
+from app.models.processamento_model import Processamento
+from app.models.importacao_model import Importacao
+from app.models.exportacao_model import Exportacao
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class FonteResumo:
+    model: type
+    coluna_tipo: Optional[str]
+    medidas: Dict[str, str]  # coluna de ResumoDados -> coluna somada na tabela de dados
+
+FONTES: Dict[str, FonteResumo] = {
+    "producao": FonteResumo(Producao, None, {"total_litros": "quantidade_litros"}),
+    "comercializacao": FonteResumo(Comercializacao, None, {"total_litros": "quantidade_litros"}),
+    "processamento": FonteResumo(Processamento, "tipo_processamento", {"total_kg": "quantidade_kg"}),
+    "importacao": FonteResumo(Importacao, "tipo_importacao", {"total_kg": "quantidade_kg", "total_usd": "valor_usd"}),
+    "exportacao": FonteResumo(Exportacao, "tipo_exportacao", {"total_kg": "quantidade_kg", "total_usd": "valor_usd"}),
+}
+
+def refresh_resumo(db: Session, categoria: str, tipo: Optional[str], ano: int) -> None:
+    """Recalcula no banco (SUM/COUNT sobre a fatia recém-gravada) o resumo de (categoria, tipo, ano)."""
+    fonte = FONTES[categoria]
+    table = fonte.model.__table__
+    condicoes = [table.c.ano == ano]
+    if fonte.coluna_tipo:
+        condicoes.append(table.c[fonte.coluna_tipo] == tipo)
+    colunas_medida = [table.c[coluna] for coluna in fonte.medidas.values()]
+
+    agregados = db.execute(
+        select(
+            func.count(),
+            func.count().filter(or_(*(coluna.is_(None) for coluna in colunas_medida))),
+            *(func.coalesce(func.sum(coluna), 0.0) for coluna in colunas_medida),
+        ).select_from(table).where(*condicoes)
+    ).one()
+
+    valores = {"linhas": agregados[0], "linhas_sem_valor": agregados[1], "atualizado_em": datetime.now(timezone.utc)}
+    valores.update({campo: round(float(total), 2) for campo, total in zip(fonte.medidas, agregados[2:])})
+
+    filtros = (ResumoDados.categoria == categoria, ResumoDados.tipo == (tipo or TIPO_GERAL), ResumoDados.ano == ano)
+    if db.execute(update(ResumoDados).where(*filtros).values(**valores)).rowcount == 0:
+        db.execute(insert(ResumoDados).values(categoria=categoria, tipo=tipo or TIPO_GERAL, ano=ano, **valores))
+
+def rebuild_all(db: Session, commit: bool = True) -> int:
+    """Recalcula os resumos de todas as fatias existentes (bancos populados antes da tabela de resumos)."""
+    total = 0
+    for categoria, fonte in FONTES.items():
+        table = fonte.model.__table__
+        colunas = [table.c.ano] + ([table.c[fonte.coluna_tipo]] if fonte.coluna_tipo else [])
+        for row in db.execute(select(*colunas).distinct()).all():
+            refresh_resumo(db, categoria, row[1] if fonte.coluna_tipo else None, row[0])
+            total += 1
+    if commit:
+        db.commit()
+    logger.debug("CRUD_RESUMO: %s resumos recalculados.", total)
+    return total
+
+async def get_resumo(db: AsyncSession, categoria: str, tipo: Optional[str], ano: int) -> Optional[ResumoDados]:
+
+    result = await db.execute(select(ResumoDados).where(
+        ResumoDados.categoria == categoria,
+        ResumoDados.tipo == (tipo or TIPO_GERAL),
+        ResumoDados.ano == ano
+    ))
+    return result.scalars().first()
+
+async def get_resumos_by_year_range(
+    db: AsyncSession,
+    categoria: str,
+    tipo: Optional[str],
+    ano_inicio: int,
+    ano_fim: int
+) -> Dict[int, ResumoDados]:
+
+    result = await db.execute(select(ResumoDados).where(
+        ResumoDados.categoria == categoria,
+        ResumoDados.tipo == (tipo or TIPO_GERAL),
+        ResumoDados.ano.between(ano_inicio, ano_fim)
+    ))
+    return {resumo.ano: resumo for resumo in result.scalars().all()}
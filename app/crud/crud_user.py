@@ -1,18 +1,21 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from app.models import user as user_model
 from app.schemas import user_schemas
 from app.core.security import get_password_hash
 
-def get_user(db: Session, user_id: int) -> Optional[user_model.User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[user_model.User]:
 
-    return db.query(user_model.User).filter(user_model.User.id == user_id).first()
+    result = await db.execute(select(user_model.User).where(user_model.User.id == user_id))
+    return result.scalars().first()
 
-def get_user_by_username(db: Session, username: str) -> Optional[user_model.User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[user_model.User]:
 
-    return db.query(user_model.User).filter(user_model.User.username == username).first()
+    result = await db.execute(select(user_model.User).where(user_model.User.username == username))
+    return result.scalars().first()
 
-def create_user(db: Session, user_create_schema: user_schemas.UserCreate) -> user_model.User:
+async def create_user(db: AsyncSession, user_create_schema: user_schemas.UserCreate) -> user_model.User:
 
     hashed_password = get_password_hash(user_create_schema.password)
     
@@ -23,6 +26,6 @@ def create_user(db: Session, user_create_schema: user_schemas.UserCreate) -> use
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
\ No newline at end of file
@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+from app.models.fingerprint_model import TIPO_GERAL
+from app.models.versao_model import DatasetVersao
+
+def bump_version(db: Session, categoria: str, tipo: Optional[str], ano: int) -> None:
+    # Roda na mesma transação da gravação da fatia: um rollback desfaz também a nova versão.
+    filtros = (
+        DatasetVersao.categoria == categoria,
+        DatasetVersao.tipo == (tipo or TIPO_GERAL),
+        DatasetVersao.ano == ano,
+    )
+    agora = datetime.now(timezone.utc)
+    resultado = db.execute(
+        update(DatasetVersao).where(*filtros).values(versao=DatasetVersao.versao + 1, atualizado_em=agora)
+    )
+    if resultado.rowcount == 0:
+        db.execute(insert(DatasetVersao).values(categoria=categoria, tipo=tipo or TIPO_GERAL, ano=ano, versao=1, atualizado_em=agora))
+
+async def get_version(db: AsyncSession, categoria: str, tipo: Optional[str], ano: int) -> Optional[Tuple[int, datetime]]:
+
+    result = await db.execute(select(DatasetVersao.versao, DatasetVersao.atualizado_em).where(
+        DatasetVersao.categoria == categoria,
+        DatasetVersao.tipo == (tipo or TIPO_GERAL),
+        DatasetVersao.ano == ano
+    ))
+    row = result.first()
+    return (row.versao, row.atualizado_em) if row else None
+
+def version_token_query(categoria: Optional[str] = None, tipo: Optional[str] = None):
+    # Qualquer regravação de fatia incrementa a soma das versões: (fatias, soma) muda a cada carga.
+    stmt = select(func.count(), func.coalesce(func.sum(DatasetVersao.versao), 0))
+    if categoria:
+        stmt = stmt.where(DatasetVersao.categoria == categoria)
+    if tipo:
+        stmt = stmt.where(DatasetVersao.tipo == tipo)
+    return stmt
+
+def format_version_token(row) -> str:
+    return f"{row[0]}-{row[1]}"
+
+async def get_version_token(db: AsyncSession, categoria: Optional[str] = None, tipo: Optional[str] = None) -> str:
+
+    result = await db.execute(version_token_query(categoria, tipo))
+    return format_version_token(result.one())
+
+def get_all_versions(db: Session) -> Dict[Tuple[str, str, int], int]:
+
+    rows = db.execute(select(DatasetVersao.categoria, DatasetVersao.tipo, DatasetVersao.ano, DatasetVersao.versao)).all()
+    return {(row.categoria, row.tipo, row.ano): row.versao for row in rows}
+
+async def get_versions_by_year_range(
+    db: AsyncSession,
+    categoria: str,
+    tipo: Optional[str],
+    ano_inicio: int,
+    ano_fim: int
+) -> Dict[int, int]:
+
+    result = await db.execute(select(DatasetVersao.ano, DatasetVersao.versao).where(
+        DatasetVersao.categoria == categoria,
+        DatasetVersao.tipo == (tipo or TIPO_GERAL),
+        DatasetVersao.ano.between(ano_inicio, ano_fim)
+    ))
+    return {row.ano: row.versao for row in result.all()}
@@ -0,0 +1,45 @@
+import logging
+from typing import Callable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud import crud_resumo, crud_versao
+
+logger = logging.getLogger(__name__)
+
+# (categoria, tipo, ano) de uma fatia gravada; tipo é None para Produção e Comercialização.
+Fatia = Tuple[str, Optional[str], int]
+
+_listeners: List[Callable[[Fatia], None]] = []
+
+_PENDENTES = "fatias_gravadas"
+
+
+def on_slice_committed(listener: Callable[[Fatia], None]) -> Callable[[Fatia], None]:
+    """Registra `listener` para ser chamado com cada fatia gravada, depois do commit que a persistiu."""
+    _listeners.append(listener)
+    return listener
+
+
+def slice_written(db: Session, categoria: str, tipo: Optional[str], ano: int) -> None:
+    crud_versao.bump_version(db, categoria, tipo, ano)
+    crud_resumo.refresh_resumo(db, categoria, tipo, ano)
+    # Só notifica no commit: com commit=False a fatia pode ainda ser revertida pelo bloco.
+    pendentes: Set[Fatia] = db.info.setdefault(_PENDENTES, set())
+    pendentes.add((categoria, tipo, ano))
+
+
+@event.listens_for(Session, "after_commit")
+def _notificar_fatias(db: Session) -> None:
+    for fatia in db.info.pop(_PENDENTES, ()):
+        for listener in _listeners:
+            try:
+                listener(fatia)
+            except Exception as e:
+                logger.error("SLICE_EVENTS: Falha ao notificar %s: %s: %s", fatia, type(e).__name__, e)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_fatias(db: Session) -> None:
+    db.info.pop(_PENDENTES, None)
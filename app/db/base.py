@@ -7,4 +7,14 @@ from app.models.producao_model import Producao
 from app.models.processamento_model import Processamento
 from app.models.comercializacao_model import Comercializacao
 from app.models.importacao_model import Importacao
-from app.models.exportacao_model import Exportacao
\ No newline at end of file
+from app.models.exportacao_model import Exportacao
+from app.models.fingerprint_model import PaginaFingerprint
+from app.models.versao_model import DatasetVersao
+from app.models.resumo_model import ResumoDados
+
+def create_tables(bind) -> None:
+    Base.metadata.create_all(bind=bind)
+    # create_all não adiciona índices novos a tabelas que já existem.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
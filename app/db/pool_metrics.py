@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """Contadores de um pool de conexões: checkouts, tempo de espera por conexão e uso de overflow."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.conexoes_abertas = 0
+        self.invalidacoes = 0
+        self.timeouts = 0
+        self.espera_total_s = 0.0
+        self.espera_max_s = 0.0
+        self.checkouts_com_espera = 0
+        self.pico_em_uso = 0
+        self.pico_overflow = 0
+        self._pool: Optional[Pool] = None
+
+    def registrar_espera(self, segundos: float, timeout: bool = False) -> None:
+        with self._lock:
+            self.espera_total_s += segundos
+            self.espera_max_s = max(self.espera_max_s, segundos)
+            if segundos >= 0.001:
+                self.checkouts_com_espera += 1
+            if timeout:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict:
+        pool = self._pool
+        em_uso = pool.checkedout() if pool is not None and hasattr(pool, "checkedout") else None
+        return {
+            "pool": self.nome,
+            "classe": type(pool).__name__ if pool is not None else None,
+            "tamanho": pool.size() if pool is not None and hasattr(pool, "size") else None,
+            "em_uso": em_uso,
+            "ociosas": pool.checkedin() if pool is not None and hasattr(pool, "checkedin") else None,
+            "overflow_atual": pool.overflow() if pool is not None and hasattr(pool, "overflow") else None,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "conexoes_abertas": self.conexoes_abertas,
+            "invalidacoes": self.invalidacoes,
+            "timeouts": self.timeouts,
+            "checkouts_com_espera": self.checkouts_com_espera,
+            "espera_media_ms": round(self.espera_total_s / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "espera_max_ms": round(self.espera_max_s * 1000, 3),
+            "pico_em_uso": self.pico_em_uso,
+            "pico_overflow": self.pico_overflow,
+        }
+
+
+POOL_METRICS: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(nome: str) -> PoolMetrics:
+    return POOL_METRICS.setdefault(nome, PoolMetrics(nome))
+
+
+def timed_pool_class(base: Type[Pool], metricas: PoolMetrics) -> Type[Pool]:
+    """Subclasse do pool que cronometra a espera por conexão (o SQLAlchemy não tem evento para isso)."""
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = base._do_get(self)
+        except Exception as e:
+            metricas.registrar_espera(time.perf_counter() - inicio, timeout="TimeoutError" in type(e).__name__)
+            raise
+        metricas.registrar_espera(time.perf_counter() - inicio)
+        return conexao
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine: Engine, nome: str) -> PoolMetrics:
+    metricas = get_pool_metrics(nome)
+    metricas._pool = engine.pool
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metricas.conexoes_abertas += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool  # dispose() troca o pool da engine
+        metricas._pool = pool
+        metricas.checkouts += 1
+        if hasattr(pool, "checkedout"):
+            metricas.pico_em_uso = max(metricas.pico_em_uso, pool.checkedout())
+        if hasattr(pool, "overflow"):
+            metricas.pico_overflow = max(metricas.pico_overflow, pool.overflow())
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metricas.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metricas.invalidacoes += 1
+
+    return metricas
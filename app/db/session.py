@@ -1,16 +1,76 @@
+import logging
+from typing import Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
+from app.core.metrics import instrument_engine_queries
+from app.db.pool_metrics import get_pool_metrics, instrument_engine, timed_pool_class
 
-print(f"DEBUG - DATABASE_URL: {DATABASE_URL}")
-engine = create_engine(DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+def _to_async_url(url: str) -> str:
+    # Mesmo banco, driver assíncrono: aiosqlite para SQLite local, asyncpg para PostgreSQL.
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend in ("postgresql", "postgres"):
+        query = dict(parsed.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode and sslmode != "disable":
+            query["ssl"] = sslmode
+        return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+    return url
+
+def _pool_kwargs(url: str, nome: str, is_async: bool) -> Dict:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # SQLite em memória usa um pool próprio de conexão única
+    base_pool = AsyncAdaptedQueuePool if is_async else QueuePool
+    return {
+        "poolclass": timed_pool_class(base_pool, get_pool_metrics(nome)),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+logger.info("DB_SESSION: Banco de dados: %s", make_url(DATABASE_URL).render_as_string(hide_password=True))
+engine = create_engine(DATABASE_URL, **_pool_kwargs(DATABASE_URL, "sync", is_async=False))
+instrument_engine(engine, "sync")
+instrument_engine_queries(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona usada pelos endpoints de leitura; os scripts continuam com SessionLocal.
+_async_url = ASYNC_DATABASE_URL or _to_async_url(DATABASE_URL)
+async_engine = create_async_engine(_async_url, **_pool_kwargs(_async_url, "async", is_async=True))
+instrument_engine(async_engine.sync_engine, "async")
+instrument_engine_queries(async_engine.sync_engine, "async")
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
 
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+
+    async with AsyncSessionLocal() as db:
+        yield db
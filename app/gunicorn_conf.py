@@ -0,0 +1,17 @@
+import os
+import shutil
+
+# Hooks do gunicorn para as métricas multiprocesso (PROMETHEUS_MULTIPROC_DIR): uso com `gunicorn -c app/gunicorn_conf.py`.
+
+
+def on_starting(server):
+    # Arquivos de uma execução anterior somariam contadores de workers que já não existem.
+    diretorio = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if diretorio:
+        shutil.rmtree(diretorio, ignore_errors=True)
+        os.makedirs(diretorio, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
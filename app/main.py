@@ -1,3 +1,4 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
@@ -5,8 +6,13 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 import os
-from app.db.base import Base
-from app.db.session import engine
+from app.core.logging_config import setup_logging
+setup_logging()  # antes dos demais imports: engine e serviços já logam ao serem importados
+
+from app.core import metrics
+from app.db.base import create_tables
+from app.db.session import engine, async_engine
+from app.services import embrapa_scraper, dataset_engine, request_profiler
 
 from app.api.v1.routers import producao_router
 from app.api.v1.routers import processamento_router
@@ -14,36 +20,46 @@ from app.api.v1.routers import comercializacao_router
 from app.api.v1.routers import importacao_router
 from app.api.v1.routers import exportacao_router
 from app.api.v1.routers import auth_router
+from app.api.v1.routers import resumo_router
+from app.api.v1.routers import analise_router
+from app.api.v1.routers import export_router
+from app.api.v1.routers import admin_router
+
+logger = logging.getLogger(__name__)
 
 PROJECT_ROOT_IN_CONTAINER = "/app"
 TEMPLATES_DIR = os.path.join(PROJECT_ROOT_IN_CONTAINER, "templates")
 STATIC_DIR = os.path.join(PROJECT_ROOT_IN_CONTAINER, "static")
 
 def create_db_and_tables():
-    print("MAIN.PY: Verificando e criando tabelas do banco de dados (se não existirem)...")
-    Base.metadata.create_all(bind=engine)
-    print("MAIN.PY: Tabelas do banco de dados prontas.")
+    logger.info("MAIN.PY: Verificando e criando tabelas do banco de dados (se não existirem)...")
+    create_tables(bind=engine)
+    logger.info("MAIN.PY: Tabelas do banco de dados prontas.")
 
 @asynccontextmanager
 async def lifespan(app_instance: FastAPI): 
-    print("MAIN.PY: Evento de inicialização (lifespan) - Início.")
+    logger.info("MAIN.PY: Evento de inicialização (lifespan) - Início.")
 
 
-    print(f"MAIN.PY DEBUG: Caminho esperado para TEMPLATES_DIR: {TEMPLATES_DIR}")
+    logger.debug("MAIN.PY DEBUG: Caminho esperado para TEMPLATES_DIR: %s", TEMPLATES_DIR)
     if not os.path.isdir(TEMPLATES_DIR):
-        print(f"MAIN.PY ERROR CRÍTICO: Diretório de templates NÃO ENCONTRADO em: {TEMPLATES_DIR}")
+        logger.error("MAIN.PY ERROR CRÍTICO: Diretório de templates NÃO ENCONTRADO em: %s", TEMPLATES_DIR)
     else:
-        print(f"MAIN.PY INFO: Diretório de templates ENCONTRADO em: {TEMPLATES_DIR}")
+        logger.info("MAIN.PY INFO: Diretório de templates ENCONTRADO em: %s", TEMPLATES_DIR)
 
-    print(f"MAIN.PY DEBUG: Caminho esperado para STATIC_DIR: {STATIC_DIR}")
+    logger.debug("MAIN.PY DEBUG: Caminho esperado para STATIC_DIR: %s", STATIC_DIR)
     if not os.path.isdir(STATIC_DIR):
-        print(f"MAIN.PY ERROR CRÍTICO: Diretório de estáticos NÃO ENCONTRADO em: {STATIC_DIR}")
+        logger.error("MAIN.PY ERROR CRÍTICO: Diretório de estáticos NÃO ENCONTRADO em: %s", STATIC_DIR)
     else:
-        print(f"MAIN.PY INFO: Diretório de estáticos ENCONTRADO em: {STATIC_DIR}")
+        logger.info("MAIN.PY INFO: Diretório de estáticos ENCONTRADO em: %s", STATIC_DIR)
 
     create_db_and_tables() # Cria as tabelas do banco de dados
+    await dataset_engine.start()
     yield
-    print("MAIN.PY: Evento de finalização (lifespan) - Fim.")
+    await dataset_engine.stop()
+    await embrapa_scraper.close_http_client()
+    await async_engine.dispose()
+    logger.info("MAIN.PY: Evento de finalização (lifespan) - Fim.")
 
 
 description = """
@@ -74,23 +90,27 @@ app = FastAPI(
         {"name": "Comercialização", "description": "Dados de comercialização."},
         {"name": "Importação", "description": "Dados de importação de produtos vitivinícolas."},
         {"name": "Exportação", "description": "Dados de exportação de produtos vitivinícolas."},
-        {"name": "Saúde", "description": "Verificação de status da API."}
+        {"name": "Resumo", "description": "Totais pré-calculados por categoria, tipo e ano."},
+        {"name": "Análise", "description": "Agrupamentos, agregações e top-N calculados no banco."},
+        {"name": "Exportação em lote", "description": "Tabelas completas em NDJSON/CSV, em streaming."},
+        {"name": "Saúde", "description": "Verificação de status da API."},
+        {"name": "Administração", "description": "Métricas operacionais (restrito a administradores)."}
     ],
     lifespan=lifespan
 )
 
 if os.path.isdir(STATIC_DIR):
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-    print(f"MAIN.PY INFO: Arquivos estáticos montados de '{STATIC_DIR}' em '/static'.")
+    logger.info("MAIN.PY INFO: Arquivos estáticos montados de '%s' em '/static'.", STATIC_DIR)
 else:
-    print(f"MAIN.PY ALERTA: Diretório estático '{STATIC_DIR}' não existe. Arquivos estáticos não serão servidos. Verifique seu Dockerfile e a estrutura do projeto.")
+    logger.warning("MAIN.PY ALERTA: Diretório estático '%s' não existe. Arquivos estáticos não serão servidos. Verifique seu Dockerfile e a estrutura do projeto.", STATIC_DIR)
 
 templates = None
 if os.path.isdir(TEMPLATES_DIR):
     templates = Jinja2Templates(directory=TEMPLATES_DIR)
-    print(f"MAIN.PY INFO: Templates Jinja2 configurados para o diretório '{TEMPLATES_DIR}'.")
+    logger.info("MAIN.PY INFO: Templates Jinja2 configurados para o diretório '%s'.", TEMPLATES_DIR)
 else:
-    print(f"MAIN.PY ALERTA: Diretório de templates '{TEMPLATES_DIR}' não existe. A página inicial não será servida corretamente.")
+    logger.warning("MAIN.PY ALERTA: Diretório de templates '%s' não existe. A página inicial não será servida corretamente.", TEMPLATES_DIR)
 
 
 origins = [
@@ -100,6 +120,8 @@ origins = [
     "http://127.0.0.1:8000",
     "https://techchallenger.onrender.com",
 ]
+app.add_middleware(request_profiler.ProfilerMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -124,7 +146,17 @@ app.include_router(processamento_router.router, prefix=f"{API_PREFIX}/processame
 app.include_router(comercializacao_router.router, prefix=f"{API_PREFIX}/comercializacao", tags=["Comercialização"])
 app.include_router(importacao_router.router, prefix=f"{API_PREFIX}/importacao", tags=["Importação"])
 app.include_router(exportacao_router.router, prefix=f"{API_PREFIX}/exportacao", tags=["Exportação"])
+app.include_router(resumo_router.router, prefix=f"{API_PREFIX}/resumo", tags=["Resumo"])
+app.include_router(analise_router.router, prefix=f"{API_PREFIX}/analise", tags=["Análise"])
+app.include_router(export_router.router, prefix=f"{API_PREFIX}/export", tags=["Exportação em lote"])
+app.include_router(admin_router.router, prefix=f"{API_PREFIX}/admin", tags=["Administração"])
 
 @app.get("/health", tags=["Saúde"], include_in_schema=True)
 async def health_check():
-    return {"status": "API online e operacional!"}
\ No newline at end of file
+    return {"status": "API online e operacional!"}
+
+if metrics.enabled():
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        # Formato texto do Prometheus; com PROMETHEUS_MULTIPROC_DIR soma todos os workers do gunicorn.
+        return metrics.metrics_response()
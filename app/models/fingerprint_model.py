@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+# Categorias sem subtipo (produção, comercialização) são registradas com este tipo.
+TIPO_GERAL = "geral"
+
+class PaginaFingerprint(Base):
+    __tablename__ = "controle_fingerprints"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    categoria = Column(String, nullable=False)
+    tipo = Column(String, nullable=False, default=TIPO_GERAL)
+    ano = Column(Integer, nullable=False)
+    hash_conteudo = Column(String(64), nullable=False)
+    atualizado_em = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint('categoria', 'tipo', 'ano', name='_fp_cat_tipo_ano_uc'),)
+
+    def __repr__(self):
+        return f"<PaginaFingerprint(categoria='{self.categoria}', tipo='{self.tipo}', ano='{self.ano}', hash='{self.hash_conteudo[:12]}')>"
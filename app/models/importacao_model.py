@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Index, UniqueConstraint
 from app.db.base import Base
 
 class Importacao(Base):
@@ -11,7 +11,11 @@ class Importacao(Base):
     quantidade_kg = Column(Float, nullable=True)
     valor_usd = Column(Float, nullable=True)
 
-    __table_args__ = (UniqueConstraint('ano', 'tipo_importacao', 'pais', name='_imp_ano_tipo_pais_uc'),)
+    __table_args__ = (UniqueConstraint('ano', 'tipo_importacao', 'pais', name='_imp_ano_tipo_pais_uc'),
+                      Index('ix_importacao_tipo_ano', 'tipo_importacao', 'ano'),
+                      # Agrupamentos por país dentro de um tipo (analise_router); no PostgreSQL cobre também as medidas.
+                      Index('ix_importacao_tipo_pais_ano', 'tipo_importacao', 'pais', 'ano',
+                            postgresql_include=['quantidade_kg', 'valor_usd']))
 
     def __repr__(self):
         return f"<Importacao(ano='{self.ano}', tipo='{self.tipo_importacao}', pais='{self.pais}', qtd_kg='{self.quantidade_kg}', val_usd='{self.valor_usd}')>"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Index, UniqueConstraint
 from app.db.base import Base
 
 class Processamento(Base):
@@ -10,7 +10,10 @@ class Processamento(Base):
     cultivar = Column(String, index=True, nullable=False)
     quantidade_kg = Column(Float, nullable=True)
 
-    __table_args__ = (UniqueConstraint('ano', 'tipo_processamento', 'cultivar', name='_ano_tipo_cultivar_uc'),)
+    __table_args__ = (UniqueConstraint('ano', 'tipo_processamento', 'cultivar', name='_ano_tipo_cultivar_uc'),
+                      Index('ix_processamento_tipo_ano', 'tipo_processamento', 'ano'),
+                      Index('ix_processamento_tipo_cultivar_ano', 'tipo_processamento', 'cultivar', 'ano',
+                            postgresql_include=['quantidade_kg']))
 
     def __repr__(self):
         return f"<Processamento(ano='{self.ano}', tipo='{self.tipo_processamento}', cultivar='{self.cultivar}', qtd_kg='{self.quantidade_kg}')>"
\ No newline at end of file
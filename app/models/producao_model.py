@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Index, UniqueConstraint
 from app.db.base import Base
 
 class Producao(Base):
@@ -10,7 +10,8 @@ class Producao(Base):
     sub_produto = Column(String, index=True, nullable=True)
     quantidade_litros = Column(Float, nullable=True)
 
-    __table_args__ = (UniqueConstraint('ano', 'produto', 'sub_produto', name='_ano_produto_subproduto_uc'),)
+    __table_args__ = (UniqueConstraint('ano', 'produto', 'sub_produto', name='_ano_produto_subproduto_uc'),
+                      Index('ix_producao_produto_ano', 'produto', 'ano', postgresql_include=['quantidade_litros']))
 
     def __repr__(self):
         return f"<Producao(ano='{self.ano}', produto='{self.produto}', sub_produto='{self.sub_produto}', qtd='{self.quantidade_litros}')>"
\ No newline at end of file
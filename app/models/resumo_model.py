@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+from app.models.fingerprint_model import TIPO_GERAL
+
+class ResumoDados(Base):
+    __tablename__ = "resumos_dados"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    categoria = Column(String, nullable=False)
+    tipo = Column(String, nullable=False, default=TIPO_GERAL)
+    ano = Column(Integer, nullable=False)
+    linhas = Column(Integer, nullable=False, default=0)
+    linhas_sem_valor = Column(Integer, nullable=False, default=0)
+    total_litros = Column(Float, nullable=True)
+    total_kg = Column(Float, nullable=True)
+    total_usd = Column(Float, nullable=True)
+    atualizado_em = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint('categoria', 'tipo', 'ano', name='_res_cat_tipo_ano_uc'),)
+
+    def __repr__(self):
+        return f"<ResumoDados(categoria='{self.categoria}', tipo='{self.tipo}', ano='{self.ano}', linhas='{self.linhas}')>"
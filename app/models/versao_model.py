@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+from app.models.fingerprint_model import TIPO_GERAL
+
+class DatasetVersao(Base):
+    __tablename__ = "controle_versoes_dataset"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    categoria = Column(String, nullable=False)
+    tipo = Column(String, nullable=False, default=TIPO_GERAL)
+    ano = Column(Integer, nullable=False)
+    versao = Column(Integer, nullable=False, default=1)
+    atualizado_em = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint('categoria', 'tipo', 'ano', name='_ver_cat_tipo_ano_uc'),)
+
+    def __repr__(self):
+        return f"<DatasetVersao(categoria='{self.categoria}', tipo='{self.tipo}', ano='{self.ano}', versao='{self.versao}')>"
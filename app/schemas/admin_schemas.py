@@ -0,0 +1,51 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+
+class PoolStatus(BaseModel):
+    pool: str = Field(..., description="Nome do pool ('sync' para scripts/startup, 'async' para os endpoints).")
+    classe: Optional[str] = Field(None, description="Classe do pool do SQLAlchemy.")
+    tamanho: Optional[int] = Field(None, description="Conexões fixas do pool (pool_size).")
+    em_uso: Optional[int] = Field(None, description="Conexões emprestadas neste momento.")
+    ociosas: Optional[int] = Field(None, description="Conexões abertas aguardando uso.")
+    overflow_atual: Optional[int] = Field(None, description="Conexões além do pool_size abertas agora (negativo = pool ainda não cheio).")
+    checkouts: int = Field(..., description="Total de conexões emprestadas desde o início do worker.")
+    checkins: int = Field(..., description="Total de conexões devolvidas.")
+    conexoes_abertas: int = Field(..., description="Conexões físicas abertas com o banco.")
+    invalidacoes: int = Field(..., description="Conexões descartadas por erro ou pre-ping.")
+    timeouts: int = Field(..., description="Checkouts que estouraram DB_POOL_TIMEOUT.")
+    checkouts_com_espera: int = Field(..., description="Checkouts que esperaram ao menos 1 ms por uma conexão.")
+    espera_media_ms: float = Field(..., description="Tempo médio de espera por conexão.")
+    espera_max_ms: float = Field(..., description="Maior espera por conexão observada.")
+    pico_em_uso: int = Field(..., description="Maior número de conexões emprestadas ao mesmo tempo.")
+    pico_overflow: int = Field(..., description="Maior overflow observado.")
+
+class PoolMetricsResponse(BaseModel):
+    pid: int = Field(..., description="PID do worker que respondeu (cada worker do gunicorn tem seu próprio pool).")
+    configuracao: dict = Field(..., description="Parâmetros efetivos do pool.")
+    pools: List[PoolStatus] = Field(..., description="Métricas de cada pool do worker.")
+
+class ResponseCacheStatus(BaseModel):
+    pid: int = Field(..., description="PID do worker que respondeu (o cache é por processo).")
+    itens: int = Field(..., description="Respostas em cache no momento.")
+    max_itens: int = Field(..., description="Limite de respostas (RESPONSE_CACHE_MAX_ITEMS).")
+    ttl_segundos: float = Field(..., description="Validade de cada resposta (RESPONSE_CACHE_TTL_SECONDS).")
+    hits: int = Field(..., description="Requisições atendidas pelo cache.")
+    misses: int = Field(..., description="Requisições que foram ao banco.")
+    taxa_acerto: float = Field(..., description="hits / (hits + misses).")
+    expirados: int = Field(..., description="Entradas descartadas por TTL.")
+    descartados: int = Field(..., description="Entradas descartadas por LRU ao atingir o limite.")
+    invalidacoes: int = Field(..., description="Entradas removidas por gravação da fatia correspondente.")
+
+class ProfileInfo(BaseModel):
+    nome: str = Field(..., description="Arquivo speedscope (abra em https://www.speedscope.app).")
+    tamanho_bytes: int = Field(..., description="Tamanho do arquivo.")
+    gravado_em: datetime = Field(..., description="Momento em que o perfil foi gravado (UTC).")
+
+class ProfileListResponse(BaseModel):
+    habilitado: bool = Field(..., description="Amostragem automática ligada (PROFILER_ENABLED); o cabeçalho X-Profile funciona mesmo desligada.")
+    disponivel: bool = Field(..., description="pyinstrument instalado.")
+    taxa_amostragem: float = Field(..., description="Fração das requisições perfiladas (PROFILER_SAMPLE_RATE).")
+    caminhos: List[str] = Field(..., description="Prefixos de path perfilados (PROFILER_PATHS); vazio = todos.")
+    max_arquivos: int = Field(..., description="Perfis mantidos no diretório (PROFILER_MAX_FILES).")
+    perfis: List[ProfileInfo] = Field(..., description="Perfis gravados, do mais recente para o mais antigo.")
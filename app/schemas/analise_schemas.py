@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
+
+class GrupoAnalise(BaseModel):
+    chaves: Dict[str, Union[int, str, None]] = Field(..., description="Valor de cada coluna de agrupamento (ex: {'pais': 'Alemanha', 'ano': 2020}).")
+    valor: Optional[float] = Field(None, description="Resultado da agregação da medida no grupo; nulo se nenhuma linha do grupo tem valor.")
+    linhas: int = Field(..., description="Quantidade de linhas do grupo.")
+
+class AnaliseResponse(BaseModel):
+    categoria: str = Field(..., description="Categoria consultada.")
+    tipo: Optional[str] = Field(None, description="Subtipo filtrado (ex: 'espumantes'); ausente quando todos os tipos entram.")
+    ano_inicio: Optional[int] = Field(None, description="Primeiro ano considerado.")
+    ano_fim: Optional[int] = Field(None, description="Último ano considerado.")
+    agrupar_por: List[str] = Field(..., description="Colunas de agrupamento, na ordem pedida.")
+    agregacao: str = Field(..., description="Função aplicada: soma, media, minimo ou maximo.")
+    medida: str = Field(..., description="Coluna agregada (ex: 'valor_usd').")
+    grupos: List[GrupoAnalise] = Field(..., description="Grupos ordenados pelo valor (top-N quando `limite` é informado).")
@@ -18,4 +18,10 @@ class ComercializacaoScrapedItem(ComercializacaoItemBase):
 class ComercializacaoResponse(BaseModel):
     ano_referencia: int = Field(..., description="Ano ao qual os dados de comercialização se referem.")
     dados: List[ComercializacaoItemData] = Field(..., description="Lista dos itens de comercialização para o ano especificado.")
-    total_geral_litros: Optional[float] = Field(None, description="Soma total de litros de todos os itens, se disponível e calculado.")
\ No newline at end of file
+    total_geral_litros: Optional[float] = Field(None, description="Soma total de litros de todos os itens, se disponível e calculado.")
+
+class ComercializacaoSerieResponse(BaseModel):
+    ano_inicio: int = Field(..., description="Primeiro ano da série.")
+    ano_fim: int = Field(..., description="Último ano da série.")
+    anos: List[ComercializacaoResponse] = Field(..., description="Um item por ano do intervalo, com os dados e o total daquele ano.")
+    total_geral_litros: Optional[float] = Field(None, description="Soma de litros de todos os anos da série.")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 class ExportacaoItemBase(BaseModel):
     pais: str = Field(..., description="País de destino da exportação.")
@@ -25,4 +25,22 @@ class ExportacaoResponse(BaseModel):
     tipo_exportacao: str = Field(..., description="Tipo de produto exportado para os dados listados.")
     dados: List[ExportacaoItemData] = Field(..., description="Lista dos itens de exportação para o ano e tipo especificados.")
     total_geral_kg: Optional[float] = Field(None, description="Soma total de KG de todos os itens, se disponível e calculado.")
-    total_geral_usd: Optional[float] = Field(None, description="Soma total em US$ de todos os itens, se disponível e calculado.")
\ No newline at end of file
+    total_geral_usd: Optional[float] = Field(None, description="Soma total em US$ de todos os itens, se disponível e calculado.")
+
+class ExportacaoSerieResponse(BaseModel):
+    tipo_exportacao: str = Field(..., description="Tipo dos dados da série.")
+    ano_inicio: int = Field(..., description="Primeiro ano da série.")
+    ano_fim: int = Field(..., description="Último ano da série.")
+    anos: List[ExportacaoResponse] = Field(..., description="Um item por ano do intervalo, com os dados e totais daquele ano.")
+    total_geral_kg: Optional[float] = Field(None, description="Soma de KG de todos os anos da série.")
+    total_geral_usd: Optional[float] = Field(None, description="Soma em US$ de todos os anos da série.")
+
+CAMPOS_EXPORTACAO = ("pais", "quantidade_kg", "valor_usd", "ano", "tipo_exportacao")
+
+class ExportacaoPaginaResponse(BaseModel):
+    ano_referencia: int = Field(..., description="Ano dos dados.")
+    tipo_exportacao: str = Field(..., description="Tipo de produto importado.")
+    campos: List[str] = Field(..., description="Campos presentes em cada item (parâmetro `fields`).")
+    dados: List[Dict[str, Union[str, float, int, None]]] = Field(..., description="Itens da página, ordenados por país, só com os campos pedidos.")
+    limite: int = Field(..., description="Tamanho máximo da página.")
+    proximo_cursor: Optional[str] = Field(None, description="Passe em `cursor` para buscar a próxima página; ausente na última.")
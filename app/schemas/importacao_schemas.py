@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 class ImportacaoItemBase(BaseModel):
     pais: str = Field(..., description="País de origem da importação.")
@@ -25,4 +25,22 @@ class ImportacaoResponse(BaseModel):
     tipo_importacao: str = Field(..., description="Tipo de produto importado para os dados listados.")
     dados: List[ImportacaoItemData] = Field(..., description="Lista dos itens de importação para o ano e tipo especificados.")
     total_geral_kg: Optional[float] = Field(None, description="Soma total de KG de todos os itens, se disponível e calculado.")
-    total_geral_usd: Optional[float] = Field(None, description="Soma total em US$ de todos os itens, se disponível e calculado.")
\ No newline at end of file
+    total_geral_usd: Optional[float] = Field(None, description="Soma total em US$ de todos os itens, se disponível e calculado.")
+
+class ImportacaoSerieResponse(BaseModel):
+    tipo_importacao: str = Field(..., description="Tipo dos dados da série.")
+    ano_inicio: int = Field(..., description="Primeiro ano da série.")
+    ano_fim: int = Field(..., description="Último ano da série.")
+    anos: List[ImportacaoResponse] = Field(..., description="Um item por ano do intervalo, com os dados e totais daquele ano.")
+    total_geral_kg: Optional[float] = Field(None, description="Soma de KG de todos os anos da série.")
+    total_geral_usd: Optional[float] = Field(None, description="Soma em US$ de todos os anos da série.")
+
+CAMPOS_IMPORTACAO = ("pais", "quantidade_kg", "valor_usd", "ano", "tipo_importacao")
+
+class ImportacaoPaginaResponse(BaseModel):
+    ano_referencia: int = Field(..., description="Ano dos dados.")
+    tipo_importacao: str = Field(..., description="Tipo de produto importado.")
+    campos: List[str] = Field(..., description="Campos presentes em cada item (parâmetro `fields`).")
+    dados: List[Dict[str, Union[str, float, int, None]]] = Field(..., description="Itens da página, ordenados por país, só com os campos pedidos.")
+    limite: int = Field(..., description="Tamanho máximo da página.")
+    proximo_cursor: Optional[str] = Field(None, description="Passe em `cursor` para buscar a próxima página; ausente na última.")
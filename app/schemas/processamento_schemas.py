@@ -22,4 +22,11 @@ class ProcessamentoResponse(BaseModel):
     ano_referencia: int = Field(..., description="Ano ao qual os dados de processamento se referem.")
     tipo_processamento: str = Field(..., description="Tipo de uva processada para os dados listados.")
     dados: List[ProcessamentoItemData] = Field(..., description="Lista dos itens de processamento para o ano e tipo especificados.")
-    total_geral_kg: Optional[float] = Field(None, description="Soma total de KG de todos os itens, se disponível e calculado.")
\ No newline at end of file
+    total_geral_kg: Optional[float] = Field(None, description="Soma total de KG de todos os itens, se disponível e calculado.")
+
+class ProcessamentoSerieResponse(BaseModel):
+    tipo_processamento: str = Field(..., description="Tipo dos dados da série.")
+    ano_inicio: int = Field(..., description="Primeiro ano da série.")
+    ano_fim: int = Field(..., description="Último ano da série.")
+    anos: List[ProcessamentoResponse] = Field(..., description="Um item por ano do intervalo, com os dados e totais daquele ano.")
+    total_geral_kg: Optional[float] = Field(None, description="Soma de KG de todos os anos da série.")
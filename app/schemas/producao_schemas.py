@@ -19,3 +19,9 @@ class ProducaoResponse(BaseModel):
     ano_referencia: int = Field(..., description="Ano ao qual os dados de produção se referem.")
     dados: List[ProducaoItemData] = Field(..., description="Lista dos itens de produção para o ano especificado.")
     total_geral_litros: Optional[float] = Field(None, description="Soma total de litros de todos os itens, se disponível e calculado.")
+
+class ProducaoSerieResponse(BaseModel):
+    ano_inicio: int = Field(..., description="Primeiro ano da série.")
+    ano_fim: int = Field(..., description="Último ano da série.")
+    anos: List[ProducaoResponse] = Field(..., description="Um item por ano do intervalo, com os dados e o total daquele ano.")
+    total_geral_litros: Optional[float] = Field(None, description="Soma de litros de todos os anos da série.")
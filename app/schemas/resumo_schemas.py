@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ResumoResponse(BaseModel):
+    categoria: str = Field(..., description="Categoria dos dados (producao, comercializacao, processamento, importacao, exportacao).")
+    tipo: Optional[str] = Field(None, description="Subtipo da categoria (ex: 'vinhos_mesa'); ausente para Produção e Comercialização.")
+    ano_referencia: int = Field(..., description="Ano ao qual o resumo se refere.")
+    linhas: int = Field(..., description="Quantidade de linhas da fatia.")
+    linhas_sem_valor: int = Field(..., description="Linhas com quantidade ou valor não informado.")
+    total_geral_litros: Optional[float] = Field(None, description="Soma em litros (Produção e Comercialização).")
+    total_geral_kg: Optional[float] = Field(None, description="Soma em KG (Processamento, Importação e Exportação).")
+    total_geral_usd: Optional[float] = Field(None, description="Soma em US$ (Importação e Exportação).")
+
+    class Config:
+        from_attributes = True
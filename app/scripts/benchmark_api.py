@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.append(PROJECT_ROOT_DIR)
+
+import httpx
+
+# Os módulos de app.* leem DATABASE_URL e afins no import: só são importados depois de `configurar_ambiente`.
+
+API = "/api/v1"
+
+USUARIO = "benchmark"
+
+SENHA = "benchmark-senha"
+
+# Tamanho aproximado das tabelas reais do Vitibrasil por ano (itens/subitens, cultivares, países).
+PRODUTOS, SUBPRODUTOS = 8, 7
+CULTIVARES = 45
+PAISES = 130
+
+
+@dataclass
+class Endpoint:
+    nome: str
+    metodo: str
+    url: Callable[[random.Random], str]
+    form: Optional[Dict[str, str]] = None
+    autenticado: bool = True
+
+
+@dataclass
+class Resultado:
+    latencias_ms: List[float] = field(default_factory=list)
+    erros: int = 0
+    status: Dict[int, int] = field(default_factory=dict)
+    duracao_s: float = 0.0
+
+    def resumo(self) -> Dict[str, Any]:
+        lat = sorted(self.latencias_ms)
+        if len(lat) >= 2:
+            percentis = statistics.quantiles(lat, n=100, method="inclusive")
+            p50, p95, p99 = percentis[49], percentis[94], percentis[98]
+        else:
+            p50 = p95 = p99 = lat[0] if lat else 0.0
+        return {
+            "requisicoes": len(lat),
+            "erros": self.erros,
+            "status": {str(codigo): total for codigo, total in sorted(self.status.items())},
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "p99_ms": round(p99, 3),
+            "media_ms": round(statistics.fmean(lat), 3) if lat else 0.0,
+            "req_por_s": round(len(lat) / self.duracao_s, 2) if self.duracao_s else 0.0,
+        }
+
+
+def configurar_ambiente(args: argparse.Namespace) -> None:
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("PROFILER_ENABLED", "False")
+    if args.sem_cache:
+        os.environ["RESPONSE_CACHE_MAX_ITEMS"] = "0"
+
+
+# --- Dataset sintético ---
+
+def _quantidade(rng: random.Random, escala: int) -> str:
+    # ~3% de células "-" (NULL no banco), como nas páginas reais.
+    return "-" if rng.random() < 0.03 else str(rng.randint(0, escala))
+
+
+def _linhas(categoria: str, rng: random.Random) -> List[Dict[str, Optional[str]]]:
+    if categoria in ("producao", "comercializacao"):
+        linhas = []
+        for p in range(PRODUTOS):
+            linhas.append({"produto": f"PRODUTO {p:02d}", "sub_produto": None, "quantidade": _quantidade(rng, 10 ** 8)})
+            linhas.extend(
+                {"produto": f"PRODUTO {p:02d}", "sub_produto": f"Subproduto {p:02d}.{s:02d}", "quantidade": _quantidade(rng, 10 ** 7)}
+                for s in range(SUBPRODUTOS)
+            )
+        return linhas
+    if categoria == "processamento":
+        return [{"cultivar": f"Cultivar {c:03d}", "quantidade": _quantidade(rng, 10 ** 7)} for c in range(CULTIVARES)]
+    return [
+        {"pais": f"País {p:03d}", "quantidade": _quantidade(rng, 10 ** 7), "valor": _quantidade(rng, 10 ** 8)}
+        for p in range(PAISES)
+    ]
+
+
+def seed(ano_inicio: int, ano_fim: int, semente: int) -> int:
+    """Recria as tabelas e grava o dataset sintético pelos mesmos cruds da carga real (resumos e versões inclusos)."""
+    from app.db.base import Base, create_tables
+    from app.db.session import SessionLocal, engine
+    from app.services.embrapa_scraper import CATEGORIAS, CATEGORIA_TIPOS
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables(bind=engine)
+    rng = random.Random(semente)
+    linhas = 0
+    with SessionLocal() as db:
+        for ano in range(ano_inicio, ano_fim + 1):
+            for categoria, tipos in CATEGORIA_TIPOS.items():
+                cfg = CATEGORIAS[categoria]
+                for tipo in tipos:
+                    itens = [cfg.build_item(linha, ano, tipo) for linha in _linhas(categoria, rng)]
+                    cfg.save(db, ano, tipo, itens, False)
+                    linhas += len(itens)
+            db.commit()
+    return linhas
+
+
+# --- Carga ---
+
+def endpoints(ano_inicio: int, ano_fim: int) -> List[Endpoint]:
+    ano = lambda rng: rng.randint(ano_inicio, ano_fim)
+
+    def serie(rng: random.Random) -> str:
+        inicio = rng.randint(ano_inicio, max(ano_inicio, ano_fim - 9))
+        return f"ano_inicio={inicio}&ano_fim={min(ano_fim, inicio + 9)}"
+
+    return [
+        Endpoint("POST /auth/token", "POST", lambda rng: f"{API}/auth/token", form={"username": USUARIO, "password": SENHA}, autenticado=False),
+        Endpoint("GET /producao/", "GET", lambda rng: f"{API}/producao/?ano={ano(rng)}"),
+        Endpoint("GET /comercializacao/", "GET", lambda rng: f"{API}/comercializacao/?ano={ano(rng)}"),
+        Endpoint("GET /processamento/{tipo}/", "GET", lambda rng: f"{API}/processamento/{rng.choice(['viniferas', 'americanas-hibridas', 'uvas-mesa', 'sem-classificacao'])}/?ano={ano(rng)}"),
+        Endpoint("GET /importacao/{tipo}/", "GET", lambda rng: f"{API}/importacao/{rng.choice(['vinhos-mesa', 'espumantes', 'uvas-frescas', 'uvas-passas', 'suco-uva'])}/?ano={ano(rng)}"),
+        Endpoint("GET /exportacao/{tipo}/", "GET", lambda rng: f"{API}/exportacao/{rng.choice(['vinhos-mesa', 'espumantes', 'uvas-frescas', 'suco-uva'])}/?ano={ano(rng)}"),
+        Endpoint("GET /producao/serie/", "GET", lambda rng: f"{API}/producao/serie/?{serie(rng)}"),
+        Endpoint("GET /importacao/{tipo}/serie/", "GET", lambda rng: f"{API}/importacao/vinhos-mesa/serie/?{serie(rng)}"),
+        Endpoint("GET /exportacao/{tipo}/pagina/", "GET", lambda rng: f"{API}/exportacao/vinhos-mesa/pagina/?ano={ano(rng)}&limite=50&fields=valor_usd"),
+        Endpoint("GET /resumo/{categoria}/", "GET", lambda rng: f"{API}/resumo/importacao/?ano={ano(rng)}&tipo=vinhos_mesa"),
+        Endpoint("GET /analise/{categoria}/", "GET", lambda rng: f"{API}/analise/exportacao/?agrupar_por=pais&medida=valor_usd&{serie(rng)}&limite=10"),
+        Endpoint("GET /export/{categoria}/", "GET", lambda rng: f"{API}/export/processamento/?formato=ndjson&ano_inicio={ano(rng)}&ano_fim={ano_fim}"),
+        Endpoint("GET /health", "GET", lambda rng: "/health", autenticado=False),
+    ]
+
+
+async def _requisicao(client: httpx.AsyncClient, endpoint: Endpoint, rng: random.Random, headers: Dict[str, str]) -> Tuple[float, int]:
+    inicio = time.perf_counter()
+    if endpoint.metodo == "POST":
+        resposta = await client.post(endpoint.url(rng), data=endpoint.form)
+    else:
+        resposta = await client.get(endpoint.url(rng), headers=headers if endpoint.autenticado else None)
+    await resposta.aread()
+    return (time.perf_counter() - inicio) * 1000, resposta.status_code
+
+
+async def medir(client: httpx.AsyncClient, endpoint: Endpoint, tokens: List[str], requisicoes: int, aquecimento: int, semente: int) -> Resultado:
+    """`requisicoes` chamadas divididas entre len(tokens) clientes concorrentes, cada um com seu token; antes, `aquecimento` chamadas não medidas."""
+    resultado = Resultado()
+
+    async def cliente(indice: int, total: int, registrar: bool) -> None:
+        rng = random.Random(semente * 1000 + indice + (0 if registrar else 500))
+        headers = {"Authorization": f"Bearer {tokens[indice]}"}
+        for _ in range(total):
+            latencia, codigo = await _requisicao(client, endpoint, rng, headers)
+            if not registrar:
+                continue
+            resultado.latencias_ms.append(latencia)
+            resultado.status[codigo] = resultado.status.get(codigo, 0) + 1
+            if codigo >= 400:
+                resultado.erros += 1
+
+    async def fase(total: int, registrar: bool) -> None:
+        clientes = len(tokens)
+        await asyncio.gather(*(cliente(i, total // clientes + (1 if i < total % clientes else 0), registrar) for i in range(clientes)))
+
+    await fase(aquecimento, registrar=False)
+    inicio = time.perf_counter()
+    await fase(requisicoes, registrar=True)
+    resultado.duracao_s = time.perf_counter() - inicio
+    return resultado
+
+
+async def executar(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60.0)
+        contexto = None
+    else:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60.0)
+        contexto = app.router.lifespan_context(app)
+        await contexto.__aenter__()
+
+    try:
+        await client.post(f"{API}/auth/register", data={"username": USUARIO, "password": SENHA})  # 400 se já existe
+        tokens = []
+        for _ in range(args.clientes):
+            resposta = await client.post(f"{API}/auth/token", data={"username": USUARIO, "password": SENHA})
+            resposta.raise_for_status()
+            tokens.append(resposta.json()["access_token"])
+
+        relatorio: Dict[str, Dict[str, Any]] = {}
+        for endpoint in endpoints(args.ano_inicio, args.ano_fim):
+            if args.filtro and args.filtro not in endpoint.nome:
+                continue
+            resultado = await medir(client, endpoint, tokens, args.requisicoes, args.aquecimento, args.semente)
+            relatorio[endpoint.nome] = resultado.resumo()
+            linha = relatorio[endpoint.nome]
+            print(
+                f"  {endpoint.nome:<32} p50 {linha['p50_ms']:8.2f} ms  p95 {linha['p95_ms']:8.2f} ms  p99 {linha['p99_ms']:8.2f} ms  "
+                f"{linha['req_por_s']:8.1f} req/s  erros {linha['erros']}"
+            )
+        return relatorio
+    finally:
+        await client.aclose()
+        if contexto is not None:
+            await contexto.__aexit__(None, None, None)
+
+
+# --- Comparação com execução anterior ---
+
+def comparar(atual: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerancia: float) -> List[str]:
+    """Regressões: p95 acima de (1 + tolerancia) x baseline, vazão abaixo de (1 - tolerancia) x baseline ou erros novos."""
+    regressoes = []
+    for nome, linha in atual.items():
+        anterior = baseline.get(nome)
+        if anterior is None:
+            continue
+        if anterior["p95_ms"] and linha["p95_ms"] > anterior["p95_ms"] * (1 + tolerancia):
+            regressoes.append(f"{nome}: p95 {anterior['p95_ms']:.2f} -> {linha['p95_ms']:.2f} ms")
+        if anterior["req_por_s"] and linha["req_por_s"] < anterior["req_por_s"] * (1 - tolerancia):
+            regressoes.append(f"{nome}: vazão {anterior['req_por_s']:.1f} -> {linha['req_por_s']:.1f} req/s")
+        if linha["erros"] > anterior["erros"]:
+            regressoes.append(f"{nome}: erros {anterior['erros']} -> {linha['erros']}")
+    return regressoes
+
+
+def _commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de carga dos endpoints da API contra um banco com dataset sintético.")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark_api.db", help="Banco do benchmark (SQLite ou um PostgreSQL local dedicado: as tabelas são recriadas no seed).")
+    parser.add_argument("--sem-seed", action="store_true", help="Reaproveita o banco já populado por uma execução anterior.")
+    parser.add_argument("--url", default=None, help="Mede um servidor já rodando (ex.: http://127.0.0.1:8000) em vez da app em processo; ele deve usar o mesmo banco.")
+    parser.add_argument("--ano-inicio", type=int, default=1970)
+    parser.add_argument("--ano-fim", type=int, default=2023)
+    parser.add_argument("--clientes", type=int, default=16, help="Clientes concorrentes, cada um com seu token.")
+    parser.add_argument("--requisicoes", type=int, default=300, help="Requisições medidas por endpoint.")
+    parser.add_argument("--aquecimento", type=int, default=20, help="Requisições descartadas por endpoint antes de medir.")
+    parser.add_argument("--filtro", default=None, help="Só os endpoints cujo nome contém este texto.")
+    parser.add_argument("--sem-cache", action="store_true", help="Desliga o cache de respostas (RESPONSE_CACHE_MAX_ITEMS=0) na app em processo.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default=None, help="Arquivo JSON com o resultado (padrão: benchmark_api_<data>.json).")
+    parser.add_argument("--baseline", default=None, help="JSON de uma execução anterior para comparar.")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Variação aceita em relação ao baseline antes de acusar regressão.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    configurar_ambiente(args)
+
+    if not args.sem_seed:
+        inicio = time.perf_counter()
+        linhas = seed(args.ano_inicio, args.ano_fim, args.semente)
+        print(f"BENCHMARK_API: Seed de {linhas} linhas ({args.ano_inicio}-{args.ano_fim}) em {time.perf_counter() - inicio:.1f}s.")
+
+    print(f"BENCHMARK_API: {args.clientes} clientes, {args.requisicoes} requisições por endpoint, alvo {args.url or 'app em processo'}.")
+    relatorio = asyncio.run(executar(args))
+
+    resultado = {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit_atual(),
+            "python": platform.python_version(),
+            "banco": args.database_url.split(":", 1)[0],
+            "alvo": args.url or "processo",
+            "clientes": args.clientes,
+            "requisicoes": args.requisicoes,
+            "anos": [args.ano_inicio, args.ano_fim],
+            "cache_respostas": not args.sem_cache,
+        },
+        "endpoints": relatorio,
+    }
+    saida = args.saida or f"benchmark_api_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"BENCHMARK_API: Resultado salvo em {saida}.")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            regressoes = comparar(relatorio, json.load(arquivo)["endpoints"], args.tolerancia)
+        for regressao in regressoes:
+            print(f"BENCHMARK_API REGRESSÃO: {regressao}")
+        if regressoes:
+            return 1
+        print(f"BENCHMARK_API: Nenhuma regressão em relação a {args.baseline} (tolerância {args.tolerancia:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.append(PROJECT_ROOT_DIR)
+
+from bs4 import BeautifulSoup
+
+from app.db import base  # noqa: F401  (registra os modelos antes do scraper importar os cruds)
+from app.services.embrapa_scraper import CATEGORIAS
+from app.services.html_cache import HtmlCache
+from app.services.table_parser import BACKENDS, TableSpec, parse_table
+
+SPECS_POR_OPCAO: Dict[str, TableSpec] = {cfg.opcao: cfg.spec for cfg in CATEGORIAS.values()}
+
+
+def legacy_parse(content: bytes, spec: TableSpec) -> List[Dict[str, Optional[str]]]:
+    """Caminho anterior: árvore BeautifulSoup da página inteira + laço manual sobre as linhas de tb_dados."""
+    soup = BeautifulSoup(content, 'html.parser')
+    data_table = soup.find('table', class_='tb_dados')
+    if not data_table: return []
+    table_body = data_table.find('tbody')
+    if not table_body: return []
+    linhas: List[Dict[str, Optional[str]]] = []
+    current_main_product: Optional[str] = None
+    for row in table_body.find_all('tr'):
+        cols = row.find_all('td')
+        if len(cols) != len(spec.colunas): continue
+        textos = [col.get_text(separator=" ", strip=True) for col in cols]
+        linha: Dict[str, Optional[str]] = dict(zip(spec.colunas, textos))
+        for coluna in spec.colunas_numericas: linha[coluna] = linha[coluna].replace('.', '') or "0"
+        if spec.hierarquia:
+            texto = linha.pop(spec.colunas[0])
+            if 'tb_subitem' in cols[0].get('class', []):
+                if not current_main_product: continue
+                linha[spec.campo_item], linha[spec.campo_subitem] = current_main_product, texto
+            else:
+                current_main_product = texto
+                linha[spec.campo_item], linha[spec.campo_subitem] = texto, None
+        elif not linha[spec.colunas[0]]:
+            continue
+        linhas.append(linha)
+    return linhas
+
+
+def synthetic_page(linhas: int = 130, links_menu: int = 400) -> bytes:
+    """Página no formato do Vitibrasil: menu extenso + tabela tb_dados de países."""
+    menu = "".join(f'<li><a href="index.php?opcao=opt_{i % 7:02d}&amp;ano={1970 + i % 54}" class="btn_opt">Item {i}</a></li>' for i in range(links_menu))
+    corpo = "".join(
+        f'<tr><td>País {i}</td><td>{i * 1234:,}</td><td>{i * 98765:,}</td></tr>'.replace(",", ".")
+        for i in range(linhas)
+    )
+    html = (
+        '<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8"><title>Vitibrasil</title></head>'
+        f'<body><div id="menu"><ul>{menu}</ul></div><div class="content_center">'
+        '<table class="tb_base tb_dados"><thead><tr><th>Países</th><th>Quantidade (Kg)</th><th>Valor (US$)</th></tr></thead>'
+        f'<tbody>{corpo}</tbody><tfoot class="tb_total"><tr><td>Total</td><td>1</td><td>2</td></tr></tfoot></table>'
+        f'</div><div id="rodape">{menu}</div></body></html>'
+    )
+    return html.encode("utf-8")
+
+
+def load_cached_pages(cache_dir: str, limite: int) -> List[Tuple[bytes, TableSpec]]:
+    cache = HtmlCache(cache_dir)
+    refs_dir = os.path.join(cache_dir, "refs")
+    paginas: List[Tuple[bytes, TableSpec]] = []
+    for nome in sorted(os.listdir(refs_dir)) if os.path.isdir(refs_dir) else []:
+        with open(os.path.join(refs_dir, nome), encoding="utf-8") as f:
+            params = json.loads(f.readline())["params"]
+        content = cache.carregar(params)
+        if content is not None and params.get("opcao") in SPECS_POR_OPCAO:
+            paginas.append((content, SPECS_POR_OPCAO[params["opcao"]]))
+        if len(paginas) >= limite:
+            break
+    return paginas
+
+
+def _medir(funcao: Callable[[], object], repeticoes: int) -> List[float]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compara o tempo de parsing por página: caminho anterior x table_parser.")
+    parser.add_argument("--cache-dir", default=None, help="Usa páginas reais do cache do scraper em vez da página sintética.")
+    parser.add_argument("--paginas", type=int, default=50, help="Máximo de páginas do cache a usar.")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    paginas = load_cached_pages(args.cache_dir, args.paginas) if args.cache_dir else [(synthetic_page(), SPECS_POR_OPCAO["opt_05"])]
+    if not paginas:
+        parser.error(f"Nenhuma página encontrada em {args.cache_dir}.")
+
+    candidatos: Dict[str, Callable[[bytes, TableSpec], object]] = {"legado (bs4, página inteira)": legacy_parse}
+    for backend in BACKENDS:
+        candidatos[f"table_parser ({backend})"] = lambda content, sp, b=backend: parse_table(content, sp, backend=b)
+
+    print(f"BENCHMARK_PARSER: {len(paginas)} página(s), {args.repeticoes} repetições, {sum(len(p) for p, _ in paginas) / len(paginas) / 1024:.1f} KiB/página em média.")
+    referencia: Optional[float] = None
+    for nome, funcao in candidatos.items():
+        tempos: List[float] = []
+        for content, sp in paginas:
+            esperado = legacy_parse(content, sp)
+            if funcao(content, sp) != esperado:
+                print(f"BENCHMARK_PARSER AVISO: {nome} divergiu do caminho legado.")
+            tempos.extend(_medir(lambda: funcao(content, sp), args.repeticoes))
+        mediana = statistics.median(tempos)
+        referencia = referencia or mediana
+        print(f"  {nome:<32} mediana {mediana:7.3f} ms/página  p95 {sorted(tempos)[int(len(tempos) * 0.95) - 1]:7.3f} ms  ({referencia / mediana:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
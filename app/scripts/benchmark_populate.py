@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.append(PROJECT_ROOT_DIR)
+
+import httpx
+
+# EMBRAPA_BASE_URL e DATABASE_URL são lidos no import de app.*: os módulos só são importados depois de `configurar_ambiente`.
+
+
+def configurar_ambiente(args: argparse.Namespace, base_url: str) -> None:
+    os.environ["EMBRAPA_BASE_URL"] = base_url
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def iniciar_servidor(args: argparse.Namespace) -> subprocess.Popen:
+    """Sobe o fake_embrapa_server num processo separado (para não disputar o GIL com o scraper) e espera ficar pronto."""
+    comando = [
+        sys.executable, "-m", "app.scripts.fake_embrapa_server", "--porta", str(args.porta),
+        "--latencia-ms", str(args.latencia_ms), "--jitter-ms", str(args.jitter_ms),
+        "--taxa-erro", str(args.taxa_erro), "--rps", str(args.servidor_rps),
+    ]
+    if args.cache_dir:
+        comando += ["--cache-dir", args.cache_dir]
+    processo = subprocess.Popen(comando, cwd=PROJECT_ROOT_DIR)
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"fake_embrapa_server saiu com código {processo.returncode}.")
+        try:
+            httpx.get(f"http://127.0.0.1:{args.porta}/_stats", timeout=1.0).raise_for_status()
+            return processo
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("fake_embrapa_server não respondeu em 30s.")
+
+
+def _stats_servidor(base_url: str) -> Dict[str, Any]:
+    try:
+        return httpx.get(f"{base_url}/_stats", timeout=5.0).json()
+    except httpx.HTTPError:
+        return {}
+
+
+async def rodada(args: argparse.Namespace, concorrencia: int, base_url: str) -> Dict[str, Any]:
+    """Uma população completa (banco recriado, --forcar) com a concorrência dada."""
+    from app.db.base import Base, create_tables
+    from app.db.session import SessionLocal, engine
+    from app.scripts.populate_db import build_jobs, run_scheduler
+
+    Base.metadata.drop_all(bind=engine)
+    create_tables(bind=engine)
+    jobs = build_jobs(args.ano_inicio, args.ano_fim, args.categorias)
+    antes = _stats_servidor(base_url)
+    with SessionLocal() as db:
+        stats = await run_scheduler(
+            db, jobs, concurrency=concorrencia, requests_per_second=args.rps,
+            incremental=False, anos_por_transacao=args.anos_por_transacao
+        )
+    depois = _stats_servidor(base_url)
+    duracao = stats.fim - stats.inicio
+    return {
+        "concorrencia": concorrencia,
+        "paginas": stats.paginas,
+        "vazias": stats.paginas_vazias,
+        "falhas": stats.falhas,
+        "linhas": stats.linhas,
+        "duracao_s": round(duracao, 3),
+        "paginas_por_s": round(stats.paginas / duracao, 2) if duracao else 0.0,
+        "linhas_por_s": round(stats.linhas / duracao, 1) if duracao else 0.0,
+        "servidor": {
+            chave: depois.get(chave, 0) - antes.get(chave, 0)
+            for chave in ("requisicoes", "do_cache", "sinteticas", "erros_injetados", "limitadas", "nao_encontradas")
+        },
+    }
+
+
+async def executar(args: argparse.Namespace, base_url: str) -> List[Dict[str, Any]]:
+    from app.core.logging_config import setup_logging
+    from app.db import base  # noqa: F401  (registra os modelos antes do scraper importar os cruds)
+    from app.services import embrapa_scraper
+
+    setup_logging()
+
+    resultados = []
+    try:
+        for concorrencia in args.concorrencia:
+            resultado = await rodada(args, concorrencia, base_url)
+            resultados.append(resultado)
+            print(
+                f"  concorrência {concorrencia:>3}: {resultado['paginas']} páginas ({resultado['vazias']} vazias/erro HTTP, {resultado['falhas']} falhas), "
+                f"{resultado['linhas']} linhas em {resultado['duracao_s']:.2f}s -> "
+                f"{resultado['paginas_por_s']:.1f} páginas/s, {resultado['linhas_por_s']:.0f} linhas/s"
+            )
+    finally:
+        await embrapa_scraper.close_http_client()
+    return resultados
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mede a vazão ponta a ponta do populate_db (páginas/s, linhas/s) contra o fake_embrapa_server.")
+    parser.add_argument("--ano-inicio", type=int, default=2000)
+    parser.add_argument("--ano-fim", type=int, default=2023)
+    parser.add_argument(
+        "--categorias",
+        type=lambda valor: [c.strip() for c in valor.split(",") if c.strip()],
+        default=["producao", "processamento", "comercializacao", "importacao", "exportacao"],
+    )
+    parser.add_argument(
+        "--concorrencia",
+        type=lambda valor: [int(c) for c in valor.split(",") if c.strip()],
+        default=[1, 4, 8],
+        help="Uma rodada por valor (separados por vírgula).",
+    )
+    parser.add_argument("--rps", type=float, default=0.0, help="Limite de requisições/s do populate (0 = sem limite).")
+    parser.add_argument("--anos-por-transacao", type=int, default=1)
+    parser.add_argument("--database-url", default="sqlite:///./benchmark_populate.db", help="Banco dedicado: as tabelas são recriadas a cada rodada.")
+    parser.add_argument("--url", default=None, help="Usa um fake_embrapa_server (ou outro stand-in) já rodando em vez de subir um.")
+    parser.add_argument("--porta", type=int, default=8089)
+    parser.add_argument("--cache-dir", default=None, help="Páginas gravadas (populate_db --cache-dir) servidas pelo fake server.")
+    parser.add_argument("--latencia-ms", type=float, default=50.0, help="Latência simulada por página no fake server.")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--servidor-rps", type=float, default=0.0, help="Limite do fake server; o excedente recebe 429.")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON com o resultado.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    base_url = (args.url or f"http://127.0.0.1:{args.porta}").rstrip("/")
+    configurar_ambiente(args, base_url)
+
+    processo = iniciar_servidor(args) if args.url is None else None
+    try:
+        print(
+            f"BENCHMARK_POPULATE: {args.ano_inicio}-{args.ano_fim}, categorias {', '.join(args.categorias)}, "
+            f"servidor {base_url} (latência {args.latencia_ms}±{args.jitter_ms} ms, erro {args.taxa_erro:.0%})."
+        )
+        resultados = asyncio.run(executar(args, base_url))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait(timeout=10)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "meta": {
+                    "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "anos": [args.ano_inicio, args.ano_fim],
+                    "categorias": args.categorias,
+                    "banco": args.database_url.split(":", 1)[0],
+                    "latencia_ms": args.latencia_ms,
+                    "jitter_ms": args.jitter_ms,
+                    "taxa_erro": args.taxa_erro,
+                    "servidor_rps": args.servidor_rps,
+                    "rps": args.rps,
+                },
+                "rodadas": resultados,
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"BENCHMARK_POPULATE: Resultado salvo em {args.saida}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.append(PROJECT_ROOT_DIR)
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.db import base  # noqa: F401  (registra os modelos)
+from app.api.v1.routers.importacao_router import _build_importacao_response
+from app.crud.crud_importacao import COLUNAS_LEITURA
+from app.models.importacao_model import Importacao as ImportacaoModel
+from app.schemas.importacao_schemas import ImportacaoItemData, ImportacaoResponse
+from app.utils import fast_json
+
+ANO = 2020
+
+TIPO = "vinhos_mesa"
+
+_adapter = TypeAdapter(ImportacaoResponse)
+
+
+def seed(db: Session, paises: int) -> None:
+    ImportacaoModel.__table__.create(db.get_bind())
+    db.execute(insert(ImportacaoModel), [
+        {"ano": ANO, "tipo_importacao": TIPO, "pais": f"País {i:03d}",
+         "quantidade_kg": None if i % 17 == 0 else float(i * 1234), "valor_usd": float(i * 98765)}
+        for i in range(paises)
+    ])
+    db.commit()
+
+
+def legacy_request(db: Session) -> bytes:
+    """Caminho anterior: entidades ORM -> model_validate por item -> response_model validado e serializado pelo FastAPI."""
+    db_items = db.execute(select(ImportacaoModel).where(
+        ImportacaoModel.ano == ANO, ImportacaoModel.tipo_importacao == TIPO
+    )).scalars().all()
+    dados_api = [ImportacaoItemData.model_validate(item) for item in db_items]
+    resposta = ImportacaoResponse(
+        ano_referencia=ANO,
+        tipo_importacao=TIPO,
+        dados=dados_api,
+        total_geral_kg=round(sum(item.quantidade_kg for item in dados_api if item.quantidade_kg is not None), 2),
+        total_geral_usd=round(sum(item.valor_usd for item in dados_api if item.valor_usd is not None), 2)
+    )
+    # O que o FastAPI faz com o retorno quando há response_model: dump, nova validação, serialização e json.dumps.
+    valor = _adapter.validate_python(resposta.model_dump())
+    conteudo = _adapter.dump_python(valor, mode="json")
+    db.expunge_all()
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_request(db: Session) -> bytes:
+    """Caminho atual: tuplas das colunas do schema -> dicts -> bytes JSON (orjson quando instalado)."""
+    linhas = db.execute(select(*COLUNAS_LEITURA).where(
+        ImportacaoModel.ano == ANO, ImportacaoModel.tipo_importacao == TIPO
+    )).mappings().all()
+    return fast_json.dumps(_build_importacao_response(ANO, TIPO, linhas, None))
+
+
+def _medir(funcao: Callable[[], object], repeticoes: int) -> Dict[str, List[float]]:
+    cpu, parede = [], []
+    for _ in range(repeticoes):
+        inicio_cpu, inicio = time.process_time(), time.perf_counter()
+        funcao()
+        cpu.append((time.process_time() - inicio_cpu) * 1000)
+        parede.append((time.perf_counter() - inicio) * 1000)
+    return {"cpu": cpu, "parede": parede}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compara o custo por requisição: model_validate + response_model x linhas + orjson.")
+    parser.add_argument("--paises", type=int, default=130, help="Linhas da fatia (países) na resposta.")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        seed(db, args.paises)
+        if json.loads(legacy_request(db)) != json.loads(fast_request(db)):
+            print("BENCHMARK_SERIALIZACAO AVISO: os dois caminhos produziram JSON diferente.")
+
+        print(
+            f"BENCHMARK_SERIALIZACAO: {args.paises} itens por resposta, {args.repeticoes} repetições, "
+            f"encoder {'orjson' if fast_json.orjson is not None else 'json (orjson não instalado)'}."
+        )
+        referencia: Optional[float] = None
+        for nome, funcao in {"legado (ORM + pydantic)": legacy_request, "rápido (tuplas + orjson)": fast_request}.items():
+            funcao(db)  # aquecimento
+            tempos = _medir(lambda: funcao(db), args.repeticoes)
+            mediana_cpu = statistics.median(tempos["cpu"])
+            referencia = referencia or mediana_cpu
+            print(
+                f"  {nome:<26} CPU mediana {mediana_cpu:7.3f} ms/req  parede mediana {statistics.median(tempos['parede']):7.3f} ms/req  "
+                f"({referencia / mediana_cpu if mediana_cpu else float('inf'):4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
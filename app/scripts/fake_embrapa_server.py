@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+sys.path.append(PROJECT_ROOT_DIR)
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.db import base  # noqa: F401  (registra os modelos antes do scraper importar os cruds)
+from app.services.embrapa_scraper import CATEGORIAS
+from app.services.html_cache import HtmlCache
+from app.utils.rate_limiter import TokenBucket
+
+CATEGORIA_POR_OPCAO: Dict[str, str] = {cfg.opcao: chave for chave, cfg in CATEGORIAS.items()}
+
+CABECALHOS = {
+    "producao": ("Produto", "Quantidade (L.)"),
+    "comercializacao": ("Produto", "Quantidade (L.)"),
+    "processamento": ("Cultivar", "Quantidade (Kg)"),
+    "importacao": ("Países", "Quantidade (Kg)", "Valor (US$)"),
+    "exportacao": ("Países", "Quantidade (Kg)", "Valor (US$)"),
+}
+
+
+@dataclass
+class OpcoesServidor:
+    cache_dir: Optional[str] = None
+    somente_cache: bool = False
+    latencia_ms: float = 0.0
+    jitter_ms: float = 0.0
+    taxa_erro: float = 0.0
+    rps: float = 0.0
+    max_concorrencia: int = 0
+    semente: int = 0
+    links_menu: int = 400
+
+
+@dataclass
+class EstatisticasServidor:
+    requisicoes: int = 0
+    do_cache: int = 0
+    sinteticas: int = 0
+    erros_injetados: int = 0
+    limitadas: int = 0
+    nao_encontradas: int = 0
+    por_opcao: Dict[str, int] = field(default_factory=dict)
+
+
+# --- Páginas sintéticas no formato do Vitibrasil ---
+
+def _numero(rng: random.Random, escala: int) -> str:
+    if rng.random() < 0.03:
+        return "-"
+    return f"{rng.randint(0, escala):,}".replace(",", ".")
+
+
+def _linhas_tabela(categoria: str, rng: random.Random) -> List[str]:
+    if categoria in ("producao", "comercializacao"):
+        linhas = []
+        for p in range(rng.randint(6, 9)):
+            linhas.append(f'<tr><td class="tb_item">PRODUTO {p:02d}</td><td class="tb_item">{_numero(rng, 10 ** 8)}</td></tr>')
+            linhas.extend(
+                f'<tr><td class="tb_subitem">Subproduto {p:02d}.{s:02d}</td><td class="tb_subitem">{_numero(rng, 10 ** 7)}</td></tr>'
+                for s in range(rng.randint(3, 9))
+            )
+        return linhas
+    if categoria == "processamento":
+        return [f"<tr><td>Cultivar {c:03d}</td><td>{_numero(rng, 10 ** 7)}</td></tr>" for c in range(rng.randint(30, 60))]
+    return [
+        f"<tr><td>País {p:03d}</td><td>{_numero(rng, 10 ** 7)}</td><td>{_numero(rng, 10 ** 8)}</td></tr>"
+        for p in range(rng.randint(110, 140))
+    ]
+
+
+def synthetic_page(categoria: str, params: Dict[str, str], semente: int = 0, links_menu: int = 400) -> bytes:
+    """Página determinística por (opcao, subopcao, ano, semente): menu extenso + tabela tb_dados da categoria."""
+    rng = random.Random(f"{params.get('opcao')}|{params.get('subopcao')}|{params.get('ano')}|{semente}")
+    menu = "".join(f'<li><a href="index.php?opcao=opt_{i % 7:02d}&amp;ano={1970 + i % 54}" class="btn_opt">Item {i}</a></li>' for i in range(links_menu))
+    cabecalho = "".join(f"<th>{titulo}</th>" for titulo in CABECALHOS[categoria])
+    rodape = "".join(f"<td>{'Total' if i == 0 else '0'}</td>" for i in range(len(CABECALHOS[categoria])))
+    html = (
+        '<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8"><title>Vitibrasil</title></head>'
+        f'<body><div id="menu"><ul>{menu}</ul></div><div class="content_center">'
+        f'<p class="text_center">{CATEGORIAS[categoria].nome} [{params.get("ano")}]</p>'
+        f'<table class="tb_base tb_dados"><thead><tr>{cabecalho}</tr></thead>'
+        f'<tbody>{"".join(_linhas_tabela(categoria, rng))}</tbody><tfoot class="tb_total"><tr>{rodape}</tr></tfoot></table>'
+        f'</div><div id="rodape">{menu}</div></body></html>'
+    )
+    return html.encode("utf-8")
+
+
+# --- Servidor ---
+
+def create_app(opcoes: OpcoesServidor) -> FastAPI:
+    """
+    Stand-in local de vitibrasil.cnpuv.embrapa.br: responde `index.php?opcao=...&subopcao=...&ano=...` com a página
+    gravada em `cache_dir` (mesmo formato do --cache-dir do populate_db) ou, na falta dela, com uma página sintética.
+    Latência, erros (500/503) e limite de requisições (429) são injetados conforme `opcoes`.
+    """
+    app = FastAPI(title="Embrapa Vitibrasil (simulado)", docs_url=None, redoc_url=None, openapi_url=None)
+    cache = HtmlCache(opcoes.cache_dir) if opcoes.cache_dir else None
+    limitador = TokenBucket(opcoes.rps) if opcoes.rps > 0 else None
+    estatisticas = EstatisticasServidor()
+    em_andamento = [0]
+    rng = random.Random(opcoes.semente)
+
+    @app.get("/index.php")
+    async def index_php(request: Request):
+        estatisticas.requisicoes += 1
+        params = dict(request.query_params)
+        opcao = params.get("opcao", "")
+        estatisticas.por_opcao[opcao] = estatisticas.por_opcao.get(opcao, 0) + 1
+
+        if limitador is not None and not limitador.try_acquire():
+            estatisticas.limitadas += 1
+            return Response("Too Many Requests", status_code=429, headers={"Retry-After": "1"})
+        if opcoes.max_concorrencia and em_andamento[0] >= opcoes.max_concorrencia:
+            estatisticas.limitadas += 1
+            return Response("Service Unavailable", status_code=503, headers={"Retry-After": "1"})
+
+        em_andamento[0] += 1
+        try:
+            if opcoes.latencia_ms or opcoes.jitter_ms:
+                atraso = opcoes.latencia_ms + rng.uniform(-opcoes.jitter_ms, opcoes.jitter_ms)
+                await asyncio.sleep(max(0.0, atraso) / 1000)
+            if opcoes.taxa_erro and rng.random() < opcoes.taxa_erro:
+                estatisticas.erros_injetados += 1
+                return Response("Internal Server Error", status_code=rng.choice((500, 503)))
+
+            conteudo = await asyncio.to_thread(cache.carregar, params) if cache is not None else None
+            if conteudo is not None:
+                estatisticas.do_cache += 1
+            elif opcoes.somente_cache or opcao not in CATEGORIA_POR_OPCAO:
+                estatisticas.nao_encontradas += 1
+                return Response("Not Found", status_code=404)
+            else:
+                conteudo = synthetic_page(CATEGORIA_POR_OPCAO[opcao], params, opcoes.semente, opcoes.links_menu)
+                estatisticas.sinteticas += 1
+            return Response(conteudo, media_type="text/html; charset=utf-8")
+        finally:
+            em_andamento[0] -= 1
+
+    @app.get("/_stats")
+    async def stats():
+        return JSONResponse({**estatisticas.__dict__, "em_andamento": em_andamento[0], "desde": inicio})
+
+    inicio = time.time()
+    return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servidor local que simula o site da Embrapa Vitibrasil (use com EMBRAPA_BASE_URL=http://HOST:PORTA).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8089)
+    parser.add_argument("--cache-dir", default=None, help="Páginas gravadas pelo populate_db --cache-dir; as ausentes são geradas sinteticamente.")
+    parser.add_argument("--somente-cache", action="store_true", help="Responde 404 para páginas que não estão no cache em vez de gerá-las.")
+    parser.add_argument("--latencia-ms", type=float, default=0.0, help="Atraso médio por página.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Variação uniforme (+/-) do atraso.")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração das requisições respondidas com 500/503.")
+    parser.add_argument("--rps", type=float, default=0.0, help="Requisições por segundo aceitas; o excedente recebe 429 (0 = sem limite).")
+    parser.add_argument("--max-concorrencia", type=int, default=0, help="Requisições simultâneas aceitas; o excedente recebe 503 (0 = sem limite).")
+    parser.add_argument("--semente", type=int, default=0, help="Muda o conteúdo das páginas sintéticas (e portanto os fingerprints).")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    opcoes = OpcoesServidor(
+        cache_dir=args.cache_dir, somente_cache=args.somente_cache, latencia_ms=args.latencia_ms, jitter_ms=args.jitter_ms,
+        taxa_erro=args.taxa_erro, rps=args.rps, max_concorrencia=args.max_concorrencia, semente=args.semente,
+    )
+    print(f"FAKE_EMBRAPA: Servindo em http://{args.host}:{args.porta}/index.php (EMBRAPA_BASE_URL=http://{args.host}:{args.porta}).")
+    uvicorn.run(create_app(opcoes), host=args.host, port=args.porta, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
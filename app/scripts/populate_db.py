@@ -1,98 +1,287 @@
+import argparse
 import asyncio
+import logging
 import sys
 import os
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR)) 
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
 sys.path.append(PROJECT_ROOT_DIR)
 
+from app.core.config import EMBRAPA_CACHE_DIR
+from app.core.logging_config import setup_logging
 from app.db.session import SessionLocal, engine
-from app.db.base import Base
-from app.services import embrapa_scraper 
+from app.db.base import create_tables
+from app.crud import bulk_write, crud_resumo
+from app.services import embrapa_scraper
+from app.utils.rate_limiter import TokenBucket
 
-# --- Configurações para a Coleta de Dados ---
+# Nome fixo: via `python -m` o __name__ é "__main__", fora da hierarquia "app" configurada por setup_logging.
+logger = logging.getLogger("app.scripts.populate_db")
+
+# --- Configurações padrão para a Coleta de Dados (sobrescritas pela linha de comando) ---
 START_YEAR = 1970
 
 END_YEAR = datetime.now().year
 
-async def populate_data_for_year(db: Session, year: int):
-
-    print(f"\nPOPULATE_DB: Iniciando coleta de dados para o ano {year}...")
-    
-    # Produção
-    print(f"POPULATE_DB: Coletando e salvando dados de Produção para {year}...")
-    await embrapa_scraper.fetch_producao_data(db=db, year=year)
-    print(f"POPULATE_DB: Dados de Produção para {year} processados e salvos.")
-
-    # Comercialização
-    print(f"POPULATE_DB: Coletando e salvando dados de Comercialização para {year}...")
-    await embrapa_scraper.fetch_comercializacao_data(db=db, year=year)
-    print(f"POPULATE_DB: Dados de Comercialização para {year} processados e salvos.")
-
-    # Processamento
-    for tipo_proc_key in embrapa_scraper.PROCESSAMENTO_TIPO_MAP.keys():
-        print(f"POPULATE_DB: Coletando e salvando dados de Processamento ({tipo_proc_key}) para {year}...")
-        await embrapa_scraper.fetch_processamento_data(db=db, year=year, tipo_processamento_key=tipo_proc_key)
-        print(f"POPULATE_DB: Dados de Processamento ({tipo_proc_key}) para {year} processados e salvos.")
-
-    # Importação
-    for tipo_imp_key in embrapa_scraper.IMPORTACAO_TIPO_MAP.keys():
-        print(f"POPULATE_DB: Coletando e salvando dados de Importação ({tipo_imp_key}) para {year}...")
-        await embrapa_scraper.fetch_importacao_data(db=db, year=year, tipo_importacao_key=tipo_imp_key)
-        print(f"POPULATE_DB: Dados de Importação ({tipo_imp_key}) para {year} processados e salvos.")
-
-    # Exportação
-    for tipo_exp_key in embrapa_scraper.EXPORTACAO_TIPO_MAP.keys():
-        print(f"POPULATE_DB: Coletando e salvando dados de Exportação ({tipo_exp_key}) para {year}...")
-        await embrapa_scraper.fetch_exportacao_data(db=db, year=year, tipo_exportacao_key=tipo_exp_key)
-        print(f"POPULATE_DB: Dados de Exportação ({tipo_exp_key}) para {year} processados e salvos.")
-    
-    print(f"POPULATE_DB: Coleta para o ano {year} concluída.")
-
-async def main_populate_all_years():
+DEFAULT_CONCURRENCY = 4
+
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+DEFAULT_YEARS_PER_TRANSACTION = 1
+
+
+@dataclass
+class PopulateJob:
+    ano: int
+    categoria: str
+    tipo: Optional[str] = None
+
+    def descricao(self) -> str:
+        return f"{self.categoria}{f' ({self.tipo})' if self.tipo else ''} {self.ano}"
+
+
+@dataclass
+class PopulateStats:
+    paginas: int = 0
+    paginas_vazias: int = 0
+    paginas_inalteradas: int = 0
+    falhas: int = 0
+    linhas: int = 0
+    inicio: float = field(default_factory=time.monotonic)
+    fim: Optional[float] = None
+    fatias_alteradas: List[str] = field(default_factory=list)
+    anos_revertidos: List[int] = field(default_factory=list)
+
+    def resumo(self) -> str:
+        duracao = (self.fim or time.monotonic()) - self.inicio
+        paginas_s = self.paginas / duracao if duracao > 0 else 0.0
+        linhas_s = self.linhas / duracao if duracao > 0 else 0.0
+        return (
+            f"{self.paginas} páginas ({len(self.fatias_alteradas)} alteradas, {self.paginas_inalteradas} inalteradas, "
+            f"{self.paginas_vazias} vazias, {self.falhas} falhas, {len(self.anos_revertidos)} anos revertidos), "
+            f"{self.linhas} linhas em {duracao:.1f}s -> {paginas_s:.2f} páginas/s, {linhas_s:.1f} linhas/s"
+        )
+
+
+def build_jobs(ano_inicio: int, ano_fim: int, categorias: List[str]) -> List[PopulateJob]:
+    return [
+        PopulateJob(ano=ano, categoria=categoria, tipo=tipo)
+        for ano in range(ano_inicio, ano_fim + 1)
+        for categoria in categorias
+        for tipo in embrapa_scraper.CATEGORIA_TIPOS[categoria]
+    ]
+
+
+async def _worker(nome: str, db: Session, fila: asyncio.Queue, limiter: TokenBucket, stats: PopulateStats, incremental: bool, commit: bool):
+    while True:
+        job: PopulateJob = await fila.get()
+        try:
+            await limiter.acquire()
+            itens = await embrapa_scraper.fetch_category_data(
+                db=db, categoria=job.categoria, year=job.ano, tipo=job.tipo, incremental=incremental, commit=commit
+            )
+            stats.paginas += 1
+            if itens is None:
+                stats.paginas_inalteradas += 1
+                logger.info("POPULATE_DB [%s]: %s -> sem alterações.", nome, job.descricao())
+                continue
+            stats.linhas += len(itens)
+            if itens:
+                stats.fatias_alteradas.append(job.descricao())
+            else:
+                stats.paginas_vazias += 1
+            logger.info("POPULATE_DB [%s]: %s -> %s linhas.", nome, job.descricao(), len(itens))
+        except Exception as e:
+            stats.falhas += 1
+            logger.error("POPULATE_DB [%s]: Falha em %s: %s: %s", nome, job.descricao(), type(e).__name__, e)
+        finally:
+            fila.task_done()
+
+
+async def _run_jobs(
+    db: Session,
+    jobs: List[PopulateJob],
+    concurrency: int,
+    limiter: TokenBucket,
+    stats: PopulateStats,
+    incremental: bool,
+    commit: bool
+) -> None:
+    fila: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        fila.put_nowait(job)
+
+    workers = [
+        asyncio.create_task(_worker(f"w{i + 1}", db, fila, limiter, stats, incremental, commit))
+        for i in range(max(1, concurrency))
+    ]
+    try:
+        await fila.join()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def _commit_block(db: Session, anos: List[int], stats: PopulateStats, falhas_antes: int, alteradas_antes: int) -> None:
+    descricao = f"{anos[0]}-{anos[-1]}" if len(anos) > 1 else str(anos[0])
+    if stats.falhas == falhas_antes:
+        try:
+            db.commit()
+            logger.info("POPULATE_DB: Bloco %s gravado em uma única transação.", descricao)
+            return
+        except Exception as e:
+            logger.error("POPULATE_DB: Falha no commit do bloco %s: %s: %s", descricao, type(e).__name__, e)
+    db.rollback()
+    del stats.fatias_alteradas[alteradas_antes:]
+    stats.anos_revertidos.extend(anos)
+    logger.warning("POPULATE_DB: Bloco %s revertido; nenhuma fatia destes anos foi alterada.", descricao)
+
+
+async def run_scheduler(
+    db: Session,
+    jobs: List[PopulateJob],
+    concurrency: int,
+    requests_per_second: float,
+    incremental: bool = True,
+    anos_por_transacao: int = 0
+) -> PopulateStats:
+    """
+    Executa os jobs (ano, categoria, tipo) numa fila com `concurrency` workers atrás de um token-bucket.
+
+    Com `anos_por_transacao > 0` os anos são processados em blocos desse tamanho e cada bloco é gravado
+    numa única transação (commit no fim do bloco, rollback se qualquer fatia dele falhar); com 0 cada
+    fatia é commitada isoladamente pelo crud.
+    """
+    limiter = TokenBucket(rate=requests_per_second)
+    stats = PopulateStats()
+
+    if anos_por_transacao <= 0:
+        await _run_jobs(db, jobs, concurrency, limiter, stats, incremental, commit=True)
+    else:
+        anos = sorted({job.ano for job in jobs})
+        for i in range(0, len(anos), anos_por_transacao):
+            bloco = anos[i:i + anos_por_transacao]
+            falhas_antes, alteradas_antes = stats.falhas, len(stats.fatias_alteradas)
+            await _run_jobs(db, [job for job in jobs if job.ano in bloco], concurrency, limiter, stats, incremental, commit=False)
+            _commit_block(db, bloco, stats, falhas_antes, alteradas_antes)
+
+    stats.fim = time.monotonic()
+    return stats
+
+
+async def main_populate_all_years(args: argparse.Namespace):
     """
-    Função principal para popular o banco de dados com todos os anos definidos.
+    Função principal para popular o banco de dados com os anos e categorias pedidos.
     """
-    print("POPULATE_DB: Iniciando script de população completa do banco de dados...")
-    
+    logger.info("POPULATE_DB: Iniciando script de população do banco de dados...")
+
     # Garante que todas as tabelas definidas nos modelos SQLAlchemy existam
-    print("POPULATE_DB: Verificando/Criando todas as tabelas do banco de dados...")
-    Base.metadata.create_all(bind=engine)
-    print("POPULATE_DB: Tabelas verificadas/criadas.")
+    logger.info("POPULATE_DB: Verificando/Criando todas as tabelas do banco de dados...")
+    create_tables(bind=engine)
+    logger.info("POPULATE_DB: Tabelas verificadas/criadas.")
 
     db: Session = SessionLocal()
     try:
-        years_to_process = list(range(START_YEAR, END_YEAR + 1))
-        total_years = len(years_to_process)
-        print(f"POPULATE_DB: Serão processados {total_years} anos, de {START_YEAR} a {END_YEAR}.")
-
-        for i, year_to_fetch in enumerate(years_to_process):
-            print(f"\nPOPULATE_DB: Processando ano {year_to_fetch} ({i+1}/{total_years})...")
-            await populate_data_for_year(db, year_to_fetch)
-            
-
-            if i < total_years - 1:
-                sleep_duration = 5
-                print(f"POPULATE_DB: Aguardando {sleep_duration} segundos antes de processar o próximo ano...")
-                await asyncio.sleep(sleep_duration)
-                
-        print("\nPOPULATE_DB: População de todos os anos concluída com sucesso!")
+        if args.recalcular_resumos:
+            crud_resumo.rebuild_all(db)
+            return
+
+        if args.cache_dir or args.replay:
+            embrapa_scraper.configure_html_cache(args.cache_dir or EMBRAPA_CACHE_DIR, replay=args.replay)
+            if args.replay:
+                args.rps = 0
+
+        if args.copy:
+            bulk_write.configure_copy(True)
+
+        jobs = build_jobs(args.ano_inicio, args.ano_fim, args.categorias)
+        logger.info(
+            "POPULATE_DB: %s páginas a coletar (%s-%s, categorias: %s), concorrência %s, limite %s req/s, modo %s, %s.",
+            len(jobs), args.ano_inicio, args.ano_fim, ", ".join(args.categorias), args.concorrencia, args.rps,
+            "completo" if args.forcar else "incremental",
+            f"{args.anos_por_transacao} ano(s) por transação" if args.anos_por_transacao else "commit por fatia"
+        )
+
+        stats = await run_scheduler(
+            db, jobs, concurrency=args.concorrencia, requests_per_second=args.rps,
+            incremental=not args.forcar, anos_por_transacao=args.anos_por_transacao
+        )
+
+        logger.info("POPULATE_DB: População concluída: %s", stats.resumo())
+        if stats.fatias_alteradas:
+            logger.info("POPULATE_DB: Fatias alteradas: %s", ', '.join(sorted(stats.fatias_alteradas)))
     except Exception as e:
-        import traceback
-        print(f"POPULATE_DB: Ocorreu um erro durante o processo de população: {e}")
-        print(traceback.format_exc())
+        logger.exception("POPULATE_DB: Ocorreu um erro durante o processo de população: %s", e)
     finally:
+        await embrapa_scraper.close_http_client()
         db.close()
-        print("POPULATE_DB: Sessão do banco de dados fechada.")
+        logger.info("POPULATE_DB: Sessão do banco de dados fechada.")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Popula o banco de dados com os dados da Embrapa Vitibrasil.")
+    parser.add_argument("--ano-inicio", type=int, default=START_YEAR, help=f"Primeiro ano a coletar (padrão: {START_YEAR}).")
+    parser.add_argument("--ano-fim", type=int, default=END_YEAR, help=f"Último ano a coletar (padrão: {END_YEAR}).")
+    parser.add_argument(
+        "--categorias",
+        type=lambda valor: [c.strip() for c in valor.split(",") if c.strip()],
+        default=list(embrapa_scraper.CATEGORIA_TIPOS.keys()),
+        help="Categorias separadas por vírgula (padrão: todas). Ex: producao,importacao",
+    )
+    parser.add_argument("--concorrencia", type=int, default=DEFAULT_CONCURRENCY, help="Número de páginas coletadas em paralelo.")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="Requisições por segundo ao site da Embrapa (0 = sem limite).")
+    parser.add_argument(
+        "--forcar",
+        action="store_true",
+        help="Regrava todas as fatias mesmo quando o fingerprint da página não mudou.",
+    )
+    parser.add_argument(
+        "--anos-por-transacao",
+        type=int,
+        default=DEFAULT_YEARS_PER_TRANSACTION,
+        help="Grava cada bloco de N anos numa única transação (0 = commit por fatia).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Grava as páginas baixadas (gzip, endereçadas por conteúdo) neste diretório.",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Re-processa as páginas do cache sem acessar a rede (combine com --forcar para regravar fatias já ingeridas).",
+    )
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="No PostgreSQL, grava fatias ainda vazias via COPY (carga completa inicial).",
+    )
+    parser.add_argument(
+        "--recalcular-resumos",
+        action="store_true",
+        help="Só recalcula a tabela de resumos (totais por categoria/tipo/ano) a partir dos dados já gravados, sem coletar.",
+    )
+    args = parser.parse_args(argv)
+
+    invalidas = [c for c in args.categorias if c not in embrapa_scraper.CATEGORIA_TIPOS]
+    if invalidas:
+        parser.error(f"Categorias inválidas: {', '.join(invalidas)}. Opções: {', '.join(embrapa_scraper.CATEGORIA_TIPOS)}")
+    if args.ano_inicio > args.ano_fim:
+        parser.error("--ano-inicio deve ser menor ou igual a --ano-fim.")
+    return args
+
 
 if __name__ == "__main__":
-    print("=====================================================================")
-    print("Executando script de população do banco de dados Embrapa Viticultura...")
-    print("=====================================================================")
-
-    asyncio.run(main_populate_all_years())
-    print("=====================================================================")
-    print("Script de população do banco de dados concluído.")
-    print("=====================================================================")
\ No newline at end of file
+    cli_args = parse_args()
+    setup_logging()
+    logger.info("Executando script de população do banco de dados Embrapa Viticultura...")
+
+    asyncio.run(main_populate_all_years(cli_args))
+    logger.info("Script de população do banco de dados concluído.")
@@ -1,69 +1,121 @@
-from datetime import datetime, timezone
-from typing import Optional, Dict
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Dict
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    ADMIN_USERNAMES,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_TOKEN_CACHE_SIZE,
+    AUTH_USER_CACHE_TTL_SECONDS,
+)
 from app.schemas.token_schemas import TokenData
 from app.crud import crud_user
 from app.models import user as user_model
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.core.security import verify_password
+from app.utils.ttl_cache import TTLLRUCache
 
-async def authenticate_user(db: Session, username: str, password_provided: str) -> Optional[user_model.User]:
+logger = logging.getLogger(__name__)
 
-    print(f"AUTH_SERVICE (DB): Tentando autenticar usuário: {username}")
-    user = crud_user.get_user_by_username(db, username=username)
+# token -> (username, exp): a assinatura só é verificada na primeira vez que o token aparece.
+_token_cache = TTLLRUCache(max_itens=AUTH_TOKEN_CACHE_SIZE, ttl=600.0, nome="tokens")
+
+# username -> colunas do usuário; limita a AUTH_USER_CACHE_TTL_SECONDS o atraso para um usuário desabilitado ser barrado.
+_user_cache = TTLLRUCache(max_itens=AUTH_TOKEN_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL_SECONDS, nome="usuarios")
+
+_USER_CAMPOS = ("id", "username", "hashed_password_sha256", "full_name", "disabled")
+
+async def authenticate_user(db: AsyncSession, username: str, password_provided: str) -> Optional[user_model.User]:
+
+    logger.debug("AUTH_SERVICE (DB): Tentando autenticar usuário: %s", username)
+    user = await crud_user.get_user_by_username(db, username=username)
     
     if not user:
-        print(f"AUTH_SERVICE (DB): Usuário '{username}' NÃO encontrado no banco de dados.")
+        logger.warning("AUTH_SERVICE (DB): Usuário '%s' NÃO encontrado no banco de dados.", username)
         return None
     
-    print(f"AUTH_SERVICE (DB): Usuário '{username}' encontrado. Verificando senha...")
+    logger.debug("AUTH_SERVICE (DB): Usuário '%s' encontrado. Verificando senha...", username)
     
     if not verify_password(password_provided, user.hashed_password_sha256):
-        print(f"AUTH_SERVICE (DB): Senha incorreta para o usuário '{username}'.")
+        logger.warning("AUTH_SERVICE (DB): Senha incorreta para o usuário '%s'.", username)
         return None
     
     if user.disabled:
-        print(f"AUTH_SERVICE (DB): Usuário '{username}' está desabilitado.")
+        logger.warning("AUTH_SERVICE (DB): Usuário '%s' está desabilitado.", username)
         return None
     
-    print(f"AUTH_SERVICE (DB): Usuário '{username}' autenticado com SUCESSO via DB.")
+    logger.debug("AUTH_SERVICE (DB): Usuário '%s' autenticado com SUCESSO via DB.", username)
     return user
 
 def create_access_token(data: Dict) -> str:
 
     to_encode = data.copy()
+    if ACCESS_TOKEN_EXPIRE_MINUTES > 0:
+        to_encode["exp"] = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"AUTH_SERVICE (DB): Token de acesso criado para dados: {data}")
+    logger.debug("AUTH_SERVICE (DB): Token de acesso criado para dados: %s", data)
     return encoded_jwt
 
 async def decode_access_token(token: str) -> Optional[TokenData]:
 
+    em_cache = _token_cache.get(token)
+    if em_cache is not None:
+        username, exp = em_cache
+        if exp is None or exp > time.time():
+            return TokenData(username=username)
+        _token_cache.pop(token)
+        logger.warning("AUTH_SERVICE (DB): Token de '%s' expirado.", username)
+        return None
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: Optional[str] = payload.get("sub")
         
         if username is None:
-            print("AUTH_SERVICE (DB): Erro ao decodificar token - username (sub) não encontrado.")
+            logger.warning("AUTH_SERVICE (DB): Erro ao decodificar token - username (sub) não encontrado.")
             return None
         
         token_data = TokenData(username=username)
-        print(f"AUTH_SERVICE (DB): Token decodificado com sucesso para usuário: {username}")
+        _token_cache.set(token, (username, payload.get("exp")))
+        logger.debug("AUTH_SERVICE (DB): Token decodificado com sucesso para usuário: %s", username)
         return token_data
     except JWTError as e:
-        print(f"AUTH_SERVICE (DB): Erro ao decodificar token JWT - {type(e).__name__}: {str(e)}")
+        logger.warning("AUTH_SERVICE (DB): Erro ao decodificar token JWT - %s: %s", type(e).__name__, str(e))
         return None
 
+async def _get_user_cached(db: AsyncSession, username: str) -> Optional[user_model.User]:
+    snapshot: Optional[Dict[str, Any]] = _user_cache.get(username)
+    if snapshot is not None:
+        # Objeto transitório (fora da sessão), montado do cache sem consultar o banco.
+        return user_model.User(**snapshot)
+
+    user = await crud_user.get_user_by_username(db, username=username)
+    if user is not None:
+        _user_cache.set(username, {campo: getattr(user, campo) for campo in _USER_CAMPOS})
+    return user
+
+async def is_admin_token(token: str) -> bool:
+    """Token válido de um usuário ativo listado em ADMIN_USERNAMES (para uso fora das dependências, ex.: middlewares)."""
+    token_data = await decode_access_token(token)
+    if token_data is None or token_data.username not in ADMIN_USERNAMES:
+        return False
+    async with AsyncSessionLocal() as db:
+        user = await _get_user_cached(db, username=token_data.username)
+    return user is not None and not user.disabled
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ) -> user_model.User:
-    print(f"AUTH_SERVICE (get_current_user DB): Tentando validar token (início)...")
+    logger.debug("AUTH_SERVICE (get_current_user DB): Tentando validar token (início)...")
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -74,20 +126,29 @@ async def get_current_user(
     token_data: Optional[TokenData] = await decode_access_token(token)
     
     if token_data is None or token_data.username is None:
-        print(f"AUTH_SERVICE (get_current_user DB): Token inválido ou username não encontrado no token.")
+        logger.warning("AUTH_SERVICE (get_current_user DB): Token inválido ou username não encontrado no token.")
         raise credentials_exception
     
-    user = crud_user.get_user_by_username(db, username=token_data.username)
+    user = await _get_user_cached(db, username=token_data.username)
     
     if user is None:
-        print(f"AUTH_SERVICE (get_current_user DB): Usuário '{token_data.username}' do token não encontrado no DB.")
+        logger.warning("AUTH_SERVICE (get_current_user DB): Usuário '%s' do token não encontrado no DB.", token_data.username)
         raise credentials_exception
     if user.disabled:
-        print(f"AUTH_SERVICE (get_current_user DB): Usuário '{token_data.username}' está desabilitado.")
+        logger.warning("AUTH_SERVICE (get_current_user DB): Usuário '%s' está desabilitado.", token_data.username)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Usuário inativo ou desabilitado."
         )
         
-    print(f"AUTH_SERVICE (get_current_user DB): Usuário '{user.username}' validado com sucesso via token e DB.")
-    return user
\ No newline at end of file
+    logger.debug("AUTH_SERVICE (get_current_user DB): Usuário '%s' validado com sucesso via token e DB.", user.username)
+    return user
+
+async def get_current_admin_user(current_user: user_model.User = Depends(get_current_user)) -> user_model.User:
+    if current_user.username not in ADMIN_USERNAMES:
+        logger.warning("AUTH_SERVICE (get_current_admin_user): Usuário '%s' sem permissão de administrador.", current_user.username)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a administradores."
+        )
+    return current_user
\ No newline at end of file
@@ -0,0 +1,84 @@
+import logging
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.core.config import EXPORT_CHUNK_ROWS
+from app.crud.crud_resumo import FONTES
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_columns(categoria: str) -> List[str]:
+    return [coluna.name for coluna in FONTES[categoria].model.__table__.columns if coluna.name != "id"]
+
+
+def build_export_query(categoria: str, tipo: Optional[str], ano_inicio: Optional[int], ano_fim: Optional[int]):
+    fonte = FONTES[categoria]
+    table = fonte.model.__table__
+    stmt = select(*(table.c[nome] for nome in export_columns(categoria)))
+    if tipo and fonte.coluna_tipo:
+        stmt = stmt.where(table.c[fonte.coluna_tipo] == tipo)
+    if ano_inicio is not None:
+        stmt = stmt.where(table.c.ano >= ano_inicio)
+    if ano_fim is not None:
+        stmt = stmt.where(table.c.ano <= ano_fim)
+    return stmt.order_by(table.c.ano, table.c.id).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+
+
+def _encode_ndjson(colunas: Sequence[str], rows) -> bytes:
+    return "".join(json.dumps(dict(zip(colunas, row)), ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(
+    categoria: str,
+    tipo: Optional[str] = None,
+    ano_inicio: Optional[int] = None,
+    ano_fim: Optional[int] = None,
+    formato: str = "ndjson",
+    compactar: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Gera a tabela da categoria em blocos de EXPORT_CHUNK_ROWS linhas, lidas por cursor no servidor (`yield_per`).
+
+    Abre a própria sessão: o gerador roda depois que o endpoint retornou e a sessão da requisição já foi fechada.
+    A memória usada fica limitada a um bloco, independente do tamanho da tabela.
+    """
+    colunas = export_columns(categoria)
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compactar else None  # wbits=31: formato gzip
+    total = 0
+
+    def _saida(dados: bytes) -> bytes:
+        return gzip.compress(dados) if gzip else dados
+
+    if formato == "csv":
+        yield _saida(_encode_csv([colunas]))
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(build_export_query(categoria, tipo, ano_inicio, ano_fim))
+        async for bloco in result.partitions():
+            total += len(bloco)
+            dados = _encode_csv(bloco) if formato == "csv" else _encode_ndjson(colunas, bloco)
+            saida = _saida(dados)
+            if saida:
+                yield saida
+
+    if gzip:
+        yield gzip.flush()
+    logger.info("BULK_EXPORT: %s linhas de %s%s exportadas em %s%s.", total, categoria, f'/{tipo}' if tipo else '', formato, ' (gzip)' if compactar else '')
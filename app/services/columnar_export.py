@@ -0,0 +1,124 @@
+import logging
+import asyncio
+import os
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Float, Integer
+
+from app.core.config import EXPORT_CACHE_DIR, EXPORT_CHUNK_ROWS
+from app.crud import crud_versao
+from app.crud.crud_resumo import FONTES
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.services.bulk_export import build_export_query, export_columns
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional; sem ele o endpoint colunar responde 501
+    pa = None
+
+FORMATOS_COLUNARES: Dict[str, Tuple[str, str]] = {
+    "arrow": ("arrow", "application/vnd.apache.arrow.file"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+def disponivel() -> bool:
+    return pa is not None
+
+
+def _schema(categoria: str) -> "pa.Schema":
+    table = FONTES[categoria].model.__table__
+    campos = []
+    for nome in export_columns(categoria):
+        coluna = table.c[nome]
+        if isinstance(coluna.type, Integer):
+            tipo_arrow = pa.int32()
+        elif isinstance(coluna.type, Float):
+            tipo_arrow = pa.float64()
+        else:
+            tipo_arrow = pa.string()
+        campos.append(pa.field(nome, tipo_arrow, nullable=coluna.nullable))
+    return pa.schema(campos)
+
+
+def _write_file(caminho: str, categoria: str, tipo: Optional[str], ano_inicio: Optional[int], ano_fim: Optional[int], formato: str) -> int:
+    schema = _schema(categoria)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    total = 0
+    with SessionLocal() as db:
+        result = db.execute(build_export_query(categoria, tipo, ano_inicio, ano_fim))
+        if formato == "parquet":
+            writer = pq.ParquetWriter(temporario, schema, compression="zstd")
+        else:
+            writer = pa_ipc.new_file(temporario, schema)
+        try:
+            for bloco in result.partitions(EXPORT_CHUNK_ROWS):
+                colunas = list(zip(*bloco))
+                batch = pa.record_batch([pa.array(valores, type=campo.type) for valores, campo in zip(colunas, schema)], schema=schema)
+                if formato == "parquet":
+                    writer.write_table(pa.Table.from_batches([batch]))
+                else:
+                    writer.write_batch(batch)
+                total += len(bloco)
+        finally:
+            writer.close()
+    os.replace(temporario, caminho)
+    return total
+
+
+def _prune_versions(diretorio: str, recorte: str, extensao: str, atual: str) -> None:
+    """Apaga as versões antigas do recorte, exceto a mais recente delas (ainda pode estar sendo transmitida)."""
+    antigas = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome)
+        if nome.startswith(f"{recorte}.v") and nome.endswith(f".{extensao}") and caminho != atual:
+            try:
+                antigas.append((os.path.getmtime(caminho), caminho))
+            except FileNotFoundError:
+                continue  # outro worker já removeu
+    for _, caminho in sorted(antigas)[:-1]:
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass  # outro worker já removeu
+
+
+async def get_columnar_export(
+    categoria: str,
+    tipo: Optional[str],
+    ano_inicio: Optional[int],
+    ano_fim: Optional[int],
+    formato: str
+) -> str:
+    """
+    Devolve o caminho de um arquivo Arrow IPC/Parquet com o recorte pedido, gerando-o em blocos se necessário.
+
+    O nome do arquivo inclui a versão do dataset da categoria, então o cache em disco vale até a próxima carga.
+    A versão substituída fica em disco até a geração seguinte, porque outro worker ainda pode estar transmitindo-a.
+    """
+    async with AsyncSessionLocal() as db:
+        versao = await crud_versao.get_version_token(db, categoria, tipo)
+
+    recorte = f"{categoria}_{tipo or 'todos'}_{ano_inicio or 'inicio'}_{ano_fim or 'fim'}"
+    extensao = FORMATOS_COLUNARES[formato][0]
+    diretorio = os.path.join(EXPORT_CACHE_DIR, categoria)
+    caminho = os.path.join(diretorio, f"{recorte}.v{versao}.{extensao}")
+
+    # Um lock por recorte e formato (não por versão), para o dicionário não crescer a cada carga.
+    lock = _locks.setdefault(f"{recorte}.{extensao}", asyncio.Lock())
+    async with lock:
+        if os.path.exists(caminho):
+            logger.info("COLUMNAR_EXPORT: %s servido do cache em disco.", os.path.basename(caminho))
+            return caminho
+
+        os.makedirs(diretorio, exist_ok=True)
+        total = await asyncio.to_thread(_write_file, caminho, categoria, tipo, ano_inicio, ano_fim, formato)
+        _prune_versions(diretorio, recorte, extensao, caminho)
+        logger.info("COLUMNAR_EXPORT: %s gerado com %s linhas.", os.path.basename(caminho), total)
+    return caminho
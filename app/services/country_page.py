@@ -0,0 +1,52 @@
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import http_cache
+from app.utils import fast_json, keyset
+
+# crud_importacao.get_importacao_page / crud_exportacao.get_exportacao_page:
+# (db, year, tipo, campos, paises, min_kg, min_usd, apos_pais, limite) -> até limite + 1 linhas
+BuscaPagina = Callable[..., Awaitable[List[Row]]]
+
+
+async def country_page_response(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    categoria: str,
+    tipo_key: str,
+    campos_permitidos: Sequence[str],
+    buscar: BuscaPagina,
+    ano: int,
+    pais: Optional[str],
+    min_kg: Optional[float],
+    min_usd: Optional[float],
+    fields: Optional[str],
+    cursor: Optional[str],
+    limite: int
+):
+    """Corpo comum das rotas `/{tipo}/pagina/` de importação e exportação (keyset em `pais`)."""
+    try:
+        campos = keyset.parse_fields(fields, campos_permitidos, chave="pais")
+        apos_pais = keyset.decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    paises = [p.strip() for p in pais.split(",") if p.strip()] if pais else None
+
+    _, nao_modificado = await http_cache.check_conditional(request, response, db, categoria, tipo_key, ano)
+    if nao_modificado is not None:
+        return nao_modificado
+
+    rows = await buscar(db, ano, tipo_key, campos, paises, min_kg, min_usd, apos_pais, limite)
+    pagina = rows[:limite]
+    return fast_json.fast_response({
+        "ano_referencia": ano,
+        f"tipo_{categoria}": tipo_key,
+        "campos": campos,
+        "dados": [{campo: row._mapping[campo] for campo in campos} for row in pagina],
+        "limite": limite,
+        "proximo_cursor": keyset.encode_cursor(pagina[-1].pais) if len(rows) > limite else None
+    }, response)
@@ -0,0 +1,194 @@
+import logging
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float
+
+from app.core.config import DATASET_ENGINE_ENABLED, DATASET_ENGINE_CHECK_SECONDS
+from app.crud import crud_versao
+from app.crud.crud_resumo import FONTES
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models.fingerprint_model import TIPO_GERAL
+from app.models.resumo_model import ResumoDados
+from app.services.bulk_export import build_export_query, export_columns
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; sem ele os routers continuam consultando o banco
+    np = None
+
+# Linhas da fatia (dicts no formato das colunas da tabela) + totais no formato de ResumoDados.
+Fatia = Tuple[List[Dict[str, Any]], ResumoDados]
+
+
+@dataclass
+class TabelaColunar:
+    """
+    Uma tabela `dados_*` em colunas NumPy, ordenada por (ano, id).
+
+    Colunas de texto são codificadas em dicionário (códigos int32, -1 = NULL); colunas numéricas são float64
+    com NaN no lugar de NULL. `offsets[ano]` dá o intervalo [início, fim) das linhas do ano.
+    """
+    categoria: str
+    colunas: List[str]
+    texto: Dict[str, Tuple["np.ndarray", List[str]]] = field(default_factory=dict)
+    numericas: Dict[str, "np.ndarray"] = field(default_factory=dict)
+    anos: Optional["np.ndarray"] = None
+    offsets: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+    linhas: int = 0
+
+    def _indices(self, ano: int, tipo: Optional[str]) -> "np.ndarray":
+        inicio, fim = self.offsets.get(ano, (0, 0))
+        indices = np.arange(inicio, fim)
+        coluna_tipo = FONTES[self.categoria].coluna_tipo
+        if coluna_tipo and tipo and len(indices):
+            codigos, dicionario = self.texto[coluna_tipo]
+            try:
+                codigo = dicionario.index(tipo)
+            except ValueError:
+                return indices[:0]
+            indices = indices[codigos[inicio:fim] == codigo]
+        return indices
+
+    def fatia(self, ano: int, tipo: Optional[str]) -> Fatia:
+        indices = self._indices(ano, tipo)
+        fonte = FONTES[self.categoria]
+
+        medidas = [self.numericas[coluna][indices] for coluna in fonte.medidas.values()]
+        sem_valor = np.zeros(len(indices), dtype=bool)
+        for valores in medidas:
+            sem_valor |= np.isnan(valores)
+        resumo = ResumoDados(
+            categoria=self.categoria, tipo=tipo or TIPO_GERAL, ano=ano,
+            linhas=int(len(indices)), linhas_sem_valor=int(sem_valor.sum()),
+            **{campo: round(float(np.nansum(valores)), 2) for campo, valores in zip(fonte.medidas, medidas)}
+        )
+
+        colunas_saida: Dict[str, List[Any]] = {}
+        for nome in self.colunas:
+            if nome == "ano":
+                colunas_saida[nome] = [ano] * len(indices)
+            elif nome in self.texto:
+                codigos, dicionario = self.texto[nome]
+                colunas_saida[nome] = [dicionario[c] if c >= 0 else None for c in codigos[indices].tolist()]
+            else:
+                colunas_saida[nome] = [None if v != v else v for v in self.numericas[nome][indices].tolist()]
+        linhas = [dict(zip(self.colunas, valores)) for valores in zip(*(colunas_saida[nome] for nome in self.colunas))]
+        return linhas, resumo
+
+
+@dataclass
+class DatasetSnapshot:
+    token: str
+    versoes: Dict[Tuple[str, str, int], int]
+    tabelas: Dict[str, TabelaColunar]
+    carregado_em: float
+
+
+_snapshot: Optional[DatasetSnapshot] = None
+_tarefa_refresh: Optional[asyncio.Task] = None
+
+
+def _load_table(db, categoria: str) -> TabelaColunar:
+    colunas = export_columns(categoria)
+    table = FONTES[categoria].model.__table__
+    valores: Dict[str, List[Any]] = {nome: [] for nome in colunas}
+    for bloco in db.execute(build_export_query(categoria, None, None, None)).partitions():
+        for nome, coluna in zip(colunas, zip(*bloco)):
+            valores[nome].extend(coluna)
+
+    tabela = TabelaColunar(categoria=categoria, colunas=colunas, linhas=len(valores["ano"]))
+    for nome in colunas:
+        if nome == "ano":
+            tabela.anos = np.asarray(valores[nome], dtype=np.int32)
+        elif isinstance(table.c[nome].type, Float):
+            tabela.numericas[nome] = np.asarray([np.nan if v is None else v for v in valores[nome]], dtype=np.float64)
+        else:
+            dicionario: Dict[str, int] = {}
+            codigos = np.fromiter(
+                (-1 if v is None else dicionario.setdefault(v, len(dicionario)) for v in valores[nome]),
+                dtype=np.int32, count=len(valores[nome])
+            )
+            tabela.texto[nome] = (codigos, list(dicionario))
+
+    # Linhas já vêm ordenadas por ano: os offsets saem de np.unique sobre a coluna ordenada.
+    anos_unicos, inicios, contagens = np.unique(tabela.anos, return_index=True, return_counts=True)
+    tabela.offsets = {int(a): (int(i), int(i + c)) for a, i, c in zip(anos_unicos, inicios, contagens)}
+    return tabela
+
+
+def load_snapshot() -> DatasetSnapshot:
+    with SessionLocal() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            # Versões e linhas lidas no mesmo snapshot do banco, mesmo com cargas rodando em paralelo.
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        token = crud_versao.format_version_token(db.execute(crud_versao.version_token_query()).one())
+        versoes = crud_versao.get_all_versions(db)
+        tabelas = {categoria: _load_table(db, categoria) for categoria in FONTES}
+    return DatasetSnapshot(token=token, versoes=versoes, tabelas=tabelas, carregado_em=time.time())
+
+
+def enabled() -> bool:
+    return DATASET_ENGINE_ENABLED and np is not None
+
+
+def get_slice(categoria: str, tipo: Optional[str], ano: int, versao: int) -> Optional[Fatia]:
+    """Linhas e totais de (categoria, tipo, ano) se o snapshot em memória tem exatamente a `versao` pedida; senão None."""
+    snapshot = _snapshot
+    if snapshot is None or snapshot.versoes.get((categoria, tipo or TIPO_GERAL, ano), 0) != versao:
+        return None
+    return snapshot.tabelas[categoria].fatia(ano, tipo)
+
+
+def get_slices(categoria: str, tipo: Optional[str], versoes: Dict[int, int], ano_inicio: int, ano_fim: int) -> Optional[Dict[int, Fatia]]:
+    snapshot = _snapshot
+    if snapshot is None:
+        return None
+    for ano in range(ano_inicio, ano_fim + 1):
+        if snapshot.versoes.get((categoria, tipo or TIPO_GERAL, ano), 0) != versoes.get(ano, 0):
+            return None
+    tabela = snapshot.tabelas[categoria]
+    return {ano: tabela.fatia(ano, tipo) for ano in range(ano_inicio, ano_fim + 1)}
+
+
+async def reload() -> None:
+    global _snapshot
+    inicio = time.perf_counter()
+    novo = await asyncio.to_thread(load_snapshot)
+    _snapshot = novo  # troca atômica: requisições em andamento seguem com o snapshot anterior
+    linhas = sum(tabela.linhas for tabela in novo.tabelas.values())
+    logger.info("DATASET_ENGINE: Snapshot %s carregado (%s linhas) em %.2fs.", novo.token, linhas, time.perf_counter() - inicio)
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(DATASET_ENGINE_CHECK_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                token = await crud_versao.get_version_token(db)
+            if _snapshot is None or token != _snapshot.token:
+                await reload()
+        except Exception as e:
+            logger.exception("DATASET_ENGINE: Falha ao verificar/recarregar o snapshot: %s: %s", type(e).__name__, e)
+
+
+async def start() -> None:
+    global _tarefa_refresh
+    if not enabled():
+        if DATASET_ENGINE_ENABLED:
+            logger.warning("DATASET_ENGINE: numpy não instalado; motor em memória desativado.")
+        return
+    await reload()
+    _tarefa_refresh = asyncio.create_task(_refresh_loop())
+
+
+async def stop() -> None:
+    global _tarefa_refresh
+    if _tarefa_refresh is not None:
+        _tarefa_refresh.cancel()
+        await asyncio.gather(_tarefa_refresh, return_exceptions=True)
+        _tarefa_refresh = None
@@ -1,243 +1,266 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+import logging
+import asyncio
+import hashlib
+import time
+import httpx
+from dataclasses import dataclass
+from typing import Any, Callable, List, Dict, Optional
+from urllib.parse import urlsplit
 from sqlalchemy.orm import Session
-from app.schemas.producao_schemas import ProducaoScrapedItem, ProducaoItemData
-from app.schemas.processamento_schemas import ProcessamentoScrapedItem, ProcessamentoItemData
-from app.schemas.comercializacao_schemas import ComercializacaoScrapedItem, ComercializacaoItemData
-from app.schemas.importacao_schemas import ImportacaoScrapedItem, ImportacaoItemData
-from app.schemas.exportacao_schemas import ExportacaoScrapedItem, ExportacaoItemData
-from app.core.config import EMBRAPA_INDEX_PHP_URL, EMBRAPA_REQUEST_TIMEOUT
+from app.schemas.producao_schemas import ProducaoItemData
+from app.schemas.processamento_schemas import ProcessamentoItemData
+from app.schemas.comercializacao_schemas import ComercializacaoItemData
+from app.schemas.importacao_schemas import ImportacaoItemData
+from app.schemas.exportacao_schemas import ExportacaoItemData
+from app.core.config import (
+    EMBRAPA_INDEX_PHP_URL,
+    EMBRAPA_REQUEST_TIMEOUT,
+    EMBRAPA_CONNECT_TIMEOUT,
+    EMBRAPA_MAX_CONNECTIONS,
+    EMBRAPA_MAX_KEEPALIVE_CONNECTIONS,
+    EMBRAPA_KEEPALIVE_EXPIRY,
+    EMBRAPA_MAX_CONCURRENCY_PER_HOST,
+    EMBRAPA_CACHE_ENABLED,
+    EMBRAPA_CACHE_DIR,
+    EMBRAPA_REPLAY_MODE,
+    EMBRAPA_PARSER_BACKEND,
+)
+from app.core import metrics
 from app.crud import crud_producao
 from app.crud import crud_processamento
 from app.crud import crud_comercializacao
 from app.crud import crud_importacao
 from app.crud import crud_exportacao
+from app.crud import crud_fingerprint
+from app.services.html_cache import HtmlCache
+from app.services.table_parser import TableSpec, extract_tb_dados, parse_table, resolve_backend
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
-# --- Helpers de Conversão ---
-def _convert_producao_scraped_to_item_data(items: List[ProducaoScrapedItem], ano: int) -> List[ProducaoItemData]:
-    processed = []
-    for item in items:
-        qtd: Optional[float] = None
-        try:
-            if item.quantidade_str and item.quantidade_str != "-": qtd = float(item.quantidade_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Produção Conversão): Erro ao converter '{item.quantidade_str}'.")
-        processed.append(ProducaoItemData(produto=item.produto, sub_produto=item.sub_produto, quantidade_litros=qtd, ano=ano))
-    return processed
-
-def _convert_processamento_scraped_to_item_data(items: List[ProcessamentoScrapedItem], ano: int, tipo_key: str) -> List[ProcessamentoItemData]:
-    processed = []
-    for item in items:
-        qtd: Optional[float] = None
-        try:
-            if item.quantidade_str and item.quantidade_str != "-": qtd = float(item.quantidade_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Processamento Conversão): Erro ao converter '{item.quantidade_str}'.")
-        processed.append(ProcessamentoItemData(cultivar=item.cultivar, quantidade_kg=qtd, ano=ano, tipo_processamento=tipo_key))
-    return processed
-
-def _convert_comercializacao_scraped_to_item_data(items: List[ComercializacaoScrapedItem], ano: int) -> List[ComercializacaoItemData]:
-    processed = []
-    for item in items:
-        qtd: Optional[float] = None
-        try:
-            if item.quantidade_str and item.quantidade_str != "-": qtd = float(item.quantidade_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Comercialização Conversão): Erro ao converter '{item.quantidade_str}'.")
-        processed.append(ComercializacaoItemData(produto=item.produto, sub_produto=item.sub_produto, quantidade_litros=qtd, ano=ano))
-    return processed
-
-def _convert_importacao_scraped_to_item_data(items: List[ImportacaoScrapedItem], ano: int, tipo_key: str) -> List[ImportacaoItemData]:
-    processed = []
-    for item in items:
-        qtd_kg: Optional[float] = None; val_usd: Optional[float] = None
-        try:
-            if item.quantidade_str and item.quantidade_str != "-": qtd_kg = float(item.quantidade_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Importação Conversão Qtd): Erro ao converter '{item.quantidade_str}'.")
-        try:
-            if item.valor_str and item.valor_str != "-": val_usd = float(item.valor_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Importação Conversão Valor): Erro ao converter '{item.valor_str}'.")
-        processed.append(ImportacaoItemData(pais=item.pais, quantidade_kg=qtd_kg, valor_usd=val_usd, ano=ano, tipo_importacao=tipo_key))
-    return processed
-
-def _convert_exportacao_scraped_to_item_data(items: List[ExportacaoScrapedItem], ano: int, tipo_key: str) -> List[ExportacaoItemData]:
-    processed = []
-    for item in items:
-        qtd_kg: Optional[float] = None; val_usd: Optional[float] = None
-        try:
-            if item.quantidade_str and item.quantidade_str != "-": qtd_kg = float(item.quantidade_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Exportação Conversão Qtd): Erro ao converter '{item.quantidade_str}'.")
+# --- Cliente HTTP assíncrono compartilhado ---
+# Um único AsyncClient mantém o pool de conexões keep-alive com o site da Embrapa;
+# o semáforo por host limita quantas páginas são baixadas ao mesmo tempo.
+_http_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(EMBRAPA_REQUEST_TIMEOUT, connect=EMBRAPA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=EMBRAPA_MAX_CONNECTIONS,
+                max_keepalive_connections=EMBRAPA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=EMBRAPA_KEEPALIVE_EXPIRY,
+            ),
+            follow_redirects=True,
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _host_semaphores.clear()
+
+def _get_host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(EMBRAPA_MAX_CONCURRENCY_PER_HOST)
+    return _host_semaphores[host]
+
+# --- Cache de páginas brutas / modo replay ---
+_html_cache: Optional[HtmlCache] = HtmlCache(EMBRAPA_CACHE_DIR) if (EMBRAPA_CACHE_ENABLED or EMBRAPA_REPLAY_MODE) else None
+_replay_mode: bool = EMBRAPA_REPLAY_MODE
+
+def configure_html_cache(diretorio: Optional[str], replay: bool = False) -> None:
+    """Ativa (ou desativa, com `diretorio=None`) o cache de páginas; em replay a rede nunca é usada."""
+    global _html_cache, _replay_mode
+    if replay and not diretorio:
+        raise ValueError("O modo replay exige um diretório de cache.")
+    _html_cache = HtmlCache(diretorio) if diretorio else None
+    _replay_mode = replay
+    logger.info("SERVICE: Cache de páginas %s%s.", 'em ' + diretorio if diretorio else 'desativado', ' (modo replay, sem rede)' if replay else '')
+
+async def _fetch_page(params: Dict, contexto: str) -> Optional[bytes]:
+    if _replay_mode:
+        content = await asyncio.to_thread(_html_cache.carregar, params)
+        if content is None:
+            logger.warning("SERVICE (Replay): Página ausente no cache para %s params %s.", contexto, params)
+        return content
+
+    client = get_http_client()
+    async with _get_host_semaphore(EMBRAPA_INDEX_PHP_URL):
         try:
-            if item.valor_str and item.valor_str != "-": val_usd = float(item.valor_str.replace(',', '.'))
-        except ValueError: print(f"SCRAPER_SERVICE (Exportação Conversão Valor): Erro ao converter '{item.valor_str}'.")
-        processed.append(ExportacaoItemData(pais=item.pais, quantidade_kg=qtd_kg, valor_usd=val_usd, ano=ano, tipo_exportacao=tipo_key))
-    return processed
+            response = await client.get(EMBRAPA_INDEX_PHP_URL, params=params)
+            response.raise_for_status()
+            content = response.content
+        except httpx.HTTPError as e:
+            logger.error("SERVICE ERROR (%s) params %s: %s: %s", contexto, params, type(e).__name__, e)
+            return None
 
+    if _html_cache is not None:
+        try: await asyncio.to_thread(_html_cache.salvar, params, content)
+        except OSError as e: logger.error("SERVICE ERROR (Cache) params %s: %s", params, e)
+    return content
 
-# --- Funções de Scraping ---
+# --- Fingerprint de conteúdo (refresh incremental) ---
+def _fingerprint_pagina(content: bytes) -> str:
+    # Só a tabela de dados entra no hash: cabeçalho/rodapé do site mudam sem que os dados mudem.
+    return hashlib.sha256(extract_tb_dados(content) or content).hexdigest()
 
-async def fetch_producao_data(db: Session, year: int) -> List[ProducaoItemData]:
-    params = {'opcao': 'opt_02', 'ano': year}
-    raw_scraped_items: List[ProducaoScrapedItem] = []
-    current_main_product: Optional[str] = None
-    print(f"SERVICE: Iniciando scraping de Produção para o ano: {year}...")
-    try:
-        response = requests.get(EMBRAPA_INDEX_PHP_URL, params=params, headers=DEFAULT_HEADERS, timeout=EMBRAPA_REQUEST_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data_table = soup.find('table', class_='tb_dados')
-        if not data_table: return []
-        table_body = data_table.find('tbody')
-        if not table_body: return []
-        rows = table_body.find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) == 2:
-                product_cell_text = cols[0].get_text(separator=" ", strip=True)
-                quantidade_cell_text = cols[1].get_text(separator=" ", strip=True).replace('.', '')
-                product_cell_class = cols[0].get('class', [])
-                produto_nome: Optional[str] = None; sub_produto_nome: Optional[str] = None
-                if 'tb_item' in product_cell_class: current_main_product = product_cell_text; produto_nome = current_main_product
-                elif 'tb_subitem' in product_cell_class and current_main_product: produto_nome = current_main_product; sub_produto_nome = product_cell_text
-                elif 'tb_subitem' not in product_cell_class and not current_main_product: current_main_product = product_cell_text; produto_nome = current_main_product
-                elif 'tb_subitem' not in product_cell_class and current_main_product: current_main_product = product_cell_text; produto_nome = current_main_product
-                else: continue
-                raw_scraped_items.append(ProducaoScrapedItem(produto=produto_nome, sub_produto=sub_produto_nome, quantidade_str=quantidade_cell_text if quantidade_cell_text else "0"))
-    except requests.exceptions.RequestException as e: print(f"SERVICE ERROR (Produção) ano {year}: {e}"); return []
-    processed_data_list = _convert_producao_scraped_to_item_data(raw_scraped_items, year)
-    if processed_data_list:
-        try: crud_producao.create_or_replace_producao_for_year(db=db, year=year, producao_data_list=processed_data_list)
-        except Exception as e: print(f"SERVICE ERROR (Produção DB Save) ano {year}: {e}")
-    return processed_data_list
+def _pagina_inalterada(db: Session, categoria: str, tipo: Optional[str], year: int, fingerprint: str, incremental: bool) -> bool:
+    if not incremental:
+        return False
+    if crud_fingerprint.get_fingerprint(db, categoria=categoria, tipo=tipo, ano=year) != fingerprint:
+        return False
+    logger.info("SERVICE: %s%s %s sem alterações (fingerprint %s); parsing e escrita ignorados.", categoria, f' ({tipo})' if tipo else '', year, fingerprint[:12])
+    return True
 
-PROCESSAMENTO_TIPO_MAP = {"viniferas": "subopt_01", "americanas_hibridas": "subopt_02", "uvas_mesa": "subopt_03", "sem_classificacao": "subopt_04"}
-async def fetch_processamento_data(db: Session, year: int, tipo_processamento_key: str) -> List[ProcessamentoItemData]:
-    if tipo_processamento_key not in PROCESSAMENTO_TIPO_MAP: return []
-    subopcao = PROCESSAMENTO_TIPO_MAP[tipo_processamento_key]
-    params = {'opcao': 'opt_03', 'subopcao': subopcao, 'ano': year}
-    raw_scraped_items: List[ProcessamentoScrapedItem] = []
-    print(f"SERVICE: Iniciando scraping de Processamento ({tipo_processamento_key}) para o ano: {year}...")
-    try:
-        response = requests.get(EMBRAPA_INDEX_PHP_URL, params=params, headers=DEFAULT_HEADERS, timeout=EMBRAPA_REQUEST_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data_table = soup.find('table', class_='tb_dados')
-        if not data_table: return []
-        table_body = data_table.find('tbody')
-        if not table_body: return []
-        rows = table_body.find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) == 2:
-                cultivar_text = cols[0].get_text(separator=" ", strip=True)
-                quantidade_cell_text = cols[1].get_text(separator=" ", strip=True).replace('.', '')
-                if not cultivar_text: continue
-                raw_scraped_items.append(ProcessamentoScrapedItem(cultivar=cultivar_text, quantidade_str=quantidade_cell_text if quantidade_cell_text else "0", tipo_processamento=tipo_processamento_key)) 
-    except requests.exceptions.RequestException as e: print(f"SERVICE ERROR (Processamento - {tipo_processamento_key}) ano {year}: {e}"); return []
-    processed_data_list = _convert_processamento_scraped_to_item_data(raw_scraped_items, year, tipo_processamento_key)
-    if processed_data_list:
-        try: crud_processamento.create_or_replace_processamento_for_year_and_type(db=db, year=year, tipo_processamento=tipo_processamento_key, processamento_data_list=processed_data_list)
-        except Exception as e: print(f"SERVICE ERROR (Processamento DB Save) ano {year}, tipo {tipo_processamento_key}: {e}")
-    return processed_data_list
+def _registrar_fingerprint(db: Session, categoria: str, tipo: Optional[str], year: int, fingerprint: str, commit: bool = True) -> None:
+    try: crud_fingerprint.save_fingerprint(db, categoria=categoria, tipo=tipo, ano=year, hash_conteudo=fingerprint, commit=commit)
+    except Exception as e:
+        logger.error("SERVICE ERROR (Fingerprint) %s/%s ano %s: %s", categoria, tipo, year, e)
+        if not commit: raise
 
-async def fetch_comercializacao_data(db: Session, year: int) -> List[ComercializacaoItemData]:
-    params = {'opcao': 'opt_04', 'ano': year}
-    raw_scraped_items: List[ComercializacaoScrapedItem] = []
-    current_main_product: Optional[str] = None
-    print(f"SERVICE: Iniciando scraping de Comercialização para o ano: {year}...")
-    try:
-        response = requests.get(EMBRAPA_INDEX_PHP_URL, params=params, headers=DEFAULT_HEADERS, timeout=EMBRAPA_REQUEST_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data_table = soup.find('table', class_='tb_dados')
-        if not data_table: return []
-        table_body = data_table.find('tbody')
-        if not table_body: return []
-        rows = table_body.find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) == 2:
-                product_cell_text = cols[0].get_text(separator=" ", strip=True)
-                quantidade_cell_text = cols[1].get_text(separator=" ", strip=True).replace('.', '')
-                product_cell_class = cols[0].get('class', [])
-                produto_nome: Optional[str] = None; sub_produto_nome: Optional[str] = None
-                if 'tb_item' in product_cell_class: current_main_product = product_cell_text; produto_nome = current_main_product
-                elif 'tb_subitem' in product_cell_class and current_main_product: produto_nome = current_main_product; sub_produto_nome = product_cell_text
-                elif 'tb_subitem' not in product_cell_class and not current_main_product: current_main_product = product_cell_text; produto_nome = current_main_product
-                elif 'tb_subitem' not in product_cell_class and current_main_product: current_main_product = product_cell_text; produto_nome = current_main_product
-                else: continue
-                raw_scraped_items.append(ComercializacaoScrapedItem(produto=produto_nome, sub_produto=sub_produto_nome, quantidade_str=quantidade_cell_text if quantidade_cell_text else "0"))
-    except requests.exceptions.RequestException as e: print(f"SERVICE ERROR (Comercialização) ano {year}: {e}"); return []
-    processed_data_list = _convert_comercializacao_scraped_to_item_data(raw_scraped_items, year)
-    if processed_data_list:
-        try: crud_comercializacao.create_or_replace_comercializacao_for_year(db=db, year=year, comercializacao_data_list=processed_data_list)
-        except Exception as e: print(f"SERVICE ERROR (Comercialização DB Save) ano {year}: {e}")
-    return processed_data_list
+# --- Helpers de Conversão ---
+def _to_float(valor_str: Optional[str], contexto: str) -> Optional[float]:
+    if not valor_str or valor_str == "-": return None
+    try: return float(valor_str.replace(',', '.'))
+    except ValueError: logger.warning("SCRAPER_SERVICE (%s): Erro ao converter '%s'.", contexto, valor_str); return None
+
+def _build_producao_item(linha: Dict, ano: int, tipo: Optional[str]) -> ProducaoItemData:
+    return ProducaoItemData(produto=linha["produto"], sub_produto=linha["sub_produto"], quantidade_litros=_to_float(linha["quantidade"], "Produção Conversão"), ano=ano)
+
+def _build_processamento_item(linha: Dict, ano: int, tipo: Optional[str]) -> ProcessamentoItemData:
+    return ProcessamentoItemData(cultivar=linha["cultivar"], quantidade_kg=_to_float(linha["quantidade"], "Processamento Conversão"), ano=ano, tipo_processamento=tipo)
 
+def _build_comercializacao_item(linha: Dict, ano: int, tipo: Optional[str]) -> ComercializacaoItemData:
+    return ComercializacaoItemData(produto=linha["produto"], sub_produto=linha["sub_produto"], quantidade_litros=_to_float(linha["quantidade"], "Comercialização Conversão"), ano=ano)
+
+def _build_importacao_item(linha: Dict, ano: int, tipo: Optional[str]) -> ImportacaoItemData:
+    return ImportacaoItemData(pais=linha["pais"], quantidade_kg=_to_float(linha["quantidade"], "Importação Conversão Qtd"), valor_usd=_to_float(linha["valor"], "Importação Conversão Valor"), ano=ano, tipo_importacao=tipo)
+
+def _build_exportacao_item(linha: Dict, ano: int, tipo: Optional[str]) -> ExportacaoItemData:
+    return ExportacaoItemData(pais=linha["pais"], quantidade_kg=_to_float(linha["quantidade"], "Exportação Conversão Qtd"), valor_usd=_to_float(linha["valor"], "Exportação Conversão Valor"), ano=ano, tipo_exportacao=tipo)
+
+# --- Especificação declarativa das categorias ---
+PROCESSAMENTO_TIPO_MAP = {"viniferas": "subopt_01", "americanas_hibridas": "subopt_02", "uvas_mesa": "subopt_03", "sem_classificacao": "subopt_04"}
 IMPORTACAO_TIPO_MAP = {"vinhos_mesa": None, "espumantes": "subopt_02", "uvas_frescas": "subopt_03", "uvas_passas": "subopt_04", "suco_uva": "subopt_05"}
-async def fetch_importacao_data(db: Session, year: int, tipo_importacao_key: str) -> List[ImportacaoItemData]:
-    if tipo_importacao_key not in IMPORTACAO_TIPO_MAP: return []
-    subopcao = IMPORTACAO_TIPO_MAP[tipo_importacao_key]
-    params = {'opcao': 'opt_05', 'ano': year}
+EXPORTACAO_TIPO_MAP = {"vinhos_mesa": None, "espumantes": "subopt_02", "uvas_frescas": "subopt_03", "suco_uva": "subopt_04"}
+
+@dataclass(frozen=True)
+class CategoriaScraper:
+    nome: str
+    opcao: str
+    spec: TableSpec
+    build_item: Callable[[Dict, int, Optional[str]], Any]
+    save: Callable[[Session, int, Optional[str], List, bool], Any]
+    tipo_map: Optional[Dict[str, Optional[str]]] = None
+
+CATEGORIAS: Dict[str, CategoriaScraper] = {
+    "producao": CategoriaScraper(
+        nome="Produção", opcao="opt_02",
+        spec=TableSpec(nome="Produção", colunas=("produto", "quantidade"), colunas_numericas=("quantidade",), hierarquia=True, campo_item="produto", campo_subitem="sub_produto"),
+        build_item=_build_producao_item,
+        save=lambda db, year, tipo, itens, commit: crud_producao.create_or_replace_producao_for_year(db=db, year=year, producao_data_list=itens, commit=commit),
+    ),
+    "comercializacao": CategoriaScraper(
+        nome="Comercialização", opcao="opt_04",
+        spec=TableSpec(nome="Comercialização", colunas=("produto", "quantidade"), colunas_numericas=("quantidade",), hierarquia=True, campo_item="produto", campo_subitem="sub_produto"),
+        build_item=_build_comercializacao_item,
+        save=lambda db, year, tipo, itens, commit: crud_comercializacao.create_or_replace_comercializacao_for_year(db=db, year=year, comercializacao_data_list=itens, commit=commit),
+    ),
+    "processamento": CategoriaScraper(
+        nome="Processamento", opcao="opt_03", tipo_map=PROCESSAMENTO_TIPO_MAP,
+        spec=TableSpec(nome="Processamento", colunas=("cultivar", "quantidade"), colunas_numericas=("quantidade",)),
+        build_item=_build_processamento_item,
+        save=lambda db, year, tipo, itens, commit: crud_processamento.create_or_replace_processamento_for_year_and_type(db=db, year=year, tipo_processamento=tipo, processamento_data_list=itens, commit=commit),
+    ),
+    "importacao": CategoriaScraper(
+        nome="Importação", opcao="opt_05", tipo_map=IMPORTACAO_TIPO_MAP,
+        spec=TableSpec(nome="Importação", colunas=("pais", "quantidade", "valor"), colunas_numericas=("quantidade", "valor"), avisar_colunas_inesperadas=True),
+        build_item=_build_importacao_item,
+        save=lambda db, year, tipo, itens, commit: crud_importacao.create_or_replace_importacao_for_year_and_type(db=db, year=year, tipo_importacao=tipo, importacao_data_list=itens, commit=commit),
+    ),
+    "exportacao": CategoriaScraper(
+        nome="Exportação", opcao="opt_06", tipo_map=EXPORTACAO_TIPO_MAP,
+        spec=TableSpec(nome="Exportação", colunas=("pais", "quantidade", "valor"), colunas_numericas=("quantidade", "valor"), avisar_colunas_inesperadas=True),
+        build_item=_build_exportacao_item,
+        save=lambda db, year, tipo, itens, commit: crud_exportacao.create_or_replace_exportacao_for_year_and_type(db=db, year=year, tipo_exportacao=tipo, exportacao_data_list=itens, commit=commit),
+    ),
+}
+
+# Registro usado pelo agendador de população: tipos de cada categoria (None = sem subtipo).
+CATEGORIA_TIPOS: Dict[str, List[Optional[str]]] = {
+    chave: list(cfg.tipo_map.keys()) if cfg.tipo_map else [None] for chave, cfg in CATEGORIAS.items()
+}
+
+_parser_backend: str = resolve_backend(EMBRAPA_PARSER_BACKEND)
+
+def build_params(categoria: str, year: int, tipo: Optional[str] = None) -> Dict:
+    cfg = CATEGORIAS[categoria]
+    params = {'opcao': cfg.opcao, 'ano': year}
+    subopcao = cfg.tipo_map.get(tipo) if cfg.tipo_map else None
     if subopcao: params['subopcao'] = subopcao
-    raw_scraped_items: List[ImportacaoScrapedItem] = []
-    print(f"SERVICE: Iniciando scraping de Importação ({tipo_importacao_key}) para o ano: {year} com params: {params}...")
-    try:
-        response = requests.get(EMBRAPA_INDEX_PHP_URL, params=params, headers=DEFAULT_HEADERS, timeout=EMBRAPA_REQUEST_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data_table = soup.find('table', class_='tb_dados')
-        if not data_table: return []
-        table_body = data_table.find('tbody')
-        if not table_body: return []
-        rows = table_body.find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) == 3:
-                pais_text = cols[0].get_text(separator=" ", strip=True)
-                quantidade_cell_text = cols[1].get_text(separator=" ", strip=True).replace('.', '')
-                valor_cell_text = cols[2].get_text(separator=" ", strip=True).replace('.', '')
-                if not pais_text: continue
-                raw_scraped_items.append(ImportacaoScrapedItem(pais=pais_text, quantidade_str=quantidade_cell_text if quantidade_cell_text else "0", valor_str=valor_cell_text if valor_cell_text else "0", tipo_importacao=tipo_importacao_key))
-            elif len(cols) !=0: print(f"SERVICE: Linha com número inesperado de colunas ({len(cols)}) em Importação ({tipo_importacao_key}): {row}")
-    except requests.exceptions.RequestException as e: print(f"SERVICE ERROR (Importação - {tipo_importacao_key}) ano {year}: {e}"); return []
-    processed_data_list = _convert_importacao_scraped_to_item_data(raw_scraped_items, year, tipo_importacao_key)
+    return params
+
+# --- Funções de Scraping ---
+
+async def _scrape_slice(db: Session, categoria: str, year: int, tipo: Optional[str], incremental: bool, commit: bool = True) -> Optional[List]:
+    """
+    Baixa, interpreta e grava uma fatia (categoria, tipo, ano). Com `commit=False` a escrita entra na
+    transação de quem chama e falhas de gravação são propagadas para que o lote inteiro seja revertido.
+    """
+    cfg = CATEGORIAS[categoria]
+    if cfg.tipo_map is not None and tipo not in cfg.tipo_map: return []
+    params = build_params(categoria, year, tipo)
+    contexto = f"{cfg.nome} - {tipo}" if tipo else cfg.nome
+    logger.info("SERVICE: Iniciando scraping de %s%s para o ano: %s com params: %s...", cfg.nome, f' ({tipo})' if tipo else '', year, params)
+
+    inicio = time.perf_counter()
+    content = await _fetch_page(params, contexto)
+    metrics.observe_scraper_fetch(categoria, time.perf_counter() - inicio, ok=content is not None)
+    if content is None: return []
+    fingerprint = _fingerprint_pagina(content)
+    if _pagina_inalterada(db, categoria, tipo, year, fingerprint, incremental): return None
+
+    inicio = time.perf_counter()
+    try: linhas = await asyncio.to_thread(parse_table, content, cfg.spec, _parser_backend)
+    except Exception as e: logger.error("SERVICE ERROR (%s) ano %s: falha ao interpretar a página - %s", contexto, year, e); return []
+    metrics.observe_scraper_parse(categoria, time.perf_counter() - inicio)
+    processed_data_list = [cfg.build_item(linha, year, tipo) for linha in linhas]
+
     if processed_data_list:
-        try: crud_importacao.create_or_replace_importacao_for_year_and_type(db=db, year=year, tipo_importacao=tipo_importacao_key, importacao_data_list=processed_data_list)
-        except Exception as e: print(f"SERVICE ERROR (Importação DB Save) ano {year}, tipo {tipo_importacao_key}: {e}")
+        try: cfg.save(db, year, tipo, processed_data_list, commit)
+        except Exception as e:
+            logger.error("SERVICE ERROR (%s DB Save) ano %s: %s", contexto, year, e)
+            if not commit: raise
+        else: _registrar_fingerprint(db, categoria, tipo, year, fingerprint, commit)
     return processed_data_list
 
-EXPORTACAO_TIPO_MAP = {"vinhos_mesa": None, "espumantes": "subopt_02", "uvas_frescas": "subopt_03", "suco_uva": "subopt_04"}
-async def fetch_exportacao_data(db: Session, year: int, tipo_exportacao_key: str) -> List[ExportacaoItemData]:
-    if tipo_exportacao_key not in EXPORTACAO_TIPO_MAP: return []
-    subopcao = EXPORTACAO_TIPO_MAP[tipo_exportacao_key]
-    params = {'opcao': 'opt_06', 'ano': year}
-    if subopcao: params['subopcao'] = subopcao
-    raw_scraped_items: List[ExportacaoScrapedItem] = []
-    print(f"SERVICE: Iniciando scraping de Exportação ({tipo_exportacao_key}) para o ano: {year} com params: {params}...")
-    try:
-        response = requests.get(EMBRAPA_INDEX_PHP_URL, params=params, headers=DEFAULT_HEADERS, timeout=EMBRAPA_REQUEST_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        data_table = soup.find('table', class_='tb_dados')
-        if not data_table: return []
-        table_body = data_table.find('tbody')
-        if not table_body: return []
-        rows = table_body.find_all('tr')
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) == 3:
-                pais_text = cols[0].get_text(separator=" ", strip=True)
-                quantidade_cell_text = cols[1].get_text(separator=" ", strip=True).replace('.', '')
-                valor_cell_text = cols[2].get_text(separator=" ", strip=True).replace('.', '')
-                if not pais_text: continue
-                raw_scraped_items.append(ExportacaoScrapedItem(pais=pais_text, quantidade_str=quantidade_cell_text if quantidade_cell_text else "0", valor_str=valor_cell_text if valor_cell_text else "0", tipo_exportacao=tipo_exportacao_key))
-            elif len(cols) !=0: print(f"SERVICE: Linha com número inesperado de colunas ({len(cols)}) em Exportação ({tipo_exportacao_key}): {row}")
-    except requests.exceptions.RequestException as e: print(f"SERVICE ERROR (Exportação - {tipo_exportacao_key}) ano {year}: {e}"); return []
-    processed_data_list = _convert_exportacao_scraped_to_item_data(raw_scraped_items, year, tipo_exportacao_key)
-    if processed_data_list:
-        try: crud_exportacao.create_or_replace_exportacao_for_year_and_type(db=db, year=year, tipo_exportacao=tipo_exportacao_key, exportacao_data_list=processed_data_list)
-        except Exception as e: print(f"SERVICE ERROR (Exportação DB Save) ano {year}, tipo {tipo_exportacao_key}: {e}")
-    return processed_data_list
\ No newline at end of file
+async def fetch_producao_data(db: Session, year: int, incremental: bool = False) -> Optional[List[ProducaoItemData]]:
+    return await _scrape_slice(db, "producao", year, None, incremental)
+
+async def fetch_processamento_data(db: Session, year: int, tipo_processamento_key: str, incremental: bool = False) -> Optional[List[ProcessamentoItemData]]:
+    return await _scrape_slice(db, "processamento", year, tipo_processamento_key, incremental)
+
+async def fetch_comercializacao_data(db: Session, year: int, incremental: bool = False) -> Optional[List[ComercializacaoItemData]]:
+    return await _scrape_slice(db, "comercializacao", year, None, incremental)
+
+async def fetch_importacao_data(db: Session, year: int, tipo_importacao_key: str, incremental: bool = False) -> Optional[List[ImportacaoItemData]]:
+    return await _scrape_slice(db, "importacao", year, tipo_importacao_key, incremental)
+
+async def fetch_exportacao_data(db: Session, year: int, tipo_exportacao_key: str, incremental: bool = False) -> Optional[List[ExportacaoItemData]]:
+    return await _scrape_slice(db, "exportacao", year, tipo_exportacao_key, incremental)
+
+async def fetch_category_data(db: Session, categoria: str, year: int, tipo: Optional[str] = None, incremental: bool = False, commit: bool = True) -> Optional[List]:
+    """Retorna os itens gravados, ou None quando o refresh incremental detectou que a página não mudou."""
+    if categoria not in CATEGORIAS: raise ValueError(f"Categoria desconhecida: {categoria}")
+    return await _scrape_slice(db, categoria, year, tipo, incremental, commit)
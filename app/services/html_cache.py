@@ -0,0 +1,79 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+class HtmlCache:
+    """
+    Cache em disco das páginas brutas da Embrapa.
+
+    Os corpos ficam em `blobs/<hh>/<sha256>.html.gz`, endereçados pelo conteúdo (páginas idênticas
+    ocupam um único arquivo). Cada combinação de parâmetros da URL tem um índice `refs/<chave>.jsonl`
+    com uma linha por download (`buscado_em`, `blob`), o que permite reproduzir a coleta de qualquer data.
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        self._blobs_dir = os.path.join(diretorio, "blobs")
+        self._refs_dir = os.path.join(diretorio, "refs")
+
+    @staticmethod
+    def chave_params(params: Dict) -> str:
+        canonico = json.dumps({k: str(v) for k, v in params.items() if v is not None}, sort_keys=True)
+        return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, blob_hash: str) -> str:
+        return os.path.join(self._blobs_dir, blob_hash[:2], f"{blob_hash}.html.gz")
+
+    def _ref_path(self, params: Dict) -> str:
+        return os.path.join(self._refs_dir, f"{self.chave_params(params)}.jsonl")
+
+    def salvar(self, params: Dict, content: bytes, buscado_em: Optional[datetime] = None) -> str:
+        blob_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(blob_hash)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            # Temporário exclusivo: downloads concorrentes do mesmo conteúdo não escrevem no mesmo arquivo.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as bruto, gzip.GzipFile(fileobj=bruto, mode="wb", compresslevel=6) as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)
+            except BaseException:
+                try: os.remove(tmp_path)
+                except OSError: pass
+                raise
+
+        os.makedirs(self._refs_dir, exist_ok=True)
+        registro = {
+            "params": {k: str(v) for k, v in params.items() if v is not None},
+            "buscado_em": (buscado_em or datetime.now(timezone.utc)).isoformat(),
+            "blob": blob_hash,
+        }
+        with open(self._ref_path(params), "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro) + "\n")
+        return blob_hash
+
+    def listar(self, params: Dict) -> List[Dict]:
+        ref_path = self._ref_path(params)
+        if not os.path.exists(ref_path):
+            return []
+        with open(ref_path, encoding="utf-8") as f:
+            return [json.loads(linha) for linha in f if linha.strip()]
+
+    def carregar(self, params: Dict, ate: Optional[datetime] = None) -> Optional[bytes]:
+        """Retorna o download mais recente dos `params` (ou o último feito até `ate`)."""
+        registros = self.listar(params)
+        if ate is not None:
+            registros = [r for r in registros if datetime.fromisoformat(r["buscado_em"]) <= ate]
+        if not registros:
+            return None
+        blob_path = self._blob_path(registros[-1]["blob"])
+        if not os.path.exists(blob_path):
+            return None
+        with gzip.open(blob_path, "rb") as f:
+            return f.read()
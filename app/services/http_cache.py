@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import HTTP_CACHE_MAX_AGE
+from app.crud import crud_versao
+from app.models.fingerprint_model import TIPO_GERAL
+
+
+def build_etag(categoria: str, tipo: Optional[str], ano: int, versao: int) -> str:
+    return f'"{categoria}.{tipo or TIPO_GERAL}.{ano}.v{versao}"'
+
+
+def _etag_confere(if_none_match: str, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: W/"x" confere com "x".
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*" or candidato.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _nao_modificado_desde(if_modified_since: str, atualizado_em: datetime) -> bool:
+    try:
+        desde = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if desde.tzinfo is None:
+        desde = desde.replace(tzinfo=timezone.utc)
+    return atualizado_em.replace(microsecond=0) <= desde
+
+
+async def check_conditional(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    categoria: str,
+    tipo: Optional[str],
+    ano: int
+) -> Tuple[int, Optional[Response]]:
+    """
+    Consulta a versão da fatia (categoria, tipo, ano) e coloca ETag, Last-Modified e Cache-Control em `response`.
+
+    Retorna a versão e, quando o cliente já tem essa versão (If-None-Match / If-Modified-Since), uma resposta 304
+    pronta para ser devolvida sem ler as linhas da fatia.
+    """
+    registro = await crud_versao.get_version(db, categoria, tipo, ano)
+    versao, atualizado_em = registro if registro else (0, None)
+    if atualizado_em is not None and atualizado_em.tzinfo is None:
+        atualizado_em = atualizado_em.replace(tzinfo=timezone.utc)  # SQLite devolve UTC sem fuso
+
+    etag = build_etag(categoria, tipo, ano, versao)
+    headers: Dict[str, str] = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={HTTP_CACHE_MAX_AGE}",
+        "Vary": "Authorization",
+    }
+    if atualizado_em is not None:
+        headers["Last-Modified"] = format_datetime(atualizado_em.astimezone(timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        nao_modificado = _etag_confere(if_none_match, etag)
+    else:
+        nao_modificado = bool(if_modified_since and atualizado_em and _nao_modificado_desde(if_modified_since, atualizado_em))
+
+    if nao_modificado:
+        return versao, Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return versao, None
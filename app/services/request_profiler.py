@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import (
+    PROFILER_ENABLED,
+    PROFILER_SAMPLE_RATE,
+    PROFILER_PATHS,
+    PROFILER_INTERVAL_SECONDS,
+    PROFILER_DIR,
+    PROFILER_MAX_FILES,
+)
+from app.services.auth_service import is_admin_token
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pyinstrument é opcional; sem ele o middleware só repassa as requisições
+    Profiler = None
+
+HEADER_PEDIDO = b"x-profile"
+
+HEADER_ARQUIVO = b"x-profile-file"
+
+SUFIXO = ".speedscope.json"
+
+_NOME_VALIDO = re.compile(r"^[\w.-]+\.speedscope\.json$")
+
+
+def available() -> bool:
+    return Profiler is not None
+
+
+def _caminho_perfilado(path: str) -> bool:
+    return not PROFILER_PATHS or any(path.startswith(prefixo) for prefixo in PROFILER_PATHS)
+
+
+def _bearer(scope) -> Optional[str]:
+    for nome, valor in scope["headers"]:
+        if nome == b"authorization":
+            esquema, _, token = valor.decode("latin-1").partition(" ")
+            return token.strip() if esquema.lower() == "bearer" and token.strip() else None
+    return None
+
+
+async def _deve_perfilar(scope) -> bool:
+    if not _caminho_perfilado(scope["path"]):
+        return False
+    if any(nome == HEADER_PEDIDO and valor.strip() in (b"1", b"true") for nome, valor in scope["headers"]):
+        # Pedido explícito: só vale para administradores, senão qualquer cliente poderia encher o disco.
+        token = _bearer(scope)
+        return token is not None and await is_admin_token(token)
+    return PROFILER_ENABLED and random.random() < PROFILER_SAMPLE_RATE
+
+
+def _nome_arquivo(scope) -> str:
+    instante = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    rota = re.sub(r"[^\w-]+", "_", scope["path"]).strip("_")[:80] or "raiz"
+    return f"{instante}_{os.getpid()}_{scope['method']}_{rota}{SUFIXO}"
+
+
+def _rotacionar(diretorio: str, manter: int) -> None:
+    arquivos = sorted(nome for nome in os.listdir(diretorio) if nome.endswith(SUFIXO))
+    for nome in arquivos[:max(0, len(arquivos) - manter)]:
+        try:
+            os.remove(os.path.join(diretorio, nome))
+        except OSError:
+            pass  # outro worker já removeu
+
+
+def _gravar(profiler: "Profiler", nome: str) -> None:
+    os.makedirs(PROFILER_DIR, exist_ok=True)
+    caminho = os.path.join(PROFILER_DIR, nome)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+        arquivo.write(profiler.output(renderer=SpeedscopeRenderer()))
+    os.replace(caminho + ".tmp", caminho)
+    _rotacionar(PROFILER_DIR, PROFILER_MAX_FILES)
+
+
+def list_profiles() -> List[Dict]:
+    """Perfis gravados (todos os workers compartilham PROFILER_DIR), do mais recente para o mais antigo."""
+    if not os.path.isdir(PROFILER_DIR):
+        return []
+    perfis = []
+    for nome in sorted((nome for nome in os.listdir(PROFILER_DIR) if nome.endswith(SUFIXO)), reverse=True):
+        try:
+            info = os.stat(os.path.join(PROFILER_DIR, nome))
+        except OSError:
+            continue  # removido pela rotação entre o listdir e o stat
+        perfis.append({
+            "nome": nome,
+            "tamanho_bytes": info.st_size,
+            "gravado_em": datetime.fromtimestamp(info.st_mtime, tz=timezone.utc),
+        })
+    return perfis
+
+
+def profile_path(nome: str) -> Optional[str]:
+    if not _NOME_VALIDO.match(nome):
+        return None
+    caminho = os.path.join(PROFILER_DIR, nome)
+    return caminho if os.path.isfile(caminho) else None
+
+
+class ProfilerMiddleware:
+    """
+    Middleware ASGI que perfila uma amostra das requisições com o pyinstrument (modo assíncrono: o tempo de
+    `await` no banco aparece na pilha da requisição) e grava cada perfil em PROFILER_DIR no formato speedscope.
+
+    Perfila quando PROFILER_ENABLED e o sorteio de PROFILER_SAMPLE_RATE escolhem a requisição, ou quando um
+    administrador envia `X-Profile: 1`; o nome do arquivo volta no cabeçalho `X-Profile-File`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not available() or not await _deve_perfilar(scope):
+            await self.app(scope, receive, send)
+            return
+
+        nome = _nome_arquivo(scope)
+
+        async def _send(mensagem):
+            if mensagem["type"] == "http.response.start":
+                mensagem["headers"] = list(mensagem.get("headers", [])) + [(HEADER_ARQUIVO, nome.encode("latin-1"))]
+            await send(mensagem)
+
+        profiler = Profiler(interval=PROFILER_INTERVAL_SECONDS, async_mode="enabled")
+        inicio = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            profiler.stop()
+            try:
+                await asyncio.to_thread(_gravar, profiler, nome)
+                logger.info("PROFILER: %s %s perfilado em %.1f ms -> %s", scope["method"], scope["path"], (time.perf_counter() - inicio) * 1000, nome)
+            except OSError as e:
+                logger.error("PROFILER ERROR: Falha ao gravar o perfil %s: %s", nome, e)
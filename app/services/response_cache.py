@@ -0,0 +1,25 @@
+import logging
+from typing import Optional
+
+from app.core.config import RESPONSE_CACHE_MAX_ITEMS, RESPONSE_CACHE_TTL_SECONDS
+from app.crud import slice_events
+from app.utils.ttl_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+# Chaves no formato (categoria, tipo, ano, versão); uma gravação invalida todas as versões da fatia.
+response_cache = TTLLRUCache(max_itens=RESPONSE_CACHE_MAX_ITEMS, ttl=RESPONSE_CACHE_TTL_SECONDS, nome="respostas")
+
+
+def invalidate_slice(categoria: str, tipo: Optional[str] = None, ano: Optional[int] = None) -> int:
+    return response_cache.invalidate_where(
+        lambda chave: chave[0] == categoria and (tipo is None or chave[1] == tipo) and (ano is None or chave[2] == ano)
+    )
+
+
+@slice_events.on_slice_committed
+def _invalidar_fatia(fatia: slice_events.Fatia) -> None:
+    categoria, tipo, ano = fatia
+    if invalidate_slice(categoria, tipo, ano):
+        logger.debug("RESPONSE_CACHE: Fatia %s/%s/%s invalidada.", categoria, tipo or '-', ano)
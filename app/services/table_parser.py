@@ -0,0 +1,130 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml é opcional; sem ele usamos o html.parser do BeautifulSoup
+    lxml_html = None
+
+# Linha crua da tabela: textos das células <td> e classes CSS da primeira célula.
+RawRow = Tuple[List[str], List[str]]
+
+TB_DADOS_RE = re.compile(rb'<table[^>]*class=["\'][^"\']*tb_dados[^"\']*["\'][^>]*>.*?</table>', re.IGNORECASE | re.DOTALL)
+_CHARSET_RE = re.compile(rb'charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Descrição declarativa de uma tabela `tb_dados` da Embrapa.
+
+    `colunas` nomeia as células de cada linha (linhas com outra quantidade de <td> são ignoradas);
+    as `colunas_numericas` têm o separador de milhar removido e viram "0" quando vazias.
+    Com `hierarquia=True` a primeira coluna é desdobrada em `item`/`subitem` conforme as classes
+    `tb_item`/`tb_subitem`, como nas páginas de Produção e Comercialização.
+    """
+    nome: str
+    colunas: Tuple[str, ...]
+    colunas_numericas: Tuple[str, ...] = ()
+    hierarquia: bool = False
+    campo_item: str = "item"
+    campo_subitem: str = "subitem"
+    avisar_colunas_inesperadas: bool = False
+
+
+def extract_tb_dados(content: bytes) -> Optional[bytes]:
+    match = TB_DADOS_RE.search(content)
+    return match.group(0) if match else None
+
+
+def _decode(fragmento: bytes, content: bytes) -> str:
+    match = _CHARSET_RE.search(content[:4096])
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return fragmento.decode(encoding)
+    except (LookupError, UnicodeDecodeError):
+        return fragmento.decode("latin-1")
+
+
+def _cell_text(textos) -> str:
+    # Mesmo resultado de get_text(separator=" ", strip=True) do BeautifulSoup.
+    return " ".join(t.strip() for t in textos if t.strip())
+
+
+def _rows_lxml(tabela_html: str) -> List[RawRow]:
+    tabela = lxml_html.fragment_fromstring(tabela_html)
+    rows: List[RawRow] = []
+    for tr in tabela.iterfind("tbody/tr"):
+        tds = tr.findall("td")
+        classes = tds[0].get("class", "").split() if tds else []
+        rows.append(([_cell_text(td.itertext()) for td in tds], classes))
+    return rows
+
+
+def _rows_bs4(tabela_html: str) -> List[RawRow]:
+    tabela = BeautifulSoup(tabela_html, "html.parser").find("table")
+    tbody = tabela.find("tbody") if tabela else None
+    if tbody is None:
+        return []
+    rows: List[RawRow] = []
+    for tr in tbody.find_all("tr"):
+        tds = tr.find_all("td")
+        classes = tds[0].get("class", []) if tds else []
+        rows.append(([td.get_text(separator=" ", strip=True) for td in tds], classes))
+    return rows
+
+
+BACKENDS: Dict[str, Callable[[str], List[RawRow]]] = {"bs4": _rows_bs4}
+if lxml_html is not None:
+    BACKENDS["lxml"] = _rows_lxml
+
+DEFAULT_BACKEND = "lxml" if "lxml" in BACKENDS else "bs4"
+
+
+def resolve_backend(nome: Optional[str]) -> str:
+    if nome and nome in BACKENDS:
+        return nome
+    if nome and nome not in BACKENDS:
+        logger.warning("TABLE_PARSER: Backend '%s' indisponível; usando '%s'.", nome, DEFAULT_BACKEND)
+    return DEFAULT_BACKEND
+
+
+def parse_table(content: bytes, spec: TableSpec, backend: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    """Extrai as linhas da tabela `tb_dados` de `content` segundo `spec`, parseando apenas o trecho da tabela."""
+    fragmento = extract_tb_dados(content)
+    if fragmento is None:
+        return []
+    raw_rows = BACKENDS[resolve_backend(backend)](_decode(fragmento, content))
+
+    linhas: List[Dict[str, Optional[str]]] = []
+    item_atual: Optional[str] = None
+    for textos, classes in raw_rows:
+        if len(textos) != len(spec.colunas):
+            if spec.avisar_colunas_inesperadas and textos:
+                logger.warning("TABLE_PARSER: Linha com número inesperado de colunas (%s) em %s: %s", len(textos), spec.nome, textos)
+            continue
+
+        linha: Dict[str, Optional[str]] = dict(zip(spec.colunas, textos))
+        for coluna in spec.colunas_numericas:
+            linha[coluna] = linha[coluna].replace(".", "") or "0"
+
+        primeira = spec.colunas[0]
+        if spec.hierarquia:
+            texto = linha.pop(primeira)
+            if "tb_subitem" in classes:
+                if not item_atual:
+                    continue
+                linha[spec.campo_item], linha[spec.campo_subitem] = item_atual, texto
+            else:
+                item_atual = texto
+                linha[spec.campo_item], linha[spec.campo_subitem] = texto, None
+        elif not linha[primeira]:
+            continue
+        linhas.append(linha)
+    return linhas
@@ -0,0 +1,37 @@
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usa o json da biblioteca padrão
+    orjson = None
+
+
+def dumps(conteudo: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(conteudo)
+    return json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """
+    Resposta JSON montada a partir de dicts/listas já prontos (ou de bytes já serializados), sem passar pelo response_model.
+
+    O response_model continua declarado nas rotas e descreve o mesmo formato na documentação OpenAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def fast_response(conteudo: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    # Uma Response devolvida diretamente não herda os cabeçalhos do parâmetro `response` (ETag etc.).
+    resposta = FastJSONResponse(conteudo)
+    if response is not None:
+        resposta.headers.update(response.headers)
+    return resposta
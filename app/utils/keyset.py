@@ -0,0 +1,31 @@
+import base64
+import binascii
+from typing import List, Optional, Sequence
+
+
+def encode_cursor(valor: str) -> str:
+    """Cursor opaco (base64 url-safe) com a chave da última linha devolvida."""
+    return base64.urlsafe_b64encode(valor.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Cursor inválido: {cursor!r}") from e
+
+
+def parse_fields(fields: Optional[str], permitidos: Sequence[str], chave: Optional[str] = None) -> List[str]:
+    """
+    Converte `fields=a,b` na lista de colunas pedidas (na ordem de `permitidos`); vazio = todas.
+    A `chave` do keyset entra sempre, para o cliente poder relacionar cada linha ao cursor.
+    """
+    if not fields:
+        return list(permitidos)
+    pedidos = {f.strip() for f in fields.split(",") if f.strip()}
+    invalidos = pedidos.difference(permitidos)
+    if invalidos:
+        raise ValueError(f"Campos inválidos: {', '.join(sorted(invalidos))}. Opções: {', '.join(permitidos)}.")
+    if chave is not None:
+        pedidos.add(chave)
+    return [campo for campo in permitidos if campo in pedidos]
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.metrics import record_cache_lookup
+
+
+class TTLLRUCache:
+    """
+    Cache LRU limitado a `max_itens`, com expiração de `ttl` segundos por entrada (thread-safe).
+
+    Com `nome`, hits e misses também são contados em `cache_lookups_total{cache=nome}` do /metrics.
+    """
+
+    def __init__(self, max_itens: int, ttl: float, nome: Optional[str] = None):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._itens: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+        self.descartados = 0
+        self.invalidacoes = 0
+
+    def get(self, chave: Hashable) -> Optional[Any]:
+        if self.max_itens <= 0:
+            return None
+        with self._lock:
+            entrada = self._itens.get(chave)
+            if entrada is None:
+                self.misses += 1
+                record_cache_lookup(self.nome, False)
+                return None
+            expira_em, valor = entrada
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                self.expirados += 1
+                self.misses += 1
+                record_cache_lookup(self.nome, False)
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            record_cache_lookup(self.nome, True)
+            return valor
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        if self.max_itens <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self.descartados += 1
+
+    def pop(self, chave: Hashable) -> None:
+        with self._lock:
+            if self._itens.pop(chave, None) is not None:
+                self.invalidacoes += 1
+
+    def invalidate_where(self, predicado: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            removidas = [chave for chave in self._itens if predicado(chave)]
+            for chave in removidas:
+                del self._itens[chave]
+            self.invalidacoes += len(removidas)
+        return len(removidas)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "ttl_segundos": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "taxa_acerto": round(self.hits / consultas, 4) if consultas else 0.0,
+                "expirados": self.expirados,
+                "descartados": self.descartados,
+                "invalidacoes": self.invalidacoes,
+            }